@@ -0,0 +1,46 @@
+# Benchmark of the full autoscaling cycle against local docker and prometheus stand-ins.
+#
+# Usage: python benchmark_cycle.py [--service-counts 10,100,1000,5000] [--docker-latency-ms 1] [--prometheus-latency-ms 5] [--output <result.json>]
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "simulation"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Benchmark.
+import cycleBenchmark as CycleBenchmark
+
+parser = argparse.ArgumentParser(description="Benchmark the full autoscaling cycle with synthetic services.")
+parser.add_argument("--service-counts", default="10,100,1000,5000", help="Comma separated amounts of synthetic services.")
+parser.add_argument("--docker-latency-ms", type=float, default=0.0, help="Latency of every docker api call.")
+parser.add_argument("--prometheus-latency-ms", type=float, default=0.0, help="Latency of every prometheus query.")
+parser.add_argument("--cycles", type=int, default=1, help="Cycles per service count.")
+parser.add_argument("--no-allocations", action="store_true", help="Skip the tracemalloc run measuring allocations per phase.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Benchmark.
+benchmark = CycleBenchmark.CycleBenchmark(
+    docker_latency_seconds=args.docker_latency_ms / 1000,
+    prometheus_latency_seconds=args.prometheus_latency_ms / 1000,
+    cycles=max(1, args.cycles),
+    trace_allocations=not args.no_allocations
+)
+result = benchmark.run([int(service_count) for service_count in args.service_counts.split(",") if service_count.strip()])
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
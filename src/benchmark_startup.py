@@ -0,0 +1,35 @@
+# Startup time of a fresh autoscaler process until its first cycle completed, checked against a budget.
+#
+# Usage: python benchmark_startup.py [--service-count 50] [--repetitions 3] [--budget-seconds 5] [--output <result.json>]
+# Exits with 1 if the median exceeds the budget, e.g. to check an image: docker run --rm swarm-autoscaler:slim python /code/src/benchmark_startup.py
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Benchmark.
+import startupBenchmark as StartupBenchmark
+
+parser = argparse.ArgumentParser(description="Benchmark the time until the first cycle of a fresh autoscaler process completed.")
+parser.add_argument("--service-count", type=int, default=50, help="Synthetic services of the first cycle.")
+parser.add_argument("--repetitions", type=int, default=3, help="Fresh processes started, the median is checked.")
+parser.add_argument("--budget-seconds", type=float, default=5.0, help="Maximum median seconds until the first cycle completed.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Benchmark.
+result = StartupBenchmark.StartupBenchmark(args.service_count, args.repetitions).run(args.budget_seconds)
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
+sys.exit(0 if result["within_budget"] else 1)
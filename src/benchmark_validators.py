@@ -0,0 +1,35 @@
+# Micro-benchmark of the precompiled label validators and converters against their previous implementations.
+#
+# Usage: python benchmark_validators.py [--iterations 20000] [--output <result.json>]
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Benchmark.
+import validatorBenchmark as ValidatorBenchmark
+
+parser = argparse.ArgumentParser(description="Benchmark the label validators and converters.")
+parser.add_argument("--iterations", type=int, default=20000, help="Calls per value and implementation.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Benchmark.
+result = ValidatorBenchmark.ValidatorBenchmark(args.iterations).run()
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,218 @@
+# Benchmarks one full autoscaling cycle against local docker and prometheus stand-ins.
+
+# Environment and temporary log directory.
+import os
+import tempfile
+
+# Peak RSS and metadata.
+import platform
+import resource
+import subprocess
+import time
+
+# Own classes.
+import dockerServiceScaler as DockerServiceScaler
+import messagePlatformHandler as MessagePlatformHandler
+import fakePrometheusServer as FakePrometheusServer
+import latencyDockerClient as LatencyDockerClient
+import phaseProfiler as PhaseProfiler
+
+
+# Methods measured as phases of a cycle, everything else of auto_scale_services counts as "other".
+_SCALER_PHASES = {
+    "_get_autoscale_services": "discovery",
+    "_get_cpu_scale_metrics": "metric_fetch",
+    "_get_memory_scale_metrics": "metric_fetch",
+    "_get_comfortable_service_names": "metric_fetch",
+    "_get_final_scale_suggestion": "decision",
+    "_handle_scaling_suggestion": "scaling",
+    "_keep_comfortable_service": "scaling",
+    "_execute_scale_operations": "scaling"
+}
+_MESSAGING_METHODS = [
+    "add_additional_recipients",
+    "handle_important_info",
+    "handle_error",
+    "handle_warning",
+    "handle_information",
+    "handle_verbose_info",
+    "send_all_accumulated_messages"
+]
+
+
+class CycleBenchmark:
+    """
+    Runs DockerServiceScaler.auto_scale_services with synthetic services.
+
+    Docker is replaced by LatencyDockerClient, prometheus by a FakePrometheusServer reached
+    via PROMETHEUS_URL, so the real PrometheusConnector and MessagePlatformHandler are measured.
+    Messages are only logged to a temporary directory.
+
+    Synthetic services rotate through cpu only, relative memory only and cpu plus memory scaling,
+    and through loads that scale up, scale down and keep the replicas.
+    """
+
+    def __init__(self, docker_latency_seconds=0.0, prometheus_latency_seconds=0.0, cycles=1, trace_allocations=True):
+        """
+        Args:
+            docker_latency_seconds (float): Delay of every docker api call.
+            prometheus_latency_seconds (float): Delay of every prometheus query.
+            cycles (int): Cycles per service count.
+            trace_allocations (bool): Additionally run each service count with tracemalloc to measure allocations per phase.
+        """
+        self._docker_latency_seconds = docker_latency_seconds
+        self._prometheus_latency_seconds = prometheus_latency_seconds
+        self._cycles = cycles
+        self._trace_allocations = trace_allocations
+
+
+    def run(self, service_counts):
+        """
+        Benchmark each service count.
+
+        Args:
+            service_counts (list): Amounts of synthetic services, e.g. [10, 100, 1000, 5000].
+
+        Returns:
+            dict: Metadata and one result per service count.
+        """
+        self._prepare_environment()
+        return {
+            "metadata": self._get_metadata(),
+            "results": [self._run_service_count(service_count) for service_count in sorted(service_counts)]
+        }
+
+
+    def _run_service_count(self, service_count):
+        """
+        Benchmark one service count, timings without and allocations with tracemalloc.
+        """
+        result = self._run_cycles(service_count, trace_allocations=False)
+        if self._trace_allocations:
+            allocation_result = self._run_cycles(service_count, trace_allocations=True)
+            result["traced_memory_peak_bytes"] = allocation_result["traced_memory_peak_bytes"]
+            for phase_name, phase in result["phases"].items():
+                phase["net_allocated_bytes"] = allocation_result["phases"].get(phase_name, {}).get("net_allocated_bytes", 0)
+        else:
+            for phase in result["phases"].values():
+                del phase["net_allocated_bytes"]
+        return result
+
+
+    def _run_cycles(self, service_count, trace_allocations):
+        """
+        Build fresh stand-ins and run the configured amount of cycles.
+        """
+        # Docker.
+        client = LatencyDockerClient.LatencyDockerClient(self._docker_latency_seconds)
+        prometheusServer = FakePrometheusServer.FakePrometheusServer(
+            lambda service_name: client._fakeClient.services.get(service_name).get_replicas(),
+            self._prometheus_latency_seconds
+        )
+        for service_index in range(service_count):
+            self._add_service(client, prometheusServer, service_index)
+
+        # Prometheus.
+        os.environ["PROMETHEUS_URL"] = prometheusServer.start()
+        try:
+            scaler = DockerServiceScaler.DockerServiceScaler(client=client, message_platform_handler=MessagePlatformHandler.MessagePlatformHandler())
+
+            # Phases.
+            profiler = PhaseProfiler.PhaseProfiler(trace_allocations)
+            profiler.wrap(scaler, "auto_scale_services", "other")
+            for method_name, phase_name in _SCALER_PHASES.items():
+                profiler.wrap(scaler, method_name, phase_name)
+            for method_name in _MESSAGING_METHODS:
+                profiler.wrap(scaler._messagePlatformHandler, method_name, "messaging")
+
+            # Cycles.
+            client.reset_call_counts()
+            prometheusServer.reset_query_count()
+            profiler.start()
+            wall_start = time.perf_counter()
+            for cycle in range(self._cycles):
+                scaler.auto_scale_services()
+            wall_seconds = time.perf_counter() - wall_start
+            profile = profiler.stop()
+        finally:
+            prometheusServer.stop()
+
+        result = {
+            "service_count": service_count,
+            "cycles": self._cycles,
+            "wall_seconds": wall_seconds,
+            "wall_seconds_per_cycle": wall_seconds / self._cycles,
+            "api_calls": {
+                "docker": client.get_call_counts(),
+                "prometheus_queries": prometheusServer.get_query_count()
+            },
+            # Process wide and never decreasing, service counts run in ascending order.
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "phases": profile["phases"]
+        }
+        if trace_allocations:
+            result["traced_memory_peak_bytes"] = profile["traced_memory_peak_bytes"]
+        return result
+
+
+    def _add_service(self, client, prometheusServer, service_index):
+        """
+        Add one synthetic service.
+        """
+        service_name = f"benchmark_service_{service_index:05d}"
+        labels = {
+            "autoscale": "true",
+            "autoscale.minimum_replicas": "1",
+            "autoscale.maximum_replicas": "10"
+        }
+        resources = None
+
+        # Scaling metrics.
+        metric_variant = service_index % 3
+        if metric_variant in (0, 2):
+            labels["autoscale.cpu_upscale_threshold"] = "80"
+            labels["autoscale.cpu_downscale_threshold"] = "20"
+        if metric_variant in (1, 2):
+            labels["autoscale.memory_upscale_threshold"] = "80%"
+            labels["autoscale.memory_downscale_threshold"] = "20%"
+            # Same relative memory whether prometheus or the connector computes it.
+            resources = {"Limits": {"MemoryBytes": 1024 ** 3}}
+
+        client.add_service(service_name, labels, 2, resources)
+
+        # Load: scale up, scale down, keep.
+        prometheusServer.set_service_load(service_name, [0.9, 0.1, 0.5][(service_index // 3) % 3])
+
+
+    def _prepare_environment(self):
+        """
+        Log to a temporary directory only and disable all messaging platforms.
+        """
+        os.environ["LOG_PATH"] = tempfile.mkdtemp(prefix="autoscaler_benchmark_logs_")
+        os.environ["LOG_STYLE"] = "LOGFILE_ONLY"
+        os.environ.setdefault("LOG_LEVEL", "INFO")
+        if not os.getenv("TIMEZONE"):
+            os.environ["TIMEZONE"] = "Etc/UTC"
+        os.environ["EMAIL_ENABLED"] = "false"
+        os.environ["TELEGRAM_ENABLED"] = "false"
+        os.environ["CYCLE_RECORDING_FILE"] = ""
+
+
+    def _get_metadata(self):
+        """
+        Describe the run, to compare results over time.
+        """
+        try:
+            git_commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=10).stdout.strip()
+        except Exception:
+            git_commit = ""
+        return {
+            "timestamp": time.time(),
+            "git_commit": git_commit,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "docker_latency_seconds": self._docker_latency_seconds,
+            "prometheus_latency_seconds": self._prometheus_latency_seconds,
+            "cycles": self._cycles,
+            "trace_allocations": self._trace_allocations
+        }
@@ -0,0 +1,174 @@
+# Checks that the vectorized decision kernel suggests the same as the detailed evaluation of the scaler, and times both.
+
+# Random synthetic services.
+import random
+import time
+
+# Own classes.
+import dockerServiceScaler as DockerServiceScaler
+import autoScaleService as AutoScaleService
+import scaleExecutor as ScaleExecutor
+import fakeDockerClient as FakeDockerClient
+import silentMessagePlatformHandler as SilentMessagePlatformHandler
+import metricAggregationUtils as MetricAggregationUtils
+import thresholdClassifier as ThresholdClassifier
+
+# Definitions.
+from valid_values import ScalingConflictResolution, MetricAggregation
+
+
+# Time durations of the synthetic services, different ones to get conflicts of a single metric.
+_CPU_UPSCALE_TIME_DURATION = "1m"
+_CPU_DOWNSCALE_TIME_DURATION = "5m"
+_AGGREGATIONS = [MetricAggregation.AVG.value, MetricAggregation.MAX.value, MetricAggregation.NODE_MAX.value, "p90"]
+
+
+class _SyntheticPrometheusConnector:
+    """
+    Serves fixed per task values of the synthetic services.
+    """
+
+    def __init__(self, task_values_of_services):
+        self._task_values_of_services = task_values_of_services
+
+    def set_cycle_recorder(self, cycle_recorder):
+        pass
+
+    def get_cpu_task_metrics(self, service_name, time_duration):
+        metric_name = "cpu_upscale" if time_duration == _CPU_UPSCALE_TIME_DURATION else "cpu_downscale"
+        return self._task_values_of_services[service_name][metric_name]
+
+    def get_memory_task_metrics(self, service_name, reference_bytes=None):
+        return self._task_values_of_services[service_name]["memory"]
+
+
+class DecisionKernelParity:
+    """
+    Compares the per metric suggestions of the scaler's detailed evaluation with the python and numpy kernels.
+
+    Synthetic services have random thresholds (overlapping ones included), aggregations, conflict resolutions
+    and per task values, some of them exactly on a threshold.
+    """
+
+    def __init__(self, seed=0):
+        """
+        Args:
+            seed (int): Seed of the synthetic services.
+        """
+        self._random = random.Random(seed)
+
+
+    def run(self, service_count, repetitions=10):
+        """
+        Compare and time the kernels for service_count synthetic services.
+
+        Args:
+            service_count (int): Amount of synthetic services.
+            repetitions (int): Runs of each kernel, the fastest is reported.
+
+        Returns:
+            dict: Mismatches per kernel and timings.
+        """
+        autoscale_services, task_values_of_services = self._get_synthetic_services(service_count)
+
+        # Detailed evaluation.
+        scaler = DockerServiceScaler.DockerServiceScaler(
+            client=FakeDockerClient.FakeDockerClient(),
+            prometheus_connector=_SyntheticPrometheusConnector(task_values_of_services),
+            message_platform_handler=SilentMessagePlatformHandler.SilentMessagePlatformHandler(),
+            scale_executor=ScaleExecutor.ScaleExecutor()
+        )
+        detailed_start = time.perf_counter()
+        cpu_suggestions = [scaler._get_cpu_scale_metrics(autoscale_service).get_scaling_suggestion() for autoscale_service in autoscale_services]
+        memory_suggestions = [scaler._get_memory_scale_metrics(autoscale_service).get_scaling_suggestion() for autoscale_service in autoscale_services]
+        detailed_seconds = time.perf_counter() - detailed_start
+
+        # Columns, gathered once like the pre-pass of the scaler does.
+        cpu_columns = self._get_columns(autoscale_services, task_values_of_services, "cpu_upscale", "cpu_downscale", "cpu")
+        memory_columns = self._get_columns(autoscale_services, task_values_of_services, "memory", "memory", "memory")
+        conflict_resolutions = [autoscale_service.get_scaling_conflict_resolution() for autoscale_service in autoscale_services]
+
+        kernels = {"python": False}
+        if ThresholdClassifier.is_numpy_available():
+            kernels["numpy"] = True
+        result = {"service_count": service_count, "detailed_seconds": detailed_seconds, "kernels": {}}
+        for kernel_name, use_numpy in kernels.items():
+            kernel_seconds = None
+            for repetition in range(max(1, repetitions)):
+                kernel_start = time.perf_counter()
+                kernel_cpu_suggestions = ThresholdClassifier.to_scaling_suggestions(ThresholdClassifier.get_suggestion_codes(*cpu_columns, use_numpy=use_numpy), conflict_resolutions)
+                kernel_memory_suggestions = ThresholdClassifier.to_scaling_suggestions(ThresholdClassifier.get_suggestion_codes(*memory_columns, use_numpy=use_numpy), conflict_resolutions)
+                elapsed_seconds = time.perf_counter() - kernel_start
+                kernel_seconds = elapsed_seconds if kernel_seconds is None else min(kernel_seconds, elapsed_seconds)
+            mismatches = [
+                autoscale_service.get_service_name()
+                for autoscale_service, cpu_suggestion, memory_suggestion, kernel_cpu_suggestion, kernel_memory_suggestion
+                in zip(autoscale_services, cpu_suggestions, memory_suggestions, kernel_cpu_suggestions, kernel_memory_suggestions)
+                if cpu_suggestion != kernel_cpu_suggestion or memory_suggestion != kernel_memory_suggestion
+            ]
+            result["kernels"][kernel_name] = {"seconds": kernel_seconds, "mismatch_count": len(mismatches), "mismatches": mismatches[:10]}
+        return result
+
+
+    def _get_columns(self, autoscale_services, task_values_of_services, upscale_metric_name, downscale_metric_name, threshold_name):
+        """
+        Aggregated values, thresholds and task maximums of one metric of all services.
+        """
+        aggregation_getter = "get_cpu_aggregation" if threshold_name == "cpu" else "get_memory_aggregation"
+        return (
+            [MetricAggregationUtils.aggregate_task_values(task_values_of_services[autoscale_service.get_service_name()][upscale_metric_name], getattr(autoscale_service, aggregation_getter)()) for autoscale_service in autoscale_services],
+            [getattr(autoscale_service, f"get_{threshold_name}_upscale_threshold")() for autoscale_service in autoscale_services],
+            [MetricAggregationUtils.aggregate_task_values(task_values_of_services[autoscale_service.get_service_name()][downscale_metric_name], getattr(autoscale_service, aggregation_getter)()) for autoscale_service in autoscale_services],
+            [getattr(autoscale_service, f"get_{threshold_name}_downscale_threshold")() for autoscale_service in autoscale_services],
+            [MetricAggregationUtils.get_task_metric_spread(task_values_of_services[autoscale_service.get_service_name()][upscale_metric_name]).get_maximum() for autoscale_service in autoscale_services]
+        )
+
+
+    def _get_synthetic_services(self, service_count):
+        """
+        Random services with cpu and relative memory scaling and their per task values.
+
+        Returns:
+            tuple: (list of AutoScaleService, dict of service name -> metric name -> task values).
+        """
+        autoscale_services = []
+        task_values_of_services = {}
+        for service_index in range(service_count):
+            service_name = f"parity_service_{service_index:05d}"
+            cpu_upscale_threshold = self._random.randint(30, 95)
+            cpu_downscale_threshold = self._random.randint(5, 60)
+            memory_upscale_threshold = self._random.randint(30, 95)
+            memory_downscale_threshold = self._random.randint(5, 60)
+            labels = {
+                "autoscale": "true",
+                "autoscale.minimum_replicas": "1",
+                "autoscale.maximum_replicas": "10",
+                "autoscale.cpu_upscale_threshold": str(cpu_upscale_threshold),
+                "autoscale.cpu_upscale_time_duration": _CPU_UPSCALE_TIME_DURATION,
+                "autoscale.cpu_downscale_threshold": str(cpu_downscale_threshold),
+                "autoscale.cpu_downscale_time_duration": _CPU_DOWNSCALE_TIME_DURATION,
+                "autoscale.cpu_aggregation": self._random.choice(_AGGREGATIONS),
+                "autoscale.memory_upscale_threshold": f"{memory_upscale_threshold}%",
+                "autoscale.memory_downscale_threshold": f"{memory_downscale_threshold}%",
+                "autoscale.memory_aggregation": self._random.choice(_AGGREGATIONS),
+                "autoscale.scaling_conflict_resolution": self._random.choice(list(ScalingConflictResolution)).value
+            }
+            autoscale_services.append(AutoScaleService.AutoScaleService(service_name, labels, {"Limits": {"MemoryBytes": 1024 ** 3}}))
+
+            task_count = self._random.randint(0, 6)
+            task_values_of_services[service_name] = {
+                "cpu_upscale": self._get_task_values(service_name, task_count, [cpu_upscale_threshold, cpu_downscale_threshold]),
+                "cpu_downscale": self._get_task_values(service_name, task_count, [cpu_upscale_threshold, cpu_downscale_threshold]),
+                "memory": self._get_task_values(service_name, task_count, [memory_upscale_threshold, memory_downscale_threshold])
+            }
+        return autoscale_services, task_values_of_services
+
+
+    def _get_task_values(self, service_name, task_count, thresholds):
+        """
+        Random task values, every fifth exactly on one of the thresholds.
+        """
+        return [
+            (f"{service_name}.{task_number}", f"node{task_number % 3}", float(self._random.choice(thresholds)) if self._random.random() < 0.2 else self._random.uniform(0, 100))
+            for task_number in range(1, task_count + 1)
+        ]
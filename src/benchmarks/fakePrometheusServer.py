@@ -0,0 +1,161 @@
+# In process HTTP server answering the autoscaler's prometheus queries with synthetic per task values.
+
+# Query parsing.
+import re
+
+# Responses.
+import json
+from urllib.parse import urlparse, parse_qs
+
+# Server.
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakePrometheusServer:
+    """
+    Serves /api/v1/query like prometheus, with configurable latency.
+
+    Every service has a load between 0 and 1 (see set_service_load). Each of its tasks reports
+    load * 100 percent cpu, load * 100 percent of the queried memory reference, or load * 1GiB
+    memory if the query is not relative. Queries grouped by service name answer for all services with a load.
+    """
+
+    def __init__(self, replicas_of_service, latency_seconds=0.0):
+        """
+        Args:
+            replicas_of_service (callable): Returns the current replicas of a service name.
+            latency_seconds (float): Delay added to every response.
+        """
+        self._replicas_of_service = replicas_of_service
+        self._latency_seconds = latency_seconds
+        self._service_loads = {}
+        self._query_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+
+    def set_service_load(self, service_name, load):
+        """
+        Set the load of a service between 0 and 1.
+        """
+        self._service_loads[service_name] = load
+
+
+    def start(self):
+        """
+        Start serving on a free local port.
+
+        Returns:
+            str: Url of the server.
+        """
+        fake_server = self
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, without TCP_NODELAY keep-alive clients wait for delayed acks like prometheus does not.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                fake_server._handle(self, parse_qs(urlparse(self.path).query))
+
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length", 0))
+                fake_server._handle(self, parse_qs(self.rfile.read(content_length).decode()))
+
+            def log_message(self, format, *args):
+                pass
+
+        class _Server(ThreadingHTTPServer):
+            # Default backlog of 5 drops connections under load.
+            request_queue_size = 128
+
+        self._server = _Server(("127.0.0.1", 0), _RequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+    def get_query_count(self):
+        """
+        Get the amount of answered queries.
+        """
+        return self._query_count
+
+
+    def reset_query_count(self):
+        """
+        Reset the amount of answered queries.
+        """
+        with self._lock:
+            self._query_count = 0
+
+
+    def _handle(self, request_handler, parameters):
+        """
+        Answer one query request.
+        """
+        with self._lock:
+            self._query_count += 1
+        if self._latency_seconds > 0:
+            time.sleep(self._latency_seconds)
+
+        query = parameters.get("query", [""])[0]
+        body = json.dumps({
+            "status": "success",
+            "data": {"resultType": "vector", "result": self._get_result(query)}
+        }).encode()
+
+        request_handler.send_response(200)
+        request_handler.send_header("Content-Type", "application/json")
+        request_handler.send_header("Content-Length", str(len(body)))
+        request_handler.end_headers()
+        request_handler.wfile.write(body)
+
+
+    def _get_result(self, query):
+        """
+        Synthetic per task result of a query.
+        """
+        # All services at once?
+        if "by (container_label_com_docker_swarm_service_name," in query:
+            service_names = list(self._service_loads)
+        else:
+            service_name_match = re.search(r"container_label_com_docker_swarm_service_name='([^']+)'", query)
+            if service_name_match is None:
+                return []
+            service_names = [service_name_match.group(1)]
+
+        result = []
+        now = time.time()
+        for service_name in service_names:
+            load = self._service_loads.get(service_name, 0.5)
+
+            # Percentage for cpu and relative memory, bytes for absolute memory.
+            if " * 100" in query:
+                value = load * 100
+            else:
+                value = load * 1024 ** 3
+
+            result.extend({
+                "metric": {
+                    "container_label_com_docker_swarm_service_name": service_name,
+                    "container_label_com_docker_swarm_task_name": f"{service_name}.{task_number}",
+                    "container_label_com_docker_swarm_node_id": f"node{task_number % 3}"
+                },
+                "value": [now, str(value)]
+            } for task_number in range(1, self._replicas_of_service(service_name) + 1))
+        return result
@@ -0,0 +1,95 @@
+# Fake docker client adding latency to and counting every docker api call.
+
+# Latency.
+import time
+
+# Counting calls of parallel scale operations.
+import threading
+
+# In memory services.
+import fakeDockerClient as FakeDockerClient
+
+
+class LatencyDockerClient:
+    """
+    FakeDockerClient whose api calls (list, get, scale) sleep and are counted.
+    """
+
+    def __init__(self, latency_seconds=0.0):
+        """
+        Args:
+            latency_seconds (float): Delay added to every api call.
+        """
+        self._latency_seconds = latency_seconds
+        self._call_counts = {"services.list": 0, "services.get": 0, "service.scale": 0}
+        self._call_counts_lock = threading.Lock()
+        self._fakeClient = FakeDockerClient.FakeDockerClient()
+        self.services = _LatencyServiceCollection(self, self._fakeClient.services)
+
+
+    def add_service(self, name, labels, replicas, resources=None):
+        """
+        Add a service without counting it as api call.
+        """
+        return self._fakeClient.services.add(name, labels, replicas, resources)
+
+
+    def get_call_counts(self):
+        """
+        Get the amount of api calls per call type.
+        """
+        return dict(self._call_counts)
+
+
+    def reset_call_counts(self):
+        """
+        Reset all call counts.
+        """
+        for call_name in self._call_counts:
+            self._call_counts[call_name] = 0
+
+
+    def _call(self, call_name):
+        """
+        Count and delay one api call.
+        """
+        with self._call_counts_lock:
+            self._call_counts[call_name] += 1
+        if self._latency_seconds > 0:
+            time.sleep(self._latency_seconds)
+
+
+class _LatencyServiceCollection:
+
+    def __init__(self, latency_client, services):
+        self._latencyClient = latency_client
+        self._services = services
+
+    def list(self, **kwargs):
+        self._latencyClient._call("services.list")
+        return [_LatencyService(self._latencyClient, service) for service in self._services.list(**kwargs)]
+
+    def get(self, service_id):
+        self._latencyClient._call("services.get")
+        return _LatencyService(self._latencyClient, self._services.get(service_id))
+
+
+class _LatencyService:
+
+    def __init__(self, latency_client, service):
+        self._latencyClient = latency_client
+        self._service = service
+        self.id = service.id
+        self.attrs = service.attrs
+
+    @property
+    def name(self):
+        return self._service.name
+
+    @property
+    def version(self):
+        return self._service.version
+
+    def scale(self, replicas):
+        self._latencyClient._call("service.scale")
+        return self._service.scale(replicas)
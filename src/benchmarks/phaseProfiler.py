@@ -0,0 +1,106 @@
+# Measures wall time, allocations and peak RSS growth per phase of an autoscaling cycle.
+
+# Measurements.
+import resource
+import time
+import tracemalloc
+
+# Wrapping methods.
+import functools
+
+
+class PhaseProfiler:
+    """
+    Attributes the cost of wrapped methods to named phases.
+
+    Phases may nest (e.g. messaging inside scaling), nested time and allocations are only
+    counted for the innermost phase, so the phases add up to the whole cycle.
+    """
+
+    def __init__(self, trace_allocations=False):
+        """
+        Args:
+            trace_allocations (bool): Measure allocations with tracemalloc, which slows down everything.
+        """
+        self._trace_allocations = trace_allocations
+        self._phases = {}
+        self._stack = []
+
+
+    def wrap(self, target, method_name, phase_name):
+        """
+        Replace target.method_name by a wrapper measuring it as phase_name.
+        """
+        method = getattr(target, method_name)
+        profiler = self
+
+        @functools.wraps(method)
+        def measured_method(*args, **kwargs):
+            profiler._enter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler._exit(phase_name)
+
+        setattr(target, method_name, measured_method)
+
+
+    def start(self):
+        """
+        Start measuring, resets all phases.
+        """
+        self._phases = {}
+        self._stack = []
+        if self._trace_allocations:
+            tracemalloc.start()
+
+
+    def stop(self):
+        """
+        Stop measuring.
+
+        Returns:
+            dict: Measurements per phase name, plus peak traced memory if allocations were traced.
+        """
+        result = {"phases": self._phases}
+        if self._trace_allocations:
+            result["traced_memory_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return result
+
+
+    def _enter(self):
+        """
+        Start measuring a (possibly nested) phase.
+        """
+        self._stack.append({
+            "start_seconds": time.perf_counter(),
+            "start_allocated_bytes": tracemalloc.get_traced_memory()[0] if self._trace_allocations else 0,
+            "start_peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "nested_seconds": 0.0,
+            "nested_allocated_bytes": 0,
+            "nested_peak_rss_kib": 0
+        })
+
+
+    def _exit(self, phase_name):
+        """
+        Finish measuring the innermost phase and account it.
+        """
+        frame = self._stack.pop()
+        seconds = time.perf_counter() - frame["start_seconds"]
+        allocated_bytes = tracemalloc.get_traced_memory()[0] - frame["start_allocated_bytes"] if self._trace_allocations else 0
+        peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - frame["start_peak_rss_kib"]
+
+        # Exclusive measurements.
+        phase = self._phases.setdefault(phase_name, {"calls": 0, "wall_seconds": 0.0, "net_allocated_bytes": 0, "peak_rss_growth_kib": 0})
+        phase["calls"] += 1
+        phase["wall_seconds"] += seconds - frame["nested_seconds"]
+        phase["net_allocated_bytes"] += allocated_bytes - frame["nested_allocated_bytes"]
+        phase["peak_rss_growth_kib"] += peak_rss_kib - frame["nested_peak_rss_kib"]
+
+        # Nested in an outer phase.
+        if self._stack:
+            self._stack[-1]["nested_seconds"] += seconds
+            self._stack[-1]["nested_allocated_bytes"] += allocated_bytes
+            self._stack[-1]["nested_peak_rss_kib"] += peak_rss_kib
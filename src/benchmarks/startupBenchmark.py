@@ -0,0 +1,102 @@
+# Time from starting a fresh autoscaler process until its first cycle completed, e.g. after a failover.
+
+# Fresh interpreters.
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Modules imported by scale_services.py before its first cycle.
+STARTUP_MODULES = [
+    "dockerServiceScaler",
+    "messagePlatformHandler",
+    "autoscalerMetrics",
+    "autoscalerHealth",
+    "leaderElection",
+    "serviceSharding",
+    "converterUtils"
+]
+
+# Runs in the fresh interpreter, prints the times of each milestone as json.
+_CHILD_SCRIPT = """
+import time
+interpreter_ready_at = time.time()
+import sys
+sys.path[1:1] = {import_paths!r}
+for module in {startup_modules!r}:
+    __import__(module)
+imports_done_at = time.time()
+import json
+import cycleBenchmark as CycleBenchmark
+result = CycleBenchmark.CycleBenchmark(trace_allocations=False).run([{service_count}])
+print(json.dumps({{
+    "interpreter_ready_at": interpreter_ready_at,
+    "imports_done_at": imports_done_at,
+    "first_cycle_seconds": result["results"][0]["wall_seconds"],
+    "first_cycle_done_at": time.time()
+}}))
+"""
+
+
+class StartupBenchmark:
+    """
+    Starts fresh interpreters importing the autoscaler and running one cycle against the stand-ins of the CycleBenchmark.
+
+    Each run is split into interpreter start, imports and the first cycle. Setting up the stand-ins is included
+    in the total, so the total is an upper bound of the time the autoscaler needs until its first decisions.
+    """
+
+    def __init__(self, service_count=50, repetitions=3):
+        """
+        Args:
+            service_count (int): Synthetic services of the first cycle.
+            repetitions (int): Fresh processes started, the median is checked against the budget.
+        """
+        self._service_count = service_count
+        self._repetitions = max(1, repetitions)
+
+
+    def run(self, budget_seconds=None):
+        """
+        Start the processes and compare the median total with the budget.
+
+        Args:
+            budget_seconds (float|None): Maximum median seconds until the first cycle completed, None to not check.
+
+        Returns:
+            dict: Metadata, all runs, the median total and whether it is within the budget.
+        """
+        source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        import_paths = [os.path.join(source_directory, *path) for path in [("utils",), ("utils", "messaging"), ("models",), ("definitions",), ("simulation",), ("benchmarks",)]]
+        child_script = _CHILD_SCRIPT.format(import_paths=import_paths, startup_modules=STARTUP_MODULES, service_count=self._service_count)
+
+        runs = []
+        for repetition in range(self._repetitions):
+            started_at = time.time()
+            process = subprocess.run([sys.executable, "-c", child_script], capture_output=True, text=True)
+            exited_at = time.time()
+            if process.returncode != 0:
+                raise RuntimeError(f"Startup benchmark process failed: {process.stderr.strip()}")
+            milestones = json.loads(process.stdout.strip().splitlines()[-1])
+            runs.append({
+                "interpreter_start_seconds": milestones["interpreter_ready_at"] - started_at,
+                "import_seconds": milestones["imports_done_at"] - milestones["interpreter_ready_at"],
+                "first_cycle_seconds": milestones["first_cycle_seconds"],
+                "until_first_cycle_done_seconds": milestones["first_cycle_done_at"] - started_at,
+                "process_seconds": exited_at - started_at
+            })
+
+        median_seconds = statistics.median(run["until_first_cycle_done_seconds"] for run in runs)
+        return {
+            "metadata": {
+                "python_version": sys.version.split()[0],
+                "service_count": self._service_count,
+                "budget_seconds": budget_seconds
+            },
+            "runs": runs,
+            "median_until_first_cycle_done_seconds": median_seconds,
+            "within_budget": budget_seconds is None or median_seconds <= budget_seconds
+        }
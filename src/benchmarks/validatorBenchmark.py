@@ -0,0 +1,128 @@
+# Micro-benchmark of the label validators and converters against their previous per call implementations.
+
+# Timing.
+import re
+import timeit
+
+# Own classes.
+import converterUtils
+import validationUtils
+import autoScaleService as AutoScaleService
+
+# Definitions.
+from valid_values import ScalingConflictResolution, ServicePriority
+
+
+### Previous implementations, evaluating patterns and building value lists on every call ###
+
+def _baseline_human_readable_storage_to_bytes(size):
+    size = size.strip().lower()
+    try:
+        if size.endswith('kib'):
+            return int(float(size[:-3]) * 1024)
+        elif size.endswith('mib'):
+            return int(float(size[:-3]) * 1024 * 1024)
+        elif size.endswith('gib'):
+            return int(float(size[:-3]) * 1024 * 1024 * 1024)
+        elif size.endswith('tib'):
+            return int(float(size[:-3]) * 1024 * 1024 * 1024 * 1024)
+        elif size.endswith('kb'):
+            return int(float(size[:-2]) * 1000)
+        elif size.endswith('mb'):
+            return int(float(size[:-2]) * 1000 * 1000)
+        elif size.endswith('gb'):
+            return int(float(size[:-2]) * 1000 * 1000 * 1000)
+        elif size.endswith('tb'):
+            return int(float(size[:-2]) * 1000 * 1000 * 1000 * 1000)
+        elif size.endswith('b'):
+            return int(float(size[:-1]))
+        else:
+            return int(float(size))
+    except Exception as e:
+        raise ValueError("Invalid size format.")
+
+def _baseline_is_email_valid(email):
+    return re.match(r'^[\w\.-]+@[a-zA-Z\d\.-]+\.[a-zA-Z]{2,}$', email) is not None
+
+def _baseline_is_telegram_chat_id_valid(chat_id):
+    return re.match(r'^-?\d+$', str(chat_id)) is not None
+
+def _baseline_is_time_duration_valid(value):
+    return re.match(r'^\d+[smhdwy]$', value) is not None
+
+def _baseline_is_enum_value_valid(enum, value):
+    return value in [item.value for item in enum]
+
+
+class ValidatorBenchmark:
+    """
+    Times each validator and converter on typical label values, previous implementation versus current one.
+    """
+
+    _STORAGE_SIZES = ["512MiB", "1.5GiB", "100mb", "2TB", "4096b", "1024"]
+    _EMAILS = ["ops@example.com", "first.last@sub.example.org", "invalid@", "team-a@example.io"]
+    _TELEGRAM_CHAT_IDS = ["123456789", "-1001234567890", "abc", "42"]
+    _TIME_DURATIONS = ["30s", "1m", "5m", "1h", "1.5m"]
+    _CONFLICT_RESOLUTIONS = [item.value for item in ScalingConflictResolution] + ["unknown"]
+    _PRIORITIES = [item.value for item in ServicePriority] + ["unknown"]
+
+    def __init__(self, iterations=20000):
+        """
+        Args:
+            iterations (int): Calls per value and implementation, the fastest of three repetitions is reported.
+        """
+        self._iterations = max(1, iterations)
+
+
+    def run(self):
+        """
+        Time all validators and check both implementations agree.
+
+        Returns:
+            dict: Per validator the seconds per call of both implementations, the speedup and whether their results agree.
+        """
+        autoscale_service = AutoScaleService.AutoScaleService("benchmark", {"autoscale.scaling_conflict_resolution": "adhere_to_cpu", "autoscale.priority": "high"})
+        comparisons = {
+            "human_readable_storage_to_bytes": (_baseline_human_readable_storage_to_bytes, converterUtils.human_readable_storage_to_bytes, self._STORAGE_SIZES),
+            "is_email_valid": (_baseline_is_email_valid, validationUtils.is_email_valid, self._EMAILS),
+            "is_telegram_chat_id_valid": (_baseline_is_telegram_chat_id_valid, validationUtils.is_telegram_chat_id_valid, self._TELEGRAM_CHAT_IDS),
+            "valid time_duration": (_baseline_is_time_duration_valid, lambda value: validationUtils.is_value_valid("valid time_duration", value), self._TIME_DURATIONS),
+            "scaling_conflict_resolution": (lambda value: _baseline_is_enum_value_valid(ScalingConflictResolution, value), lambda value: validationUtils.is_setting_value_valid("scaling_conflict_resolution", value), self._CONFLICT_RESOLUTIONS),
+            "service_priority": (lambda value: _baseline_is_enum_value_valid(ServicePriority, value), lambda value: validationUtils.is_value_valid("service_priority", value), self._PRIORITIES),
+            "AutoScaleService.get_priority": (
+                lambda value: ServicePriority(value) if _baseline_is_enum_value_valid(ServicePriority, value) else ServicePriority.NORMAL,
+                lambda value: autoscale_service.get_priority(),
+                ["high"]
+            )
+        }
+
+        results = {}
+        for validator_name, (baseline, current, values) in comparisons.items():
+            baseline_seconds = self._time_per_call(baseline, values)
+            current_seconds = self._time_per_call(current, values)
+            results[validator_name] = {
+                "baseline_seconds_per_call": baseline_seconds,
+                "current_seconds_per_call": current_seconds,
+                "speedup": baseline_seconds / current_seconds if current_seconds > 0 else None,
+                "results_agree": [self._call(baseline, value) for value in values] == [self._call(current, value) for value in values]
+            }
+        return results
+
+
+    def _time_per_call(self, validator, values):
+        """
+        Fastest seconds per call of three repetitions over all values.
+        """
+        timer = timeit.Timer(lambda: [self._call(validator, value) for value in values])
+        return min(timer.repeat(repeat=3, number=self._iterations)) / (self._iterations * len(values))
+
+
+    @staticmethod
+    def _call(validator, value):
+        """
+        Result of a validator, ValueError for invalid values of converters.
+        """
+        try:
+            return validator(value)
+        except ValueError:
+            return ValueError
@@ -1,4 +1,5 @@
 # Define what labels define cpu scaling and what type of they should be.
+# Aggregations combine the values of all tasks: avg, max, node_max (highest per node mean) or a percentile like p90.
 cpu_labels = [
     {
         "label": "autoscale.cpu_upscale_threshold",
@@ -19,20 +20,80 @@ cpu_labels = [
         "label": "autoscale.cpu_downscale_time_duration",
         "value_type": "valid time_duration",
         "required": False
+    },
+    {
+        "label": "autoscale.cpu_aggregation",
+        "value_type": "aggregation",
+        "required": False
     }
 ]
 
 # Define what labels define memory scaling and what type of they should be.
+# Percentage thresholds are relative to the memory limit or reservation of the service spec.
 memory_labels = [
     {
         "label": "autoscale.memory_upscale_threshold",
-        "value_type": "byte",
+        "value_type": "byte_or_percentage",
         "required": True
     },
     {
         "label": "autoscale.memory_downscale_threshold",
-        "value_type": "byte",
+        "value_type": "byte_or_percentage",
         "required": True
+    },
+    {
+        "label": "autoscale.memory_threshold_reference",
+        "value_type": "memory_threshold_reference",
+        "required": False
+    },
+    {
+        "label": "autoscale.memory_aggregation",
+        "value_type": "aggregation",
+        "required": False
+    }
+]
+
+# Define what labels tune how the suggestions of all metrics are combined into one decision.
+decision_labels = [
+    {
+        "label": "autoscale.scaling_metric_weights",
+        "value_type": "metric_weight_list",
+        "required": False
+    },
+    {
+        "label": "autoscale.scaling_metric_priority",
+        "value_type": "metric_list",
+        "required": False
+    },
+    {
+        "label": "autoscale.scaling_warmup",
+        "value_type": "valid time_duration",
+        "required": False
+    },
+    {
+        "label": "autoscale.replica_schedule",
+        "value_type": "replica_schedule",
+        "required": False
+    },
+    {
+        "label": "autoscale.priority",
+        "value_type": "service_priority",
+        "required": False
+    }
+]
+
+# Define what labels enable scaling to zero replicas while idle and waking up on demand.
+# The wake query is a prometheus query whose value is above 0 while there is demand, e.g. the request rate of the service.
+scale_to_zero_labels = [
+    {
+        "label": "autoscale.scale_to_zero_after",
+        "value_type": "valid time_duration",
+        "required": False
+    },
+    {
+        "label": "autoscale.wake_query",
+        "value_type": "prometheus_query",
+        "required": False
     }
 ]
 
@@ -6,6 +6,18 @@ class ScalingConflictResolution(Enum):
     KEEP_REPLICAS = "keep_replicas"
     ADHERE_TO_MEMORY = "adhere_to_memory"
     ADHERE_TO_CPU = "adhere_to_cpu"
+    WEIGHTED_VOTE = "weighted_vote"
+    PRIORITY_ORDER = "priority_order"
+
+class MemoryThresholdReference(Enum):
+    LIMIT = "limit"
+    RESERVATION = "reservation"
+
+class MetricAggregation(Enum):
+    AVG = "avg"
+    MAX = "max"
+    NODE_MAX = "node_max"
+    # Percentiles are given as "p1" - "p99".
 
 class ScalingSuggestion(Enum):
     SCALE_UP = "scale_up"
@@ -38,6 +50,20 @@ class ScalingMetricName(Enum):
     CPU = "CPU"
     MEMORY = "MEMORY"
 
+class ServicePriority(Enum):
+    # Ordered from lowest to highest.
+    LOW = "low"
+    NORMAL = "normal"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+    def get_rank(self):
+        return list(ServicePriority).index(self)
+
+class ScaleLimitReason(Enum):
+    TASK_BUDGET = "task_budget"
+    CLUSTER_CAPACITY = "cluster_capacity"
+
 class MessagingPlatforms(Enum):
     LOGGING = "LOGGING"
     EMAIL = "EMAIL"
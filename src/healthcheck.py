@@ -0,0 +1,24 @@
+# Container healthcheck, fails if the long running autoscaler is stuck.
+#
+# Usage: python healthcheck.py  (exit code 0: healthy or health endpoint disabled, 1: unhealthy)
+
+# Get environment variables.
+import os
+import sys
+
+# Health request.
+import urllib.request
+
+health_port = os.getenv("HEALTH_PORT", "").strip().strip("\"")
+autoscale_interval = os.getenv("AUTOSCALE_INTERVAL", "").strip().strip("\"")
+
+# Health endpoint disabled, e.g. single cycle mode.
+if not health_port or not autoscale_interval:
+    sys.exit(0)
+
+try:
+    with urllib.request.urlopen(f"http://127.0.0.1:{health_port}/health/live", timeout=5) as response:
+        sys.exit(0 if response.status == 200 else 1)
+except Exception as e:
+    print(f"Autoscaler not live: {e}")
+    sys.exit(1)
@@ -6,12 +6,31 @@ import validationUtils
 
 # Definitions.
 from label_definitions import cpu_labels, memory_labels
-from valid_values import ScalingConflictResolution, LogLevel
+from valid_values import ScalingConflictResolution, MemoryThresholdReference, MetricAggregation, ServicePriority
 
 class AutoScaleService:
-    def __init__(self, service_name, autoscale_labels):
+    def __init__(self, service_name, autoscale_labels, service_resources=None, service_rollout=None, parsed_labels=None):
         self._service_name = service_name
         self._autoscale_labels = autoscale_labels
+        self._service_resources = service_resources if service_resources else {}
+        self._service_rollout = service_rollout if service_rollout else {}
+        # Converted label values, shared by all services with the same autoscale labels. Must not be modified by callers.
+        self._parsed_labels = parsed_labels if parsed_labels is not None else {}
+
+    def _get_parsed_label(self, label_key, parse):
+        """
+        Get the converted value of a label, converting it only once per label set.
+
+        Args:
+            label_key (str): Autoscale label to convert.
+            parse (callable): Converts the label value (None if not set).
+
+        Returns:
+            The converted value.
+        """
+        if label_key not in self._parsed_labels:
+            self._parsed_labels[label_key] = parse(self._autoscale_labels.get(label_key, None))
+        return self._parsed_labels[label_key]
 
 
     ### Common required labels ###
@@ -33,18 +52,113 @@ class AutoScaleService:
     # Scaling Conflict Resolution.
     def get_scaling_conflict_resolution(self):
         value = self._autoscale_labels.get("autoscale.scaling_conflict_resolution", None)
-        if value is not None and value in [item.value for item in ScalingConflictResolution]:
-            return value
+        if value is not None and validationUtils.is_setting_value_valid("scaling_conflict_resolution", value):
+            return ScalingConflictResolution(value)
         return ScalingConflictResolution.SCALE_UP
     
+    # Weights of each metric for weighted vote conflict resolution.
+    def get_scaling_metric_weights(self):
+        return self._get_parsed_label("autoscale.scaling_metric_weights", lambda value: converterUtils.get_metric_weights_from_metric_weights_list_string(value)[0])
+    
+    # Metrics ordered by priority for priority order conflict resolution.
+    def get_scaling_metric_priority(self):
+        return self._get_parsed_label("autoscale.scaling_metric_priority", lambda value: converterUtils.get_metric_names_from_metric_list_string(value)[0])
+    
+    # Scheduled overrides of minimum and maximum replicas.
+    def get_replica_schedule(self):
+        return self._get_parsed_label("autoscale.replica_schedule", lambda value: converterUtils.get_replica_schedule_from_string(value)[0])
+
+    def get_scheduled_replica_bounds(self, local_datetime):
+        """
+        Get minimum and maximum replicas at a point in time, with the active schedule entries overriding the labels.
+
+        Overlapping entries combine to the highest minimum and the highest maximum. The maximum is raised to the minimum if needed.
+
+        Args:
+            local_datetime (datetime): The point in time in the configured TIMEZONE.
+
+        Returns:
+            tuple: (minimum replicas, maximum replicas, amount of active schedule entries).
+        """
+        minute = local_datetime.hour * 60 + local_datetime.minute
+        weekday = local_datetime.weekday()
+        scheduled_minimums = []
+        scheduled_maximums = []
+        active_entries = 0
+        for entry in self.get_replica_schedule():
+            spans_midnight = entry["end_minute"] <= entry["start_minute"]
+            is_active_today = weekday in entry["days"] and minute >= entry["start_minute"] and (spans_midnight or minute < entry["end_minute"])
+            is_active_since_yesterday = spans_midnight and (weekday - 1) % 7 in entry["days"] and minute < entry["end_minute"]
+            if is_active_today or is_active_since_yesterday:
+                active_entries += 1
+                if entry["minimum_replicas"] is not None:
+                    scheduled_minimums.append(entry["minimum_replicas"])
+                if entry["maximum_replicas"] is not None:
+                    scheduled_maximums.append(entry["maximum_replicas"])
+
+        minimum_replicas = max(scheduled_minimums) if scheduled_minimums else self.get_minimum_replicas()
+        maximum_replicas = max(scheduled_maximums) if scheduled_maximums else self.get_maximum_replicas()
+        return minimum_replicas, max(minimum_replicas, maximum_replicas), active_entries
+    
+    # Priority class, services of higher classes get capacity first when scale-ups compete for it.
+    def get_priority(self):
+        value = self._autoscale_labels.get("autoscale.priority", None)
+        if value is not None and validationUtils.is_value_valid("service_priority", value):
+            return ServicePriority(value)
+        return ServicePriority.NORMAL
+    
+    # Time after an update of the service, in which its new tasks warm up and it is not evaluated.
+    def get_scaling_warmup_seconds(self):
+        try:
+            return converterUtils.time_duration_to_seconds(self._autoscale_labels.get("autoscale.scaling_warmup", "1m"))
+        except ValueError:
+            return 60
+    
+    # Idle time after which the service is scaled to zero replicas, None if it is never scaled to zero.
+    def get_scale_to_zero_after_seconds(self):
+        value = self._autoscale_labels.get("autoscale.scale_to_zero_after", None)
+        if value is None:
+            return None
+        try:
+            return converterUtils.time_duration_to_seconds(value)
+        except ValueError:
+            return None
+
+    def is_scale_to_zero_enabled(self):
+        return self.get_scale_to_zero_after_seconds() is not None
+
+    # Prometheus query of the demand that keeps the service running and wakes it up, None to only wake it up externally.
+    def get_wake_query(self):
+        value = self._autoscale_labels.get("autoscale.wake_query", None)
+        if value is None or not value.strip():
+            return None
+        return value.strip()
+    
     # LogLevel.
     def get_service_log_level(self):
         value = self._autoscale_labels.get("autoscale.log_level", None)
-        if value is not None and value in [item.value for item in LogLevel]:
+        if value is not None and validationUtils.is_setting_value_valid("log_level", value):
             return value
         return None
     
 
+    ### Rollout state ###
+
+    # Seconds since the epoch of the last update of the service spec, e.g. a scaling. None if unknown.
+    def get_updated_at_seconds(self):
+        updated_at = self._service_rollout.get("updated_at", None)
+        if updated_at is None:
+            return None
+        return converterUtils.docker_timestamp_to_seconds(updated_at)
+
+    # Running and desired tasks, None if not reported by the docker api.
+    def get_running_tasks(self):
+        return self._service_rollout.get("running_tasks", None)
+
+    def get_desired_tasks(self):
+        return self._service_rollout.get("desired_tasks", None)
+
+
     ### Message Platforms ###
 
     ## Email ##
@@ -88,8 +202,7 @@ class AutoScaleService:
         Returns:
             list: List of valid email addresses based on the label key.
         """
-        valid_emails, warnings = converterUtils.get_email_array_from_emails_list_string(self._autoscale_labels.get(label_key, None))
-        return valid_emails
+        return self._get_parsed_label(label_key, lambda value: converterUtils.get_email_array_from_emails_list_string(value)[0])
     
     
 
@@ -179,6 +292,9 @@ class AutoScaleService:
     
     def get_cpu_downscale_time_duration(self):
         return self._autoscale_labels.get("autoscale.cpu_downscale_time_duration", "5m")
+    
+    def get_cpu_aggregation(self):
+        return self._autoscale_labels.get("autoscale.cpu_aggregation", MetricAggregation.AVG.value)
 
     # Memory.
     def is_scaling_based_on_memory_enabled(self):
@@ -188,9 +304,54 @@ class AutoScaleService:
                 return False
         return True
     
+    def is_memory_threshold_relative(self):
+        """
+        Whether the memory thresholds are percentages of the memory limit or reservation instead of bytes.
+        """
+        return converterUtils.is_percentage_string(self._autoscale_labels.get("autoscale.memory_upscale_threshold", None))
+    
+    def get_memory_threshold_reference(self):
+        value = self._autoscale_labels.get("autoscale.memory_threshold_reference", None)
+        if value is not None and validationUtils.is_value_valid("memory_threshold_reference", value):
+            return MemoryThresholdReference(value)
+        return MemoryThresholdReference.LIMIT
+    
+    def get_memory_reference_bytes(self):
+        """
+        Get the memory limit or reservation of the service spec, that relative memory thresholds refer to.
+
+        Returns:
+            int|None: Bytes of the referenced memory setting or None, if the service spec does not define it.
+        """
+        if self.get_memory_threshold_reference() == MemoryThresholdReference.RESERVATION:
+            resources = self._service_resources.get("Reservations", {})
+        else:
+            resources = self._service_resources.get("Limits", {})
+        memory_bytes = resources.get("MemoryBytes", 0)
+        return int(memory_bytes) if memory_bytes else None
+    
+    def get_reserved_nano_cpus(self):
+        """Get the cpu reservation of one task in billionths of a cpu, 0 if not reserved."""
+        return int(self._service_resources.get("Reservations", {}).get("NanoCPUs", 0) or 0)
+
+    def get_reserved_memory_bytes(self):
+        """Get the memory reservation of one task, 0 if not reserved."""
+        return int(self._service_resources.get("Reservations", {}).get("MemoryBytes", 0) or 0)
+    
+    def get_memory_aggregation(self):
+        return self._autoscale_labels.get("autoscale.memory_aggregation", MetricAggregation.AVG.value)
+    
     def get_memory_upscale_threshold(self):
-        return converterUtils.human_readable_storage_to_bytes(self._autoscale_labels.get("autoscale.memory_upscale_threshold", None))
+        return self._get_memory_threshold("autoscale.memory_upscale_threshold")
     
     def get_memory_downscale_threshold(self):
-        return converterUtils.human_readable_storage_to_bytes(self._autoscale_labels.get("autoscale.memory_downscale_threshold", None))
+        return self._get_memory_threshold("autoscale.memory_downscale_threshold")
+    
+    def _get_memory_threshold(self, label_key):
+        """
+        Get a memory threshold either as bytes or as percentage of the memory reference (see is_memory_threshold_relative).
+        """
+        if self.is_memory_threshold_relative():
+            return converterUtils.percentage_to_float(self._autoscale_labels.get(label_key, None))
+        return converterUtils.human_readable_storage_to_bytes(self._autoscale_labels.get(label_key, None))
     
\ No newline at end of file
@@ -0,0 +1,97 @@
+class ScaleOperation:
+    """Model of a scaling decided for a service within a cycle, applied later by the ScaleExecutor."""
+
+    def __init__(self, autoscale_service, service, current_replicas, new_replicas, scaling_suggestion, scaling_metrics=None):
+        """
+        Initialize ScaleOperation object.
+
+        Args:
+            autoscale_service (AutoScaleService): The service to scale.
+            service (docker.models.services.Service): The service as read for the decision, carrying its spec version.
+            current_replicas (int): Replicas of the read spec.
+            new_replicas (int): Replicas decided for the service.
+            scaling_suggestion (ScalingSuggestion): The suggestion the decision is based on, to re-evaluate it on conflicts.
+            scaling_metrics (list of ScalingMetrics|None): The individual metric's suggestions, for notifications.
+        """
+        self._autoscale_service = autoscale_service
+        self._service = service
+        self._current_replicas = current_replicas
+        self._new_replicas = new_replicas
+        self._requested_replicas = new_replicas
+        self._limit_reason = None
+        self._preempted_for = None
+        self._scaling_suggestion = scaling_suggestion
+        self._scaling_metrics = scaling_metrics if scaling_metrics else []
+
+
+    ## Getter methods ##
+
+    def get_autoscale_service(self):
+        """Get the service to scale."""
+        return self._autoscale_service
+
+    def get_service(self):
+        """Get the service as read for the decision."""
+        return self._service
+
+    def get_current_replicas(self):
+        """Get the replicas of the read spec."""
+        return self._current_replicas
+
+    def get_new_replicas(self):
+        """Get the replicas decided for the service."""
+        return self._new_replicas
+
+    def get_requested_replicas(self):
+        """Get the replicas decided before any limit."""
+        return self._requested_replicas
+
+    def get_limit_reason(self):
+        """Get the ScaleLimitReason that reduced or deferred the scaling, None if not limited."""
+        return self._limit_reason
+
+    def get_preempted_for(self):
+        """Get the higher priority AutoScaleService this scale-down frees capacity for, None if not preempted."""
+        return self._preempted_for
+
+    def get_scaling_suggestion(self):
+        """Get the suggestion the decision is based on."""
+        return self._scaling_suggestion
+
+    def get_scaling_metrics(self):
+        """Get the individual metric's suggestions."""
+        return self._scaling_metrics
+
+    def get_new_tasks(self):
+        """Get the amount of tasks the scaling creates, 0 for scaling down."""
+        return max(0, self._new_replicas - self._current_replicas)
+
+    def is_scale_up(self):
+        """Whether the scaling creates tasks."""
+        return self._new_replicas > self._current_replicas
+
+    def is_scaling(self):
+        """Whether the replicas change at all."""
+        return self._new_replicas != self._current_replicas
+
+
+    ## Setter methods ##
+
+    def set_observed_service(self, service, current_replicas):
+        """Set a freshly read spec, e.g. after the spec changed concurrently."""
+        self._service = service
+        self._current_replicas = current_replicas
+
+    def set_new_replicas(self, new_replicas):
+        """Set the replicas decided for the service."""
+        self._new_replicas = new_replicas
+
+    def limit_new_replicas(self, new_replicas, limit_reason):
+        """Reduce the replicas decided for the service, e.g. to the tasks the cluster can place."""
+        self._new_replicas = new_replicas
+        self._limit_reason = limit_reason
+
+    def preempt_for(self, autoscale_service):
+        """Remove one more task to free capacity for a higher priority service."""
+        self._new_replicas -= 1
+        self._preempted_for = autoscale_service
@@ -20,7 +20,9 @@ class ScalingMetrics:
         downscale_threshold=None, 
         downscale_value=None, 
         conflict_resolution: ScalingConflictResolution = ScalingConflictResolution.SCALE_UP, 
-        scaling_suggestion: ScalingSuggestion = ScalingSuggestion.KEEP_REPLICAS
+        scaling_suggestion: ScalingSuggestion = ScalingSuggestion.KEEP_REPLICAS,
+        aggregation=None,
+        task_metric_spread=None
     ):
         """
         Initialize ScalingMetrics object.
@@ -35,10 +37,9 @@ class ScalingMetrics:
             downscale_value: The value for downscaling.
             conflict_resolution (ScalingConflictResolution): The conflict resolution strategy.
             scaling_suggestion (ScalingSuggestion): The scaling suggestion.
+            aggregation (str): How the values of all tasks were combined (avg, max, node_max, p90, ...).
+            task_metric_spread (TaskMetricSpread): How the metric is spread across tasks and nodes.
         """
-        
-        # MessagePlatformHandler.
-        self._messagePlatformHandler = MessagePlatformHandler.MessagePlatformHandler()
 
         # Value instantiation.
         self._autoscale_service = autoscale_service
@@ -47,8 +48,10 @@ class ScalingMetrics:
         if not isinstance(metric_name, ScalingMetricName):
             valid_metric_names = [member.value for member in ScalingMetricName]        
             error_message=f"<EMPHASIZE_STRING_START_TAG>{self._autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: ScalingMetrics: Invalid metric_name: <EMPHASIZE_STRING_START_TAG>{str(metric_name)}</EMPHASIZE_STRING_END_TAG>. Must be one of ScalingMetricName enum values: {', '.join(valid_metric_names)}."
-            self._messagePlatformHandler.handle_error(error_message, self._autoscale_service)
-            self._messagePlatformHandler.send_all_accumulated_messages()
+            # MessagePlatformHandler is only created on error, as it sets up all messaging platforms.
+            messagePlatformHandler = MessagePlatformHandler.MessagePlatformHandler()
+            messagePlatformHandler.handle_error(error_message, self._autoscale_service)
+            messagePlatformHandler.send_all_accumulated_messages()
             raise ValueError(error_message)
 
         self._metric_name = metric_name
@@ -59,6 +62,8 @@ class ScalingMetrics:
         self._downscale_value = downscale_value
         self._conflict_resolution = conflict_resolution
         self._scaling_suggestion = scaling_suggestion
+        self._aggregation = aggregation
+        self._task_metric_spread = task_metric_spread
     
 
     ### Setter methods for parameters with default values ###
@@ -90,6 +95,14 @@ class ScalingMetrics:
     def set_scaling_suggestion(self, scaling_suggestion):
         """Set the scaling suggestion."""
         self._scaling_suggestion = scaling_suggestion
+    
+    def set_aggregation(self, aggregation):
+        """Set how the values of all tasks were combined."""
+        self._aggregation = aggregation
+    
+    def set_task_metric_spread(self, task_metric_spread):
+        """Set how the metric is spread across tasks and nodes."""
+        self._task_metric_spread = task_metric_spread
 
 
     ## Getter methods ##
@@ -101,6 +114,30 @@ class ScalingMetrics:
     def get_scaling_suggestion(self):
         """Get the scaling suggestion."""
         return self._scaling_suggestion
+
+    def is_metric_based_scaling_enabled(self):
+        """Get whether scaling based on this metric is enabled."""
+        return self._is_metric_based_scaling_enabled
+
+    def get_upscale_threshold(self):
+        """Get the threshold for upscaling."""
+        return self._upscale_threshold
+
+    def get_upscale_value(self):
+        """Get the value for upscaling."""
+        return self._upscale_value
+
+    def get_downscale_threshold(self):
+        """Get the threshold for downscaling."""
+        return self._downscale_threshold
+
+    def get_downscale_value(self):
+        """Get the value for downscaling."""
+        return self._downscale_value
+
+    def get_task_metric_spread(self):
+        """Get how the metric is spread across tasks and nodes."""
+        return self._task_metric_spread
     
 
     def as_string(self, messagingPlatform: MessagingPlatforms = MessagingPlatforms.LOGGING):
@@ -137,6 +174,8 @@ class ScalingMetrics:
             object_string += f"{default_divider}upscale value: {self._get_human_readable_upscale_value_string()}"
             object_string += f"{default_divider}downscale threshold: {self._get_human_readable_downscale_threshold_string()}"
             object_string += f"{default_divider}downscale value: {self._get_human_readable_downscale_value_string()}"
+            if self._task_metric_spread is not None and self._task_metric_spread.get_task_count() > 0:
+                object_string += f"{default_divider}task spread ({self._aggregation}): {self._get_human_readable_task_metric_spread_string()}"
             object_string += f"{default_divider}conflict resolution: <EMPHASIZE_STRING_START_TAG>{self._get_visualized_conflict_resolution_string(messagingPlatform)}</EMPHASIZE_STRING_END_TAG>"
             object_string += f"{default_divider}scaling suggestion: <EMPHASIZE_STRING_START_TAG>{self._get_visualized_scaling_suggestion_string(messagingPlatform)}</EMPHASIZE_STRING_END_TAG>"
         else:
@@ -157,7 +196,7 @@ class ScalingMetrics:
         if self._metric_name == ScalingMetricName.CPU:
             human_readable_upscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_threshold} ({converterUtils.float_to_percentage(self._upscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
         elif self._metric_name == ScalingMetricName.MEMORY:
-            human_readable_upscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_threshold} ({converterUtils.bytes_to_human_readable_storage(self._upscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
+            human_readable_upscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_threshold} ({self._format_memory_value(self._upscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
         else:
             human_readable_upscale_threshold_string=f"ScalingMetrics._get_human_readable_upscale_threshold_string(): unimplemented metric_name <EMPHASIZE_STRING_START_TAG>{self._metric_name}</EMPHASIZE_STRING_END_TAG>"
         return human_readable_upscale_threshold_string
@@ -175,7 +214,7 @@ class ScalingMetrics:
         if self._metric_name == ScalingMetricName.CPU:
             human_readable_upscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_value} ({converterUtils.float_to_percentage(self._upscale_value)})</EMPHASIZE_STRING_END_TAG>"
         elif self._metric_name == ScalingMetricName.MEMORY:
-            human_readable_upscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_value} ({converterUtils.bytes_to_human_readable_storage(self._upscale_value)})</EMPHASIZE_STRING_END_TAG>"
+            human_readable_upscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._upscale_value} ({self._format_memory_value(self._upscale_value)})</EMPHASIZE_STRING_END_TAG>"
         else:
             human_readable_upscale_value_string=f"ScalingMetrics._get_human_readable_upscale_value_string(): unimplemented metric_name <EMPHASIZE_STRING_START_TAG>{self._metric_name}</EMPHASIZE_STRING_END_TAG>"
         return human_readable_upscale_value_string
@@ -193,7 +232,7 @@ class ScalingMetrics:
         if self._metric_name == ScalingMetricName.CPU:
             human_readable_downscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_threshold} ({converterUtils.float_to_percentage(self._downscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
         elif self._metric_name == ScalingMetricName.MEMORY:
-            human_readable_downscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_threshold} ({converterUtils.bytes_to_human_readable_storage(self._downscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
+            human_readable_downscale_threshold_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_threshold} ({self._format_memory_value(self._downscale_threshold)})</EMPHASIZE_STRING_END_TAG>"
         else:
             human_readable_downscale_threshold_string=f"ScalingMetrics._get_human_readable_downscale_threshold_string(): unimplemented metric_name <EMPHASIZE_STRING_START_TAG>{self._metric_name}</EMPHASIZE_STRING_END_TAG>"
         return human_readable_downscale_threshold_string
@@ -210,12 +249,40 @@ class ScalingMetrics:
         if self._metric_name == ScalingMetricName.CPU:
             human_readable_downscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_value} ({converterUtils.float_to_percentage(self._downscale_value)})</EMPHASIZE_STRING_END_TAG>"
         elif self._metric_name == ScalingMetricName.MEMORY:
-            human_readable_downscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_value} ({converterUtils.bytes_to_human_readable_storage(self._downscale_value)})</EMPHASIZE_STRING_END_TAG>"
+            human_readable_downscale_value_string=f"<EMPHASIZE_STRING_START_TAG>{self._downscale_value} ({self._format_memory_value(self._downscale_value)})</EMPHASIZE_STRING_END_TAG>"
         else:
             human_readable_downscale_value_string=f"ScalingMetrics._get_human_readable_downscale_value_string(): unimplemented metric_name <EMPHASIZE_STRING_START_TAG>{self._metric_name}</EMPHASIZE_STRING_END_TAG>"
         return human_readable_downscale_value_string
     
     
+    def _get_human_readable_task_metric_spread_string(self):
+        """
+        Get task_metric_spread as human readable string.
+
+        Returns:
+            str: Human readable string for task_metric_spread.
+        """
+        if self._metric_name == ScalingMetricName.CPU:
+            format_value = converterUtils.float_to_percentage
+        elif self._metric_name == ScalingMetricName.MEMORY:
+            format_value = self._format_memory_value
+        else:
+            return f"ScalingMetrics._get_human_readable_task_metric_spread_string(): unimplemented metric_name <EMPHASIZE_STRING_START_TAG>{self._metric_name}</EMPHASIZE_STRING_END_TAG>"
+        return f"<EMPHASIZE_STRING_START_TAG>{self._task_metric_spread.get_task_count()}</EMPHASIZE_STRING_END_TAG> tasks, min <EMPHASIZE_STRING_START_TAG>{format_value(self._task_metric_spread.get_minimum())}</EMPHASIZE_STRING_END_TAG>, avg <EMPHASIZE_STRING_START_TAG>{format_value(self._task_metric_spread.get_average())}</EMPHASIZE_STRING_END_TAG>, max <EMPHASIZE_STRING_START_TAG>{format_value(self._task_metric_spread.get_maximum())}</EMPHASIZE_STRING_END_TAG>"
+
+
+    def _format_memory_value(self, memory_value):
+        """
+        Get memory value as human readable string, either as bytes or relative to the service's memory limit or reservation.
+
+        Returns:
+            str: Human readable string for memory_value.
+        """
+        if self._autoscale_service.is_memory_threshold_relative():
+            return f"{converterUtils.float_to_percentage(memory_value)} of memory {self._autoscale_service.get_memory_threshold_reference().value}"
+        return converterUtils.bytes_to_human_readable_storage(memory_value)
+    
+    
     def _get_visualized_conflict_resolution_string(self, messagingPlatform: MessagingPlatforms = MessagingPlatforms.LOGGING):
         """
         Get string for conflict resolution with icons optimized for Messaging Platform.
@@ -0,0 +1,42 @@
+class TaskMetricSpread:
+    """Model of how a metric is spread across the tasks and nodes of a service."""
+
+    def __init__(self, task_count=0, minimum=0.0, average=0.0, maximum=0.0, node_averages=None):
+        """
+        Initialize TaskMetricSpread object.
+
+        Args:
+            task_count (int): Amount of tasks the metric was reported for.
+            minimum (float): Lowest value of any task.
+            average (float): Mean value across all tasks.
+            maximum (float): Highest value of any task.
+            node_averages (dict|None): Node id -> mean value of the tasks running on that node.
+        """
+        self._task_count = task_count
+        self._minimum = minimum
+        self._average = average
+        self._maximum = maximum
+        self._node_averages = node_averages if node_averages else {}
+
+
+    ## Getter methods ##
+
+    def get_task_count(self):
+        """Get the amount of tasks the metric was reported for."""
+        return self._task_count
+
+    def get_minimum(self):
+        """Get the lowest value of any task."""
+        return self._minimum
+
+    def get_average(self):
+        """Get the mean value across all tasks."""
+        return self._average
+
+    def get_maximum(self):
+        """Get the highest value of any task."""
+        return self._maximum
+
+    def get_node_averages(self):
+        """Get the mean value per node."""
+        return self._node_averages
@@ -0,0 +1,64 @@
+# Import time profile of the autoscaler start, broken down by module.
+#
+# Imports the modules scale_services.py starts with in a fresh interpreter with -X importtime and reports the cost of each module.
+# Usage: python profile_startup.py [--modules dockerServiceScaler,messagePlatformHandler] [--top 25] [--output <result.json>]
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+# Fresh interpreter and result output.
+import argparse
+import json
+import subprocess
+
+# Modules imported by scale_services.py, which runs a cycle on import itself.
+import startupBenchmark as StartupBenchmark
+
+parser = argparse.ArgumentParser(description="Profile the import time of the autoscaler start by module.")
+parser.add_argument("--modules", default=",".join(StartupBenchmark.STARTUP_MODULES), help="Comma separated modules to import.")
+parser.add_argument("--top", type=int, default=25, help="Amount of most expensive modules to report.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Import in a fresh interpreter, -X importtime reports every import on stderr.
+source_directory = os.path.dirname(os.path.abspath(__file__))
+import_paths = [os.path.join(source_directory, *path) for path in [("utils",), ("utils", "messaging"), ("models",), ("definitions",)]]
+modules = [module.strip() for module in args.modules.split(",") if module.strip()]
+import_script = f"import sys; sys.path[1:1] = {import_paths!r}\n" + "".join(f"import {module}\n" for module in modules)
+process = subprocess.run([sys.executable, "-X", "importtime", "-c", import_script], capture_output=True, text=True)
+
+# Lines look like "import time:       123 |        456 |   package.module", nesting is indented.
+imports = []
+for line in process.stderr.splitlines():
+    if not line.startswith("import time:") or "self [us]" in line:
+        continue
+    self_us, cumulative_us, module_name = line[len("import time:"):].split("|")
+    imports.append({
+        "module": module_name.strip(),
+        "depth": (len(module_name) - len(module_name.lstrip()) - 1) // 2,
+        "self_ms": int(self_us) / 1000,
+        "cumulative_ms": int(cumulative_us) / 1000
+    })
+
+result = {
+    "python": sys.version.split()[0],
+    "modules": modules,
+    "import_error": process.stderr.strip().splitlines()[-1] if process.returncode != 0 else None,
+    "total_ms": sum(entry["cumulative_ms"] for entry in imports if entry["depth"] == 0),
+    "imported_modules": len(imports),
+    # Modules imported directly by the interpreter start or the listed modules, with everything they pull in.
+    "top_level": sorted([entry for entry in imports if entry["depth"] == 0], key=lambda entry: entry["cumulative_ms"], reverse=True)[:args.top],
+    # Modules most expensive by themselves, wherever they are imported.
+    "most_expensive": sorted(imports, key=lambda entry: entry["self_ms"], reverse=True)[:args.top]
+}
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
+sys.exit(process.returncode)
@@ -0,0 +1,37 @@
+# Replay of cycles recorded with CYCLE_RECORDING_FILE, for debugging decisions and as benchmark corpus.
+#
+# Usage: python replay_cycles.py <recording.jsonl> [--repetitions <n>] [--print-messages] [--output <result.json>]
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "simulation"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Replay.
+import cycleReplayer as CycleReplayer
+
+parser = argparse.ArgumentParser(description="Replay recorded autoscaling cycles through the full decision path.")
+parser.add_argument("recording", help="Path to the JSON Lines recording written by the autoscaler.")
+parser.add_argument("--repetitions", type=int, default=1, help="Replay the whole recording this often, e.g. for benchmarking.")
+parser.add_argument("--print-messages", action="store_true", help="Print all messages of the autoscaler while replaying.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Replay.
+result = CycleReplayer.CycleReplayer(args.recording, print_messages=args.print_messages).run(max(1, args.repetitions))
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
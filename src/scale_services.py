@@ -7,9 +7,172 @@ sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging")
 sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
 sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
 
+# Waiting between cycles.
+import time
+
 # For scaling services.
 import dockerServiceScaler as DockerServiceScaler
-dockerServiceScaler = DockerServiceScaler.DockerServiceScaler()
+
+# Logger.
+import messagePlatformHandler as MessagePlatformHandler
+
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
+# Liveness and readiness.
+import autoscalerHealth as AutoscalerHealth
+
+# Multiple replicas.
+import leaderElection as LeaderElection
+import serviceSharding as ServiceSharding
+import signal
+import socket
+
+# Conversion.
+import converterUtils
+
+messagePlatformHandler = MessagePlatformHandler.MessagePlatformHandler()
+dockerServiceScaler = DockerServiceScaler.DockerServiceScaler(message_platform_handler=messagePlatformHandler)
+
+# Interval between cycles in long running mode, a single cycle if not set.
+autoscale_interval_seconds = 0
+autoscale_interval = os.getenv("AUTOSCALE_INTERVAL", "").strip().strip("\"")
+if autoscale_interval:
+    try:
+        autoscale_interval_seconds = converterUtils.time_duration_to_seconds(autoscale_interval)
+    except ValueError as e:
+        messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>AUTOSCALE_INTERVAL</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{autoscale_interval}</EMPHASIZE_STRING_END_TAG>: {e} Running a single cycle.")
+
+# Metrics endpoint.
+metrics_port = os.getenv("METRICS_PORT", "").strip().strip("\"")
+if metrics_port:
+    try:
+        AutoscalerMetrics.MetricsServer(int(metrics_port)).start()
+        messagePlatformHandler.handle_verbose_info(f"Serving autoscaler metrics on port <EMPHASIZE_STRING_START_TAG>{metrics_port}</EMPHASIZE_STRING_END_TAG> at /metrics")
+    except (ValueError, OSError) as e:
+        messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>METRICS_PORT</EMPHASIZE_STRING_END_TAG>: Could not serve metrics on <EMPHASIZE_STRING_START_TAG>{metrics_port}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+
+# Health endpoint, only meaningful in long running mode.
+cycleHealth = None
+health_port = os.getenv("HEALTH_PORT", "").strip().strip("\"")
+if health_port and autoscale_interval_seconds > 0:
+    max_cycle_age_seconds = 3 * autoscale_interval_seconds
+    health_max_cycle_age = os.getenv("HEALTH_MAX_CYCLE_AGE", "").strip().strip("\"")
+    if health_max_cycle_age:
+        try:
+            max_cycle_age_seconds = converterUtils.time_duration_to_seconds(health_max_cycle_age)
+        except ValueError as e:
+            messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>HEALTH_MAX_CYCLE_AGE</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{health_max_cycle_age}</EMPHASIZE_STRING_END_TAG>: {e} Defaulting to <EMPHASIZE_STRING_START_TAG>{max_cycle_age_seconds}s</EMPHASIZE_STRING_END_TAG>.")
+    try:
+        cycleHealth = AutoscalerHealth.CycleHealth(max_cycle_age_seconds, messagePlatformHandler.get_pending_message_count)
+        AutoscalerHealth.HealthServer(int(health_port), cycleHealth).start()
+        messagePlatformHandler.handle_verbose_info(f"Serving health on port <EMPHASIZE_STRING_START_TAG>{health_port}</EMPHASIZE_STRING_END_TAG> at /health, /health/live and /health/ready")
+    except (ValueError, OSError) as e:
+        cycleHealth = None
+        messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>HEALTH_PORT</EMPHASIZE_STRING_END_TAG>: Could not serve health on <EMPHASIZE_STRING_START_TAG>{health_port}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+elif health_port:
+    messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>HEALTH_PORT</EMPHASIZE_STRING_END_TAG> is only used in long running mode, set <EMPHASIZE_STRING_START_TAG>AUTOSCALE_INTERVAL</EMPHASIZE_STRING_END_TAG> to enable it.")
+
+# Sharding of services between multiple replicas, only meaningful in long running mode.
+serviceSharder = None
+sharding_service = os.getenv("SHARDING_SERVICE", "").strip().strip("\"")
+if sharding_service and autoscale_interval_seconds > 0:
+    serviceSharder = ServiceSharding.ServiceSharder(dockerServiceScaler.client, sharding_service, socket.gethostname())
+    dockerServiceScaler.set_service_filter(serviceSharder.owns)
+    messagePlatformHandler.handle_verbose_info(f"Sharding services between the replicas of service <EMPHASIZE_STRING_START_TAG>{sharding_service}</EMPHASIZE_STRING_END_TAG> as <EMPHASIZE_STRING_START_TAG>{socket.gethostname()}</EMPHASIZE_STRING_END_TAG>")
+elif sharding_service:
+    messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>SHARDING_SERVICE</EMPHASIZE_STRING_END_TAG> is only used in long running mode, set <EMPHASIZE_STRING_START_TAG>AUTOSCALE_INTERVAL</EMPHASIZE_STRING_END_TAG> to enable it.")
+
+
+def refresh_shard():
+    """
+    Rebalance the services between the currently running replicas.
+    """
+    if serviceSharder is None:
+        return
+    members_changed, sharding_error = serviceSharder.refresh_members()
+    if sharding_error:
+        messagePlatformHandler.handle_warning(sharding_error)
+    if members_changed:
+        messagePlatformHandler.handle_information(f"Sharding services between <EMPHASIZE_STRING_START_TAG>{len(serviceSharder.get_members())}</EMPHASIZE_STRING_END_TAG> replicas: <EMPHASIZE_STRING_START_TAG>{', '.join(member[:12] for member in serviceSharder.get_members())}</EMPHASIZE_STRING_END_TAG>")
+
+
+# Leader election between multiple replicas, only meaningful in long running mode.
+leaderElector = None
+leader_election_service = os.getenv("LEADER_ELECTION_SERVICE", "").strip().strip("\"")
+if leader_election_service and serviceSharder is not None:
+    messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>LEADER_ELECTION_SERVICE</EMPHASIZE_STRING_END_TAG> is ignored, since every replica scales its own shard with <EMPHASIZE_STRING_START_TAG>SHARDING_SERVICE</EMPHASIZE_STRING_END_TAG>.")
+elif leader_election_service and autoscale_interval_seconds > 0:
+    lease_duration_seconds = 3 * autoscale_interval_seconds
+    leader_lease_duration = os.getenv("LEADER_LEASE_DURATION", "").strip().strip("\"")
+    if leader_lease_duration:
+        try:
+            lease_duration_seconds = converterUtils.time_duration_to_seconds(leader_lease_duration)
+        except ValueError as e:
+            messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>LEADER_LEASE_DURATION</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{leader_lease_duration}</EMPHASIZE_STRING_END_TAG>: {e} Defaulting to <EMPHASIZE_STRING_START_TAG>{lease_duration_seconds}s</EMPHASIZE_STRING_END_TAG>.")
+    # The lease is renewed at the start of each cycle and before applying its scalings, a shorter lease expires between cycles.
+    min_lease_duration_seconds = 2 * autoscale_interval_seconds
+    if lease_duration_seconds < min_lease_duration_seconds:
+        messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>LEADER_LEASE_DURATION</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{lease_duration_seconds}s</EMPHASIZE_STRING_END_TAG> must be at least twice <EMPHASIZE_STRING_START_TAG>AUTOSCALE_INTERVAL</EMPHASIZE_STRING_END_TAG>, otherwise another replica takes over while the leader still scales. Using <EMPHASIZE_STRING_START_TAG>{min_lease_duration_seconds}s</EMPHASIZE_STRING_END_TAG>.")
+        lease_duration_seconds = min_lease_duration_seconds
+    leaderElector = LeaderElection.LeaderElector(dockerServiceScaler.client, leader_election_service, socket.gethostname(), lease_duration_seconds)
+    messagePlatformHandler.handle_verbose_info(f"Leader election on service <EMPHASIZE_STRING_START_TAG>{leader_election_service}</EMPHASIZE_STRING_END_TAG> as <EMPHASIZE_STRING_START_TAG>{leaderElector.get_identity()}</EMPHASIZE_STRING_END_TAG>, lease duration <EMPHASIZE_STRING_START_TAG>{lease_duration_seconds}s</EMPHASIZE_STRING_END_TAG>")
+
+    # Hand over the lease right away when swarm stops this replica.
+    def release_leadership_and_exit(signal_number, frame):
+        release_error = leaderElector.release()
+        if release_error:
+            messagePlatformHandler.handle_warning(release_error)
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, release_leadership_and_exit)
+elif leader_election_service:
+    messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>LEADER_ELECTION_SERVICE</EMPHASIZE_STRING_END_TAG> is only used in long running mode, set <EMPHASIZE_STRING_START_TAG>AUTOSCALE_INTERVAL</EMPHASIZE_STRING_END_TAG> to enable it.")
+
+
+def is_leader():
+    """
+    Whether this replica may scale in this cycle, logs changes of leadership.
+    """
+    if leaderElector is None:
+        return True
+    was_leader = leaderElector.is_leader()
+    now_leader, election_error = leaderElector.try_acquire_or_renew()
+    if election_error:
+        messagePlatformHandler.handle_error(election_error)
+    if now_leader and not was_leader:
+        messagePlatformHandler.handle_information(f"Replica <EMPHASIZE_STRING_START_TAG>{leaderElector.get_identity()}</EMPHASIZE_STRING_END_TAG> became leader and scales services.")
+    elif was_leader and not now_leader:
+        messagePlatformHandler.handle_warning(f"Replica <EMPHASIZE_STRING_START_TAG>{leaderElector.get_identity()}</EMPHASIZE_STRING_END_TAG> lost leadership and stops scaling.")
+    return now_leader
+
+
+# A cycle may take long, so renew the lease again right before applying its scalings.
+if leaderElector is not None:
+    dockerServiceScaler.set_execution_check(is_leader)
+
 
 # Autoscale.
-dockerServiceScaler.auto_scale_services()
+if autoscale_interval_seconds > 0:
+    while True:
+        cycle_start = time.monotonic()
+        if cycleHealth is not None:
+            cycleHealth.cycle_started()
+        try:
+            refresh_shard()
+            if is_leader():
+                dockerServiceScaler.auto_scale_services()
+            else:
+                # Standby: stay warm to take over within one interval.
+                dockerServiceScaler.warm_up()
+                messagePlatformHandler.send_all_accumulated_messages()
+            if cycleHealth is not None:
+                cycleHealth.cycle_succeeded()
+        except Exception as e:
+            # Keep running, the next cycle may succeed.
+            if cycleHealth is not None:
+                cycleHealth.cycle_failed(e)
+            messagePlatformHandler.handle_error(f"Autoscaling cycle failed: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+            messagePlatformHandler.send_all_accumulated_messages()
+        time.sleep(max(0.0, autoscale_interval_seconds - (time.monotonic() - cycle_start)))
+else:
+    dockerServiceScaler.auto_scale_services()
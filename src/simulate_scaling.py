@@ -0,0 +1,43 @@
+# What-if simulation of scaling policies against recorded or synthetic metrics.
+#
+# Usage: python simulate_scaling.py <scenario.json> [--output <result.json>]
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "simulation"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Simulation.
+import scalingSimulator as ScalingSimulator
+
+parser = argparse.ArgumentParser(description="Simulate the autoscaler against recorded or synthetic metric time series.")
+parser.add_argument("scenario", help="Path to the scenario json file.")
+parser.add_argument("--output", help="Write the full result json to this file instead of stdout.")
+parser.add_argument("--summary-only", action="store_true", help="Omit replica trajectories from the result.")
+args = parser.parse_args()
+
+# Load scenario.
+with open(args.scenario, "r") as scenario_file:
+    scenario = json.load(scenario_file)
+
+# Simulate.
+result = ScalingSimulator.ScalingSimulator(scenario).run()
+if args.summary_only:
+    for service_result in result["services"].values():
+        del service_result["replica_trajectory"]
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+else:
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,184 @@
+# Replays recorded autoscaling cycles through the full decision path.
+
+# Read recordings.
+import json
+
+# Measure wall time.
+import time
+
+# Own classes.
+import dockerServiceScaler as DockerServiceScaler
+import prometheusConnector as PrometheusConnector
+import fakeDockerClient as FakeDockerClient
+import silentMessagePlatformHandler as SilentMessagePlatformHandler
+
+
+class RecordedPrometheusClient:
+    """
+    Stand-in for PrometheusHttpClient answering queries with the recorded raw results of one cycle.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._missed_queries = []
+
+
+    def set_cycle(self, recorded_cycle):
+        """
+        Serve the prometheus results of the given recorded cycle.
+        """
+        self._results = {recorded_query["query"]: recorded_query["result"] for recorded_query in recorded_cycle.get("prometheus", [])}
+
+
+    def custom_query(self, query):
+        """
+        Get the recorded result of a query, or an empty result if it was not recorded.
+        """
+        if query in self._results:
+            return self._results[query]
+        self._missed_queries.append(query)
+        return []
+
+
+    def get_missed_queries(self):
+        """
+        Get all queries without a recorded result, e.g. because the labels changed between recording and replay.
+        """
+        return list(self._missed_queries)
+
+
+class CycleReplayer:
+    """
+    Feeds recorded cycles (see CycleRecorder) back through DockerServiceScaler.auto_scale_services.
+
+    Before each cycle the fake docker client is reset to the recorded services, and to the recorded nodes
+    and tasks if the cycle read them for CLUSTER_CAPACITY_CHECK, so every cycle is decided on exactly the recorded inputs. The replayed scalings are compared to the recorded ones.
+    """
+
+    def __init__(self, recording_file_path, print_messages=False):
+        """
+        Args:
+            recording_file_path (str): JSON Lines file written by CycleRecorder.
+            print_messages (bool): Print all messages of the scaler while replaying.
+        """
+        self._recorded_cycles = []
+        with open(recording_file_path, "r") as recording_file:
+            for line in recording_file:
+                if line.strip():
+                    self._recorded_cycles.append(json.loads(line))
+
+        # Fakes.
+        self._client = FakeDockerClient.FakeDockerClient()
+        self._cycle_timestamp = 0.0
+        self._prometheusClient = RecordedPrometheusClient()
+        self._messagePlatformHandler = SilentMessagePlatformHandler.SilentMessagePlatformHandler(print_messages)
+
+        # The scaler under test, with the real connector on top of the recorded query results.
+        self._scaler = DockerServiceScaler.DockerServiceScaler(
+            client=self._client,
+            prometheus_connector=PrometheusConnector.PrometheusConnector(prometheus_client=self._prometheusClient),
+            message_platform_handler=self._messagePlatformHandler,
+            clock=lambda: self._cycle_timestamp
+        )
+
+
+    def run(self, repetitions=1):
+        """
+        Replay all recorded cycles.
+
+        Args:
+            repetitions (int): How often to replay the whole recording, e.g. for benchmarking.
+
+        Returns:
+            dict: Result with matching and diverging cycles and replay speed.
+        """
+        divergences = []
+        cycles = 0
+        wall_start = time.perf_counter()
+
+        for repetition in range(repetitions):
+            for recorded_cycle in self._recorded_cycles:
+                replayed_scalings = self._replay_cycle(recorded_cycle)
+                cycles += 1
+
+                # Compare only once, repetitions decide the same.
+                if repetition == 0 and replayed_scalings != recorded_cycle.get("scaled", {}):
+                    divergences.append({
+                        "cycle": recorded_cycle.get("cycle"),
+                        "timestamp": recorded_cycle.get("timestamp"),
+                        "recorded": recorded_cycle.get("scaled", {}),
+                        "replayed": replayed_scalings
+                    })
+
+        wall_seconds = time.perf_counter() - wall_start
+        return {
+            "recorded_cycles": len(self._recorded_cycles),
+            "replayed_cycles": cycles,
+            "matching_cycles": len(self._recorded_cycles) - len(divergences),
+            "diverging_cycles": divergences,
+            "missed_queries": sorted(set(self._prometheusClient.get_missed_queries())),
+            "wall_seconds": wall_seconds,
+            "cycles_per_second": cycles / wall_seconds if wall_seconds > 0 else 0.0,
+            "message_counts": self._messagePlatformHandler.get_message_counts(),
+            "errors": self._messagePlatformHandler.get_errors()
+        }
+
+
+    def _replay_cycle(self, recorded_cycle):
+        """
+        Replay one recorded cycle.
+
+        Returns:
+            dict: Replicas per scaled service name.
+        """
+        # Reset docker and prometheus to the recorded state.
+        self._client.services.clear()
+        for recorded_service in recorded_cycle.get("services", []):
+            self._client.services.add(
+                recorded_service["name"],
+                recorded_service.get("labels", {}),
+                recorded_service.get("replicas", 0),
+                recorded_service.get("resources", None),
+                service_id=recorded_service.get("id", None),
+                version=recorded_service.get("version", 1),
+                updated_at=recorded_service.get("updated_at", None),
+                service_status=recorded_service.get("service_status", None)
+            )
+        if "cluster" in recorded_cycle:
+            self._set_recorded_cluster(recorded_cycle["cluster"])
+        self._prometheusClient.set_cycle(recorded_cycle)
+        self._cycle_timestamp = recorded_cycle.get("timestamp", 0.0)
+
+        # Full decision path.
+        self._scaler.auto_scale_services()
+
+        # Collect scalings.
+        replayed_scalings = {}
+        for service in self._client.services.list():
+            # Every scaling creates a new spec version.
+            if service.version != self._get_recorded_version(recorded_cycle, service.name):
+                replayed_scalings[service.name] = service.get_replicas()
+        return replayed_scalings
+
+
+    def _set_recorded_cluster(self, recorded_cluster):
+        """
+        Serve the recorded nodes and tasks, until a later cycle recorded them again.
+        """
+        self._client.nodes.clear()
+        for recorded_node in recorded_cluster.get("nodes", []):
+            self._client.nodes.add(recorded_node["id"], recorded_node.get("nano_cpus", 0), recorded_node.get("memory_bytes", 0), recorded_node.get("availability", ""), recorded_node.get("state", ""))
+        self._client.api.set_tasks([
+            {"ServiceID": recorded_task.get("service_id", ""), "NodeID": recorded_task.get("node_id", ""), "DesiredState": "running", "Spec": {"Resources": {"Reservations": recorded_task.get("reservations", {})}}}
+            for recorded_task in recorded_cluster.get("tasks", [])
+        ])
+
+
+    def _get_recorded_version(self, recorded_cycle, service_name):
+        """
+        Spec version of a service at the time of recording.
+        """
+        for recorded_service in recorded_cycle.get("services", []):
+            if recorded_service["name"] == service_name:
+                return recorded_service.get("version", 1)
+        return None
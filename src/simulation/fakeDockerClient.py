@@ -0,0 +1,251 @@
+# In memory stand-in for the parts of docker.DockerClient the autoscaler uses.
+
+# Same exceptions as the real client.
+import docker
+
+# Update timestamps.
+import converterUtils
+
+
+class FakeDockerClient:
+    """
+    A fake docker client holding services in memory.
+
+    Scaling only changes the in memory spec, nothing is deployed, so all tasks run right away.
+    Tasks are spread over the nodes in turn, regardless of their capacity.
+    """
+
+    def __init__(self, clock=None):
+        """
+        Args:
+            clock (callable|None): Returns the current (e.g. simulated) time in seconds, sets UpdatedAt on scaling if given.
+        """
+        self.services = FakeServiceCollection(clock)
+        self.nodes = FakeNodeCollection()
+        self.api = FakeApiClient(self.services, self.nodes)
+
+
+class FakeServiceCollection:
+    """
+    Fake of docker.models.services.ServiceCollection.
+    """
+
+    def __init__(self, clock=None):
+        self._services = {}
+        self._clock = clock
+
+
+    def add(self, name, labels, replicas, resources=None, service_id=None, version=1, updated_at=None, service_status=None):
+        """
+        Add a replicated service.
+
+        Args:
+            name (str): Name of the service.
+            labels (dict): Service labels (e.g. autoscale labels).
+            replicas (int): Initial amount of replicas.
+            resources (dict|None): TaskTemplate resources, like {"Limits": {"MemoryBytes": 536870912}}.
+            service_id (str|None): Id of the service, generated if not set.
+            version (int): Initial spec version.
+            updated_at (str|None): Docker timestamp of the last update, unknown if not set.
+            service_status (dict|None): RunningTasks and DesiredTasks, all tasks running if not set.
+
+        Returns:
+            FakeService.
+        """
+        if not service_id:
+            service_id = f"fake{len(self._services):021d}"
+        service = FakeService(service_id, name, labels, replicas, resources, version, updated_at, service_status, self._clock)
+        self._services[name] = service
+        return service
+
+
+    def clear(self):
+        """
+        Remove all services.
+        """
+        self._services = {}
+
+
+    def list(self, status=False, **kwargs):
+        """
+        List all services, with their running and desired tasks if status is True.
+        """
+        services = list(self._services.values())
+        for service in services:
+            if status:
+                service.attrs["ServiceStatus"] = service.get_service_status()
+            else:
+                service.attrs.pop("ServiceStatus", None)
+        return services
+
+
+    def get(self, service_id):
+        """
+        Get a service by name or id.
+
+        Raises:
+            docker.errors.NotFound: If there is no such service.
+        """
+        if service_id in self._services:
+            return self._services[service_id]
+        for service in self._services.values():
+            if service.id == service_id:
+                return service
+        raise docker.errors.NotFound(f"service {service_id} not found")
+
+
+class FakeNodeCollection:
+    """
+    Fake of docker.models.nodes.NodeCollection.
+    """
+
+    def __init__(self):
+        self._nodes = []
+
+
+    def add(self, name, nano_cpus, memory_bytes, availability="active", state="ready"):
+        """
+        Add a node.
+
+        Args:
+            name (str): Hostname of the node, also used as id.
+            nano_cpus (int): Cpus of the node in billionths of a cpu.
+            memory_bytes (int): Memory of the node.
+            availability (str): active, pause or drain.
+            state (str): ready or down.
+
+        Returns:
+            FakeNode.
+        """
+        node = FakeNode(name, nano_cpus, memory_bytes, availability, state)
+        self._nodes.append(node)
+        return node
+
+
+    def clear(self):
+        """
+        Remove all nodes.
+        """
+        self._nodes = []
+
+
+    def list(self, **kwargs):
+        """
+        List all nodes.
+        """
+        return list(self._nodes)
+
+
+class FakeNode:
+    """
+    Fake of docker.models.nodes.Node.
+    """
+
+    def __init__(self, name, nano_cpus, memory_bytes, availability="active", state="ready"):
+        self.id = name
+        self.attrs = {
+            "ID": name,
+            "Spec": {"Availability": availability},
+            "Status": {"State": state},
+            "Description": {"Hostname": name, "Resources": {"NanoCPUs": int(nano_cpus), "MemoryBytes": int(memory_bytes)}}
+        }
+
+
+class FakeApiClient:
+    """
+    Fake of the low level docker.APIClient, only listing tasks.
+    """
+
+    def __init__(self, services, nodes):
+        self._services = services
+        self._nodes = nodes
+        self._tasks = None
+
+
+    def set_tasks(self, tasks):
+        """
+        Serve the given tasks, e.g. recorded ones, instead of deriving them from the services, None derives them again.
+        """
+        self._tasks = tasks
+
+
+    def tasks(self, filters=None):
+        """
+        List one running task per replica of every service, spread over the active nodes in turn.
+        """
+        if self._tasks is not None:
+            return list(self._tasks)
+        nodes = [node for node in self._nodes.list() if node.attrs["Spec"]["Availability"] == "active"]
+        tasks = []
+        for service in self._services.list():
+            for slot in range(service.get_replicas()):
+                tasks.append({
+                    "ServiceID": service.id,
+                    "Slot": slot + 1,
+                    "NodeID": nodes[len(tasks) % len(nodes)].id if nodes else "",
+                    "DesiredState": "running",
+                    "Spec": {"Resources": service.attrs["Spec"]["TaskTemplate"]["Resources"]}
+                })
+        return tasks
+
+
+class FakeService:
+    """
+    Fake of docker.models.services.Service.
+    """
+
+    def __init__(self, service_id, name, labels, replicas, resources=None, version=1, updated_at=None, service_status=None, clock=None):
+        self.id = service_id
+        self._service_status = service_status
+        self._clock = clock
+        self.attrs = {
+            "ID": service_id,
+            "Version": {"Index": int(version)},
+            "Spec": {
+                "Name": name,
+                "Labels": dict(labels),
+                "Mode": {"Replicated": {"Replicas": int(replicas)}},
+                "TaskTemplate": {"Resources": resources if resources else {}}
+            }
+        }
+        if updated_at is not None:
+            self.attrs["UpdatedAt"] = updated_at
+
+    @property
+    def name(self):
+        return self.attrs["Spec"]["Name"]
+
+    @property
+    def version(self):
+        return self.attrs["Version"]["Index"]
+
+
+    def get_replicas(self):
+        """
+        Get the amount of replicas of the current spec.
+        """
+        return self.attrs["Spec"]["Mode"]["Replicated"]["Replicas"]
+
+
+    def get_service_status(self):
+        """
+        Get the running and desired tasks, all tasks run right away unless set otherwise.
+        """
+        if self._service_status is not None:
+            return dict(self._service_status)
+        return {"RunningTasks": self.get_replicas(), "DesiredTasks": self.get_replicas()}
+
+
+    def scale(self, replicas):
+        """
+        Change the amount of replicas, which creates a new spec version.
+
+        Returns:
+            bool: True.
+        """
+        self.attrs["Spec"]["Mode"]["Replicated"]["Replicas"] = int(replicas)
+        self.attrs["Version"]["Index"] += 1
+        self._service_status = None
+        if self._clock is not None:
+            self.attrs["UpdatedAt"] = converterUtils.seconds_to_docker_timestamp(self._clock())
+        return True
@@ -0,0 +1,240 @@
+# Runs the full autoscaling decision path against recorded or synthetic metrics.
+
+# Synthetic series.
+import math
+import random
+
+# Measure wall time.
+import time
+
+# Own classes.
+import dockerServiceScaler as DockerServiceScaler
+import dockerServiceAutoscalerLabelHandler as DockerServiceAutoscalerLabelHandler
+import fakeDockerClient as FakeDockerClient
+import simulatedPrometheusConnector as SimulatedPrometheusConnector
+import silentMessagePlatformHandler as SilentMessagePlatformHandler
+
+# Conversion.
+import converterUtils
+
+
+class ScalingSimulator:
+    """
+    What-if simulation of scaling policies.
+
+    Replays one autoscaling cycle per step of the scenario through DockerServiceScaler.auto_scale_services,
+    with a fake docker client and metrics derived from per service demand series.
+
+    Scenario format (dict, usually loaded from json):
+        {
+            "step": "1m",                 # Simulated time between two cycles.
+            "duration": "7d",             # Simulated time span, defaults to the longest recorded series.
+            "seed": 42,                   # Seed for the noise of synthetic series.
+            "nodes": [                    # Optional nodes for CLUSTER_CAPACITY_CHECK.
+                {"name": "node1", "cpus": 4, "memory": "8GiB"}
+            ],
+            "services": [
+                {
+                    "name": "web",
+                    "labels": {"autoscale": "true", "autoscale.minimum_replicas": "1", ...},
+                    "replicas": 1,
+                    "resources": {"Limits": {"MemoryBytes": 536870912}},
+                    "cpu": [120.5, 130.0, ...],   # Recorded total cpu demand in percent of one core per step, or:
+                    "cpu": {"base": 50, "amplitude": 200, "period": "1d", "peak_at": "14h", "noise": 10},
+                    "memory": [...] or {...}      # Same for total memory demand in bytes ("512MiB" works too).
+                }
+            ]
+        }
+    """
+
+    def __init__(self, scenario):
+        """
+        Args:
+            scenario (dict): The scenario to simulate, see class docstring.
+        """
+        self._step_seconds = converterUtils.time_duration_to_seconds(scenario.get("step", "1m"))
+        self._random = random.Random(scenario.get("seed", 0))
+
+        # Fakes.
+        self._simulated_seconds = 0
+        self._client = FakeDockerClient.FakeDockerClient(clock=self._get_simulated_seconds)
+        self._prometheusConnector = SimulatedPrometheusConnector.SimulatedPrometheusConnector(self._client, self._step_seconds)
+        self._messagePlatformHandler = SilentMessagePlatformHandler.SilentMessagePlatformHandler()
+
+        # Amount of steps.
+        if "duration" in scenario:
+            self._steps = max(1, converterUtils.time_duration_to_seconds(scenario["duration"]) // self._step_seconds)
+        else:
+            recorded_lengths = [len(service[series_name]) for service in scenario["services"] for series_name in ("cpu", "memory") if isinstance(service.get(series_name), list)]
+            self._steps = max(recorded_lengths) if recorded_lengths else 1
+
+        # Services and their series.
+        self._service_names = []
+        for node in scenario.get("nodes", []):
+            self._client.nodes.add(node["name"], int(float(node["cpus"]) * 1e9), converterUtils.human_readable_storage_to_bytes(str(node["memory"])))
+        for service in scenario["services"]:
+            self._client.services.add(service["name"], service.get("labels", {}), service.get("replicas", 1), service.get("resources", None))
+            self._prometheusConnector.set_series(
+                service["name"],
+                cpu_series=self._get_series(service.get("cpu", None), float),
+                memory_series=self._get_series(service.get("memory", None), self._to_bytes)
+            )
+            self._service_names.append(service["name"])
+
+        # The scaler under test.
+        self._scaler = DockerServiceScaler.DockerServiceScaler(
+            client=self._client,
+            prometheus_connector=self._prometheusConnector,
+            message_platform_handler=self._messagePlatformHandler,
+            clock=self._get_simulated_seconds
+        )
+
+
+    def run(self):
+        """
+        Run the simulation.
+
+        Returns:
+            dict: Result with replica trajectory, scale events and time above threshold per service.
+        """
+        wall_start = time.perf_counter()
+
+        # Thresholds to measure time above threshold against.
+        autoscale_services = self._get_autoscale_services()
+
+        # Prepare results.
+        service_results = {}
+        for service_name in self._service_names:
+            service_results[service_name] = {
+                "replica_trajectory": [],
+                "scale_up_events": 0,
+                "scale_down_events": 0,
+                "cpu_time_above_threshold_seconds": 0,
+                "memory_time_above_threshold_seconds": 0,
+                "time_above_threshold_seconds": 0
+            }
+
+        # One cycle per step.
+        for step_index in range(self._steps):
+            self._prometheusConnector.set_step_index(step_index)
+            self._simulated_seconds = step_index * self._step_seconds
+
+            # Time above threshold is measured before the cycle reacts.
+            for service_name in self._service_names:
+                if service_name in autoscale_services:
+                    self._add_time_above_threshold(service_results[service_name], service_name, autoscale_services[service_name])
+
+            # Full decision path.
+            replicas_before = {service_name: self._client.services.get(service_name).get_replicas() for service_name in self._service_names}
+            self._scaler.auto_scale_services()
+
+            # Track replicas.
+            for service_name in self._service_names:
+                replicas = self._client.services.get(service_name).get_replicas()
+                service_results[service_name]["replica_trajectory"].append(replicas)
+                if replicas > replicas_before[service_name]:
+                    service_results[service_name]["scale_up_events"] += 1
+                elif replicas < replicas_before[service_name]:
+                    service_results[service_name]["scale_down_events"] += 1
+
+        # Summaries.
+        for service_result in service_results.values():
+            trajectory = service_result["replica_trajectory"]
+            service_result["scale_events"] = service_result["scale_up_events"] + service_result["scale_down_events"]
+            service_result["minimum_replicas_seen"] = min(trajectory)
+            service_result["maximum_replicas_seen"] = max(trajectory)
+            service_result["average_replicas"] = sum(trajectory) / len(trajectory)
+
+        return {
+            "step_seconds": self._step_seconds,
+            "steps": self._steps,
+            "simulated_seconds": self._steps * self._step_seconds,
+            "wall_seconds": time.perf_counter() - wall_start,
+            "message_counts": self._messagePlatformHandler.get_message_counts(),
+            "errors": self._messagePlatformHandler.get_errors(),
+            "services": service_results
+        }
+
+
+    def _get_simulated_seconds(self):
+        """
+        Simulated time of the current step, the clock of the scaler and the fake docker client.
+        """
+        return self._simulated_seconds
+
+
+    def _get_autoscale_services(self):
+        """
+        Get the valid AutoScaleService of each simulated service by name.
+        """
+        autoscale_services = {}
+        for service in self._client.services.list():
+            labelHandler = DockerServiceAutoscalerLabelHandler.DockerServiceAutoscalerLabelHandler(service)
+            if labelHandler.is_autoscale_service():
+                is_valid, autoscale_service, warnings = labelHandler.get_autoscale_service()
+                if is_valid:
+                    autoscale_services[service.name] = autoscale_service
+        return autoscale_services
+
+
+    def _add_time_above_threshold(self, service_result, service_name, autoscale_service):
+        """
+        Add one step to the time above threshold, if the current per task demand exceeds an upscale threshold.
+        """
+        is_above_threshold = False
+
+        if autoscale_service.is_scaling_based_on_cpu_enabled():
+            if self._prometheusConnector.get_task_demand(service_name, "cpu") > autoscale_service.get_cpu_upscale_threshold():
+                service_result["cpu_time_above_threshold_seconds"] += self._step_seconds
+                is_above_threshold = True
+
+        if autoscale_service.is_scaling_based_on_memory_enabled():
+            memory_demand = self._prometheusConnector.get_task_demand(service_name, "memory")
+            if autoscale_service.is_memory_threshold_relative():
+                memory_demand = memory_demand / autoscale_service.get_memory_reference_bytes() * 100
+            if memory_demand > autoscale_service.get_memory_upscale_threshold():
+                service_result["memory_time_above_threshold_seconds"] += self._step_seconds
+                is_above_threshold = True
+
+        if is_above_threshold:
+            service_result["time_above_threshold_seconds"] += self._step_seconds
+
+
+    def _get_series(self, series_definition, convert_value):
+        """
+        Get a series of values per step, either recorded (list) or synthetic (dict).
+        """
+        if series_definition is None:
+            return []
+        if isinstance(series_definition, list):
+            return [convert_value(value) for value in series_definition]
+        return self._get_synthetic_series(series_definition, convert_value)
+
+
+    def _to_bytes(self, value):
+        """
+        Convert a number or a human readable size like "512MiB" to bytes.
+        """
+        if isinstance(value, str):
+            return converterUtils.human_readable_storage_to_bytes(value)
+        return float(value)
+
+
+    def _get_synthetic_series(self, series_definition, convert_value):
+        """
+        Daily (or any period) wave between base and base + amplitude with optional noise.
+        """
+        base = convert_value(series_definition.get("base", 0))
+        amplitude = convert_value(series_definition.get("amplitude", 0))
+        noise = convert_value(series_definition.get("noise", 0))
+        period_seconds = converterUtils.time_duration_to_seconds(series_definition.get("period", "1d"))
+        peak_at_seconds = converterUtils.time_duration_to_seconds(series_definition.get("peak_at", "0s"))
+
+        series = []
+        for step_index in range(self._steps):
+            phase = 2 * math.pi * (step_index * self._step_seconds - peak_at_seconds) / period_seconds
+            value = base + amplitude * (1 + math.cos(phase)) / 2
+            if noise:
+                value += self._random.gauss(0, noise)
+            series.append(max(0.0, value))
+        return series
@@ -0,0 +1,77 @@
+# Stand-in for MessagePlatformHandler that neither logs nor sends anything.
+
+# Definitions.
+from valid_values import MessageLevel
+
+
+class SilentMessagePlatformHandler:
+    """
+    Counts messages instead of logging and sending them.
+
+    Keeps simulations fast and free of side effects like log files, emails or telegram messages.
+    """
+
+    def __init__(self, print_messages=False):
+        """
+        Args:
+            print_messages (bool): Print every message to stdout, e.g. for debugging a replay.
+        """
+        self._print_messages = print_messages
+        self._message_counts = {
+            "important": 0,
+            "error": 0,
+            "warning": 0,
+            "information": 0,
+            "verbose": 0
+        }
+        self._errors = []
+
+
+    def add_additional_recipients(self, autoscale_service):
+        pass
+
+    def handle_important_info(self, important_info, autoscale_service, scaling_metrics=[]):
+        self._message_counts["important"] += 1
+        self._print(MessageLevel.IMPORTANT, important_info)
+
+    def handle_error(self, error_info, autoscale_service=None):
+        self._message_counts["error"] += 1
+        self._print(MessageLevel.ERROR, error_info)
+        self._errors.append(error_info)
+
+    def handle_warning(self, warning_info, autoscale_service=None, useDateStringUtils=True):
+        self._message_counts["warning"] += 1
+        self._print(MessageLevel.WARNING, warning_info)
+
+    def handle_information(self, information, autoscale_service=None):
+        self._message_counts["information"] += 1
+        self._print(MessageLevel.INFO, information)
+
+    def handle_verbose_info(self, verbose_info, autoscale_service=None):
+        self._message_counts["verbose"] += 1
+        self._print(MessageLevel.VERBOSE, verbose_info)
+
+    def send_all_accumulated_messages(self):
+        pass
+
+
+    def _print(self, message_level, message):
+        """
+        Print a message, if enabled, with the emphasize tags replaced like the logger does.
+        """
+        if self._print_messages:
+            message = message.replace("<EMPHASIZE_STRING_START_TAG>", "\"").replace("</EMPHASIZE_STRING_END_TAG>", "\"")
+            print(f"[{message_level}] {message}")
+
+
+    def get_message_counts(self):
+        """
+        Get the amount of handled messages per level.
+        """
+        return dict(self._message_counts)
+
+    def get_errors(self):
+        """
+        Get all handled error messages.
+        """
+        return list(self._errors)
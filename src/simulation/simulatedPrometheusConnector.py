@@ -0,0 +1,151 @@
+# Stand-in for PrometheusConnector serving metrics from time series instead of prometheus.
+
+# Conversion.
+import converterUtils
+
+
+class SimulatedPrometheusConnector:
+    """
+    Serves per task metrics from per service demand time series.
+
+    Series hold the total demand of a service per step: cpu in percent of one core
+    summed over all tasks, memory in bytes summed over all tasks. The demand is split
+    evenly across the current replicas, so scaling lowers the per task values just like
+    it would in production.
+    """
+
+    def __init__(self, client, step_seconds):
+        """
+        Args:
+            client (FakeDockerClient): Source of the current replicas of each service.
+            step_seconds (int): Simulated seconds between two series values.
+        """
+        self._client = client
+        self._step_seconds = step_seconds
+        self._step_index = 0
+        self._cpu_series = {}
+        self._memory_series = {}
+
+
+    def set_series(self, service_name, cpu_series=None, memory_series=None):
+        """
+        Set the demand time series of a service.
+        """
+        self._cpu_series[service_name] = cpu_series if cpu_series else []
+        self._memory_series[service_name] = memory_series if memory_series else []
+
+
+    def set_step_index(self, step_index):
+        """
+        Move the simulated clock to the given step.
+        """
+        self._step_index = step_index
+
+
+    def set_cycle_recorder(self, cycle_recorder):
+        """
+        Nothing to record, no prometheus queries are made.
+        """
+
+
+    def prefetch_task_metrics(self, cpu_time_durations):
+        """
+        Nothing to prefetch, the series are in memory.
+        """
+
+
+    def clear_prefetched_task_metrics(self):
+        """
+        Nothing to clear, the series are in memory.
+        """
+
+
+    def get_cpu_task_metrics(self, service_name, time_duration):
+        """
+        Get per task cpu usage averaged over time_duration, like a prometheus rate().
+        """
+        window_steps = max(1, converterUtils.time_duration_to_seconds(time_duration) // self._step_seconds)
+        demand = self._get_window_average(self._cpu_series.get(service_name, []), window_steps)
+        return self._split_demand(service_name, demand)
+
+
+    def get_memory_task_metrics(self, service_name, reference_bytes=None):
+        """
+        Get current per task memory usage, as percentage of reference_bytes if set.
+        """
+        demand = self._get_window_average(self._memory_series.get(service_name, []), 1)
+        task_values = self._split_demand(service_name, demand)
+        if reference_bytes:
+            return [(task_name, node_id, value / reference_bytes * 100) for task_name, node_id, value in task_values]
+        return task_values
+
+
+    def get_demand(self, query, time_duration=None):
+        """
+        Get the highest total cpu demand within time_duration, like a wake query.
+
+        In simulations the wake query is just the name of the service whose cpu series is the demand.
+        """
+        window_steps = max(1, converterUtils.time_duration_to_seconds(time_duration) // self._step_seconds) if time_duration else 1
+        series = self._cpu_series.get(query.strip(), [])
+        if not series:
+            return 0.0
+        end_index = min(self._step_index, len(series) - 1) + 1
+        return max(series[max(0, end_index - window_steps):end_index])
+
+
+    def get_highest_task_cpu(self, service_name, time_duration, idle_time_duration):
+        """
+        Get the highest per task cpu demand within idle_time_duration, split across the current replicas.
+        """
+        replicas = self._get_replicas(service_name)
+        if replicas < 1:
+            return 0.0
+        return self.get_demand(service_name, idle_time_duration) / replicas
+
+
+    def get_task_demand(self, service_name, series_name):
+        """
+        Get the current per task demand without any time window.
+
+        Args:
+            service_name (str): Name of the service.
+            series_name (str): "cpu" or "memory".
+
+        Returns:
+            float: Demand per task at the current step.
+        """
+        series = self._cpu_series if series_name == "cpu" else self._memory_series
+        replicas = self._get_replicas(service_name)
+        if replicas < 1:
+            return 0.0
+        return self._get_window_average(series.get(service_name, []), 1) / replicas
+
+
+    def _get_window_average(self, series, window_steps):
+        """
+        Average of the series over the last window_steps up to the current step.
+        """
+        if not series:
+            return 0.0
+        end_index = min(self._step_index, len(series) - 1) + 1
+        start_index = max(0, end_index - window_steps)
+        return sum(series[start_index:end_index]) / (end_index - start_index)
+
+
+    def _split_demand(self, service_name, demand):
+        """
+        Split the demand of a service evenly across its current replicas.
+        """
+        replicas = self._get_replicas(service_name)
+        if replicas < 1:
+            return []
+        task_value = demand / replicas
+        return [(f"{service_name}.{task_number}", "simulation", task_value) for task_number in range(1, replicas + 1)]
+
+
+    def _get_replicas(self, service_name):
+        """
+        Current replicas of the service in the fake docker client.
+        """
+        return self._client.services.get(service_name).get_replicas()
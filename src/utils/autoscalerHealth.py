@@ -0,0 +1,149 @@
+# Liveness and readiness of the long running autoscaler, served over HTTP for container healthchecks.
+
+# Thread safety, the health server reads while the cycle writes.
+import threading
+
+# Cycle ages.
+import time
+
+# Health server.
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CycleHealth:
+    """
+    Tracks the cycles of the autoscaler.
+
+    Live: a cycle finished (or the process started) within max_cycle_age_seconds, so the autoscaler is not stuck,
+    e.g. in smtplib or a prometheus call.
+    Ready: the last successful cycle is younger than max_cycle_age_seconds.
+    """
+
+    def __init__(self, max_cycle_age_seconds, pending_notifications=None):
+        """
+        Args:
+            max_cycle_age_seconds (float): Maximum age of the last finished and the last successful cycle.
+            pending_notifications (callable|None): Returns the amount of notifications not sent yet.
+        """
+        self._max_cycle_age_seconds = max_cycle_age_seconds
+        self._pending_notifications = pending_notifications
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._current_cycle_started_at = None
+        self._last_finished_cycle_at = None
+        self._last_successful_cycle_at = None
+        self._last_cycle_error = None
+        self._cycles_total = 0
+        self._failed_cycles_total = 0
+
+
+    def cycle_started(self):
+        with self._lock:
+            self._current_cycle_started_at = time.monotonic()
+
+
+    def cycle_succeeded(self):
+        with self._lock:
+            now = time.monotonic()
+            self._current_cycle_started_at = None
+            self._last_finished_cycle_at = now
+            self._last_successful_cycle_at = now
+            self._last_cycle_error = None
+            self._cycles_total += 1
+
+
+    def cycle_failed(self, error):
+        with self._lock:
+            self._current_cycle_started_at = None
+            self._last_finished_cycle_at = time.monotonic()
+            self._last_cycle_error = str(error)
+            self._cycles_total += 1
+            self._failed_cycles_total += 1
+
+
+    def get_status(self):
+        """
+        Get the current health.
+
+        Returns:
+            dict: live, ready, ages in seconds, last error and pending notifications.
+        """
+        with self._lock:
+            now = time.monotonic()
+            last_progress_at = self._last_finished_cycle_at if self._last_finished_cycle_at is not None else self._started_at
+            last_successful_cycle_age = now - self._last_successful_cycle_at if self._last_successful_cycle_at is not None else None
+            status = {
+                "live": now - last_progress_at <= self._max_cycle_age_seconds,
+                "ready": last_successful_cycle_age is not None and last_successful_cycle_age <= self._max_cycle_age_seconds,
+                "last_successful_cycle_age_seconds": last_successful_cycle_age,
+                "current_cycle_running_seconds": now - self._current_cycle_started_at if self._current_cycle_started_at is not None else None,
+                "max_cycle_age_seconds": self._max_cycle_age_seconds,
+                "last_cycle_error": self._last_cycle_error,
+                "cycles_total": self._cycles_total,
+                "failed_cycles_total": self._failed_cycles_total
+            }
+        status["pending_notifications"] = self._pending_notifications() if self._pending_notifications is not None else 0
+        return status
+
+
+class HealthServer:
+    """
+    Serves the health of a CycleHealth from a dedicated daemon thread.
+
+    /health/live and /health/ready answer 200 or 503, /health answers the full status as json.
+    """
+
+    def __init__(self, port, cycle_health):
+        """
+        Args:
+            port (int): Port to listen on, on all interfaces.
+            cycle_health (CycleHealth): Health to serve.
+        """
+        self._port = port
+        self._cycle_health = cycle_health
+        self._server = None
+
+
+    def start(self):
+        """
+        Start serving in the background.
+        """
+        cycle_health = self._cycle_health
+
+        class _HealthRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+                if path not in ("/health", "/health/live", "/health/ready"):
+                    self.send_error(404)
+                    return
+                status = cycle_health.get_status()
+                is_healthy = True
+                if path == "/health/live":
+                    is_healthy = status["live"]
+                elif path == "/health/ready":
+                    is_healthy = status["ready"]
+                body = json.dumps(status).encode()
+                self.send_response(200 if is_healthy else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("", self._port), _HealthRequestHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="health-server", daemon=True).start()
+
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
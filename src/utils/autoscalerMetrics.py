@@ -0,0 +1,236 @@
+# Metrics about the autoscaler itself, exposed in the prometheus text format on /metrics.
+
+# Thread safety, the metrics server reads while the cycle writes.
+import threading
+
+# Timing.
+import time
+from contextlib import contextmanager
+
+# Metrics server.
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Default histogram buckets in seconds.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class _Metric:
+    """
+    Base of all metric types, holding one value per combination of label values.
+    """
+    _type = ""
+
+    def __init__(self, name, documentation, label_names=()):
+        self._name = name
+        self._documentation = documentation
+        self._label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _get_label_values(self, labels):
+        return tuple(str(labels.get(label_name, "")) for label_name in self._label_names)
+
+    def _format_labels(self, label_values, additional_labels=()):
+        label_pairs = list(zip(self._label_names, label_values)) + list(additional_labels)
+        if not label_pairs:
+            return ""
+        escaped_pairs = [f'{label_name}="{_escape_label_value(label_value)}"' for label_name, label_value in label_pairs]
+        return "{" + ",".join(escaped_pairs) + "}"
+
+    def expose(self):
+        """
+        Get the metric in the prometheus text format.
+
+        Returns:
+            list: Lines of the metric.
+        """
+        lines = [f"# HELP {self._name} {self._documentation}", f"# TYPE {self._name} {self._type}"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.extend(self._expose_value(label_values, value))
+        return lines
+
+    def _expose_value(self, label_values, value):
+        return [f"{self._name}{self._format_labels(label_values)} {_format_number(value)}"]
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value, like the amount of scale events.
+    """
+    _type = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        # Expose unlabeled counters from the start, so rate() sees the first increment.
+        if not self._label_names:
+            self._values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        label_values = self._get_label_values(labels)
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, like the current replicas of a service.
+    """
+    _type = "gauge"
+
+    def set(self, value, **labels):
+        label_values = self._get_label_values(labels)
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values, like durations, in cumulative buckets.
+    """
+    _type = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self._buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        label_values = self._get_label_values(labels)
+        with self._lock:
+            if label_values not in self._values:
+                self._values[label_values] = {"bucket_counts": [0] * len(self._buckets), "count": 0, "sum": 0.0}
+            observations = self._values[label_values]
+            for bucket_index, bucket in enumerate(self._buckets):
+                if value <= bucket:
+                    observations["bucket_counts"][bucket_index] += 1
+            observations["count"] += 1
+            observations["sum"] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of a with block in seconds.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _expose_value(self, label_values, observations):
+        lines = []
+        for bucket, bucket_count in zip(self._buckets, observations["bucket_counts"]):
+            lines.append(f"{self._name}_bucket{self._format_labels(label_values, [('le', _format_number(bucket))])} {bucket_count}")
+        lines.append(f"{self._name}_bucket{self._format_labels(label_values, [('le', '+Inf')])} {observations['count']}")
+        lines.append(f"{self._name}_sum{self._format_labels(label_values)} {_format_number(observations['sum'])}")
+        lines.append(f"{self._name}_count{self._format_labels(label_values)} {observations['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds all metrics to expose.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self):
+        """
+        Get all metrics in the prometheus text format.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(label_value):
+    return str(label_value).replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+
+
+def _format_number(value):
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+### Metrics of the autoscaler ###
+REGISTRY = MetricsRegistry()
+
+# Durations.
+CYCLE_DURATION = REGISTRY.register(Histogram("autoscaler_cycle_duration_seconds", "Duration of a full autoscaling cycle."))
+PHASE_DURATION = REGISTRY.register(Histogram("autoscaler_phase_duration_seconds", "Duration of a phase of the autoscaling cycle per service, the scale_execution and messaging phases once per cycle.", ["phase"]))
+PROMETHEUS_QUERY_DURATION = REGISTRY.register(Histogram("autoscaler_prometheus_query_duration_seconds", "Duration of prometheus queries."))
+DOCKER_API_DURATION = REGISTRY.register(Histogram("autoscaler_docker_api_duration_seconds", "Duration of docker api calls.", ["call"]))
+NOTIFICATION_SEND_DURATION = REGISTRY.register(Histogram("autoscaler_notification_send_duration_seconds", "Duration of sending a notification.", ["platform"]))
+
+# Events.
+SCALE_EVENTS = REGISTRY.register(Counter("autoscaler_scale_events_total", "Successful scalings per service and direction (up, down).", ["service", "direction"]))
+PROMETHEUS_QUERY_FAILURES = REGISTRY.register(Counter("autoscaler_prometheus_query_failures_total", "Failed prometheus queries."))
+SETTLING_SKIPS = REGISTRY.register(Counter("autoscaler_settling_skips_total", "Evaluations skipped while a service converges or warms up after an update, per service and reason (converging, warmup).", ["service", "reason"]))
+DEFERRED_SCALINGS = REGISTRY.register(Counter("autoscaler_deferred_scalings_total", "Scale-ups deferred to the next cycle, per service and reason (task_budget, cluster_capacity).", ["service", "reason"]))
+PREEMPTED_TASKS = REGISTRY.register(Counter("autoscaler_preempted_tasks_total", "Tasks removed from a service to free capacity for higher priority services.", ["service"]))
+LABEL_VALIDATION_CACHE_LOOKUPS = REGISTRY.register(Counter("autoscaler_label_validation_cache_lookups_total", "Lookups of autoscale label sets in the validation cache, per result (hit, miss).", ["result"]))
+SUPPRESSED_MESSAGES = REGISTRY.register(Counter("autoscaler_suppressed_messages_total", "Messages not logged because of the log level.", ["level"]))
+
+# Replicas.
+SERVICE_REPLICAS = REGISTRY.register(Gauge("autoscaler_service_replicas", "Replicas of the service when it was last evaluated.", ["service"]))
+SERVICE_TARGET_REPLICAS = REGISTRY.register(Gauge("autoscaler_service_target_replicas", "Replicas the service was last decided to run.", ["service"]))
+FAST_PATH_SERVICES = REGISTRY.register(Gauge("autoscaler_fast_path_services", "Services of the last cycle that kept their replicas without detailed evaluation, comfortably inside their thresholds."))
+
+
+class MetricsServer:
+    """
+    Serves the metrics of a registry on /metrics from a daemon thread.
+    """
+
+    def __init__(self, port, registry=REGISTRY):
+        """
+        Args:
+            port (int): Port to listen on, on all interfaces.
+            registry (MetricsRegistry): Metrics to serve.
+        """
+        self._port = port
+        self._registry = registry
+        self._server = None
+
+    def start(self):
+        """
+        Start serving in the background.
+        """
+        registry = self._registry
+
+        class _MetricsRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.expose().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("", self._port), _MetricsRequestHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
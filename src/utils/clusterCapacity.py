@@ -0,0 +1,169 @@
+# Free cpu and memory reservations of the swarm nodes, to only scale up as far as new tasks can be placed.
+
+# Docker errors.
+import docker
+
+# Refresh interval.
+import time
+
+# Docker api durations.
+import autoscalerMetrics as AutoscalerMetrics
+
+
+class ClusterCapacity:
+    """
+    Model of the reservable capacity of all nodes.
+
+    Built from the active and ready nodes and the reservations of all tasks assigned to them. Swarm only places a task
+    on a node whose unreserved cpu and memory cover the task's reservations, so a scale-up beyond that leaves tasks pending.
+    The model is refreshed at most every refresh_interval_seconds, in between only the reservations of own scale-ups are added.
+    Placement constraints and generic resources are not modelled, tasks without reservations always fit.
+    """
+
+    def __init__(self, client, refresh_interval_seconds=0, clock=None):
+        """
+        Args:
+            client (docker.DockerClient): Docker client of a manager node.
+            refresh_interval_seconds (float): Minimum time between two refreshes from the docker api, 0 refreshes every time.
+            clock (callable|None): Returns the current time in seconds, defaults to time.time.
+        """
+        self._client = client
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._clock = clock if clock is not None else time.time
+        self._last_refresh_at = None
+        self._free_per_node = {}
+        self._tasks_per_service_node = {}
+        self._cycleRecorder = None
+
+
+    def set_cycle_recorder(self, cycle_recorder):
+        """
+        Record the nodes and tasks of each refresh with the given CycleRecorder (None disables recording).
+        """
+        self._cycleRecorder = cycle_recorder
+
+
+    def refresh(self):
+        """
+        Read the nodes and the reservations of their tasks, unless refreshed within the refresh interval.
+
+        Returns:
+            str|None: Error message if the capacity could not be read, the previous model is kept.
+        """
+        now = self._clock()
+        if self._last_refresh_at is not None and now - self._last_refresh_at < self._refresh_interval_seconds:
+            return None
+        try:
+            with AutoscalerMetrics.DOCKER_API_DURATION.time(call="nodes.list"):
+                nodes = self._client.nodes.list()
+            with AutoscalerMetrics.DOCKER_API_DURATION.time(call="tasks"):
+                tasks = self._client.api.tasks(filters={"desired-state": "running"})
+        except docker.errors.APIError as e:
+            return f"ClusterCapacity: Could not read nodes and tasks: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+        if self._cycleRecorder is not None:
+            self._cycleRecorder.record_cluster(nodes, tasks)
+
+        # Capacity of nodes accepting tasks.
+        free_per_node = {}
+        for node in nodes:
+            if node.attrs.get("Spec", {}).get("Availability") != "active" or node.attrs.get("Status", {}).get("State") != "ready":
+                continue
+            resources = node.attrs.get("Description", {}).get("Resources", {})
+            free_per_node[node.id] = {"nano_cpus": resources.get("NanoCPUs", 0), "memory_bytes": resources.get("MemoryBytes", 0)}
+
+        # Minus the reservations of all tasks assigned to them.
+        tasks_per_service_node = {}
+        for task in tasks:
+            free = free_per_node.get(task.get("NodeID"))
+            if free is None:
+                continue
+            reservations = task.get("Spec", {}).get("Resources", {}).get("Reservations", {})
+            free["nano_cpus"] -= reservations.get("NanoCPUs", 0)
+            free["memory_bytes"] -= reservations.get("MemoryBytes", 0)
+            tasks_per_node = tasks_per_service_node.setdefault(task.get("ServiceID"), {})
+            tasks_per_node[task["NodeID"]] = tasks_per_node.get(task["NodeID"], 0) + 1
+
+        self._free_per_node = free_per_node
+        self._tasks_per_service_node = tasks_per_service_node
+        self._last_refresh_at = now
+        return None
+
+
+    def reserve(self, nano_cpus, memory_bytes, tasks):
+        """
+        Place up to tasks new tasks with the given reservations and keep their reservations for later calls.
+
+        Each task goes to the node with the most free memory it fits on, like spreading tasks over the nodes.
+
+        Args:
+            nano_cpus (int): Cpu reservation of one task in billionths of a cpu.
+            memory_bytes (int): Memory reservation of one task.
+            tasks (int): Amount of new tasks.
+
+        Returns:
+            int: Amount of tasks that can be placed.
+        """
+        if nano_cpus <= 0 and memory_bytes <= 0:
+            return tasks
+        placed_tasks = 0
+        for _ in range(tasks):
+            fitting_nodes = [free for free in self._free_per_node.values() if free["nano_cpus"] >= nano_cpus and free["memory_bytes"] >= memory_bytes]
+            if not fitting_nodes:
+                break
+            free = max(fitting_nodes, key=lambda fitting_node: (fitting_node["memory_bytes"], fitting_node["nano_cpus"]))
+            free["nano_cpus"] -= nano_cpus
+            free["memory_bytes"] -= memory_bytes
+            placed_tasks += 1
+        return placed_tasks
+
+
+    def release(self, service_id, nano_cpus, memory_bytes):
+        """
+        Remove one task of a service from the model, e.g. when preempting it, and free its reservations.
+
+        The task is taken from the node running most tasks of the service.
+
+        Args:
+            service_id (str): Id of the service.
+            nano_cpus (int): Cpu reservation of one task in billionths of a cpu.
+            memory_bytes (int): Memory reservation of one task.
+
+        Returns:
+            str|None: Id of the node the task was removed from, None if no task of the service is known.
+        """
+        tasks_per_node = self._tasks_per_service_node.get(service_id, {})
+        if not tasks_per_node:
+            return None
+        node_id = max(tasks_per_node, key=tasks_per_node.get)
+        tasks_per_node[node_id] -= 1
+        if tasks_per_node[node_id] == 0:
+            del tasks_per_node[node_id]
+        self._free_per_node[node_id]["nano_cpus"] += nano_cpus
+        self._free_per_node[node_id]["memory_bytes"] += memory_bytes
+        return node_id
+
+
+    def restore(self, service_id, node_id, nano_cpus, memory_bytes):
+        """
+        Add a task removed by release back to its node, e.g. if removing it did not make room.
+
+        Args:
+            service_id (str): Id of the service.
+            node_id (str): Id of the node returned by release.
+            nano_cpus (int): Cpu reservation of one task in billionths of a cpu.
+            memory_bytes (int): Memory reservation of one task.
+        """
+        tasks_per_node = self._tasks_per_service_node.setdefault(service_id, {})
+        tasks_per_node[node_id] = tasks_per_node.get(node_id, 0) + 1
+        self._free_per_node[node_id]["nano_cpus"] -= nano_cpus
+        self._free_per_node[node_id]["memory_bytes"] -= memory_bytes
+
+
+    def get_free_capacity(self):
+        """
+        Get the unreserved capacity summed over all nodes.
+
+        Returns:
+            tuple: (nano cpus, memory bytes).
+        """
+        return sum(max(0, free["nano_cpus"]) for free in self._free_per_node.values()), sum(max(0, free["memory_bytes"]) for free in self._free_per_node.values())
@@ -1,35 +1,40 @@
 # Validation.
 import validationUtils 
 
+# Definitions.
+from valid_values import ScalingMetricName
+
+# Docker timestamps.
+import re
+from datetime import datetime, timezone
+
 # Memory.
+# Bytes per unit suffix, looked up by the last three, two and one characters instead of trying each suffix.
+_STORAGE_UNIT_BYTES = {
+    'kib': 1024,
+    'mib': 1024 * 1024,
+    'gib': 1024 * 1024 * 1024,
+    'tib': 1024 * 1024 * 1024 * 1024,
+    'kb': 1000,
+    'mb': 1000 * 1000,
+    'gb': 1000 * 1000 * 1000,
+    'tb': 1000 * 1000 * 1000 * 1000,
+    'b': 1
+}
+
 def human_readable_storage_to_bytes(size):
     """
     Convert memory or storage string to bytes.
     """
     size = size.strip().lower()
     try:
-        if size.endswith('kib'):
-            return int(float(size[:-3]) * 1024)
-        elif size.endswith('mib'):
-            return int(float(size[:-3]) * 1024 * 1024)
-        elif size.endswith('gib'):
-            return int(float(size[:-3]) * 1024 * 1024 * 1024)
-        elif size.endswith('tib'):
-            return int(float(size[:-3]) * 1024 * 1024 * 1024 * 1024)
-        elif size.endswith('kb'):
-            return int(float(size[:-2]) * 1000)
-        elif size.endswith('mb'):
-            return int(float(size[:-2]) * 1000 * 1000)
-        elif size.endswith('gb'):
-            return int(float(size[:-2]) * 1000 * 1000 * 1000)
-        elif size.endswith('tb'):
-            return int(float(size[:-2]) * 1000 * 1000 * 1000 * 1000)
-        elif size.endswith('b'):
-            return int(float(size[:-1]))
-        else:
-            return int(float(size))
+        for suffix_length in (3, 2, 1):
+            unit_bytes = _STORAGE_UNIT_BYTES.get(size[-suffix_length:], None)
+            if unit_bytes is not None:
+                return int(float(size[:-suffix_length]) * unit_bytes)
+        return int(float(size))
     except Exception as e:
-        raise ValueError("Invalid size format. Please use B, KiB, MiB, GiB, TiB, KB, MB, GB, TB or any valid float value.")
+        raise ValueError(validationUtils.INVALID_SIZE_MESSAGE)
     
     
 def bytes_to_human_readable_storage(bytes_size):
@@ -70,7 +75,7 @@ def percentage_to_float(percentage):
         else:
             raise ValueError("Percentage value must be between 0 and 100.")
     except Exception as e:
-        raise ValueError("Invalid percentage format. Please use <EMPHASIZE_STRING_START_TAG>%</EMPHASIZE_STRING_END_TAG> or any valid float value between 0 and 100.")
+        raise ValueError(validationUtils.INVALID_PERCENTAGE_MESSAGE)
 
 
 def float_to_percentage(float_value):
@@ -79,14 +84,21 @@ def float_to_percentage(float_value):
     """
     try:
         float_value = float(float_value)
-        if 0 <= float_value <= 100:
+        if 0 <= float_value:
             return "{:.2f}%".format(float_value)
         else:
-            raise ValueError("Percentage value must be between 0 and 100.")
+            raise ValueError("Percentage value must not be negative.")
     except Exception as e:
-        raise ValueError("Invalid float value. Please provide a valid float value between 0 and 100.")
+        raise ValueError("Invalid float value. Please provide a valid non-negative float value.")
+
+
+def is_percentage_string(value):
+    """
+    Check if the value is meant as a percentage, like "80%".
+    """
+    return isinstance(value, str) and value.strip().endswith('%')
+
 
-    
 
 
 def get_email_array_from_emails_list_string(emails_list_string):
@@ -167,3 +179,238 @@ def get_telegram_array_from_telegram_chats_list_string(telegram_chats_list_strin
         # If any unexpected error occurs, add a warning with details.
         warnings.append(f"Error extracting telegram chat ids from string <EMPHASIZE_STRING_START_TAG>{telegram_chats_list_string}</EMPHASIZE_STRING_END_TAG>: {str(e)}")
         return valid_telegram_chats, warnings
+
+
+
+def get_metric_weights_from_metric_weights_list_string(metric_weights_list_string):
+    """
+    Extracts a dict of metric weights from a comma-separated string like "cpu:2, memory:1".
+
+    Args:
+    - metric_weights_list_string (str): A comma-separated string of metric_name:weight pairs.
+
+    Returns:
+    A tuple consisting of:
+    - metric_weights (dict): A dict mapping ScalingMetricName to a non-negative float weight.
+    - warnings (list): A list of warnings generated during the process, such as unknown metrics.
+    """
+    warnings = []  # A list to store any warnings encountered during processing.
+    metric_weights = {}  # A dict to store valid weights.
+
+    try:
+        # If the input string is empty or 'None', return empty results.
+        if not metric_weights_list_string or metric_weights_list_string.lower() == "none":
+            return metric_weights, warnings
+
+        # Split the string by commas and validate each pair.
+        for metric_weight_string in metric_weights_list_string.split(','):
+            metric_name_string, separator, weight_string = metric_weight_string.partition(':')
+            metric_name = _get_scaling_metric_name_from_string(metric_name_string)
+            if metric_name is None or separator != ':':
+                warnings.append(f"Invalid metric weight: <EMPHASIZE_STRING_START_TAG>{metric_weight_string.strip()}</EMPHASIZE_STRING_END_TAG> must be <EMPHASIZE_STRING_START_TAG>metric:weight</EMPHASIZE_STRING_END_TAG> with metric one of: {', '.join([item.value.lower() for item in ScalingMetricName])}.")
+                continue
+            try:
+                weight = float(weight_string)
+            except ValueError:
+                weight = -1.0
+            if weight < 0:
+                warnings.append(f"Invalid metric weight: <EMPHASIZE_STRING_START_TAG>{metric_weight_string.strip()}</EMPHASIZE_STRING_END_TAG> weight must be a non-negative float.")
+                continue
+            metric_weights[metric_name] = weight
+
+        return metric_weights, warnings
+
+    except Exception as e:
+        # If any unexpected error occurs, add a warning with details.
+        warnings.append(f"Error extracting metric weights from string <EMPHASIZE_STRING_START_TAG>{metric_weights_list_string}</EMPHASIZE_STRING_END_TAG>: {str(e)}")
+        return metric_weights, warnings
+
+
+
+def get_metric_names_from_metric_list_string(metric_list_string):
+    """
+    Extracts an ordered tuple of metric names from a comma-separated string like "memory, cpu".
+
+    Args:
+    - metric_list_string (str): A comma-separated string of metric names, highest priority first.
+
+    Returns:
+    A tuple consisting of:
+    - metric_names (tuple): A tuple of unique ScalingMetricName in the given order.
+    - warnings (list): A list of warnings generated during the process, such as unknown metrics.
+    """
+    warnings = []  # A list to store any warnings encountered during processing.
+    metric_names = []  # A list to store valid metric names.
+
+    try:
+        # If the input string is empty or 'None', return empty results.
+        if not metric_list_string or metric_list_string.lower() == "none":
+            return tuple(metric_names), warnings
+
+        # Split the string by commas and validate each metric name.
+        for metric_name_string in metric_list_string.split(','):
+            metric_name = _get_scaling_metric_name_from_string(metric_name_string)
+            if metric_name is None:
+                warnings.append(f"Invalid metric: <EMPHASIZE_STRING_START_TAG>{metric_name_string.strip()}</EMPHASIZE_STRING_END_TAG> must be one of: {', '.join([item.value.lower() for item in ScalingMetricName])}.")
+            elif metric_name not in metric_names:
+                metric_names.append(metric_name)
+
+        return tuple(metric_names), warnings
+
+    except Exception as e:
+        # If any unexpected error occurs, add a warning with details.
+        warnings.append(f"Error extracting metrics from string <EMPHASIZE_STRING_START_TAG>{metric_list_string}</EMPHASIZE_STRING_END_TAG>: {str(e)}")
+        return tuple(metric_names), warnings
+
+
+def get_replica_schedule_from_string(replica_schedule_string):
+    """
+    Extracts scheduled replica overrides from a semicolon-separated string like "Mon-Fri 07:45-18:00 min=6 max=12; Sat,Sun 10:00-16:00 min=3".
+
+    Each entry consists of days ("*", "Mon-Fri", "Sat,Sun"), a time window ("HH:MM-HH:MM", ending the next day if the end is not after the start)
+    and at least one of min=<replicas> and max=<replicas>.
+
+    Args:
+    - replica_schedule_string (str): The schedule.
+
+    Returns:
+    A tuple consisting of:
+    - replica_schedule (list): A list of dicts with keys "days" (set of weekdays, Monday is 0), "start_minute", "end_minute",
+      "minimum_replicas" and "maximum_replicas" (int or None).
+    - warnings (list): A list of warnings generated during the process, such as invalid entries.
+    """
+    warnings = []  # A list to store any warnings encountered during processing.
+    replica_schedule = []  # A list to store valid entries.
+
+    try:
+        # If the input string is empty or 'None', return empty results.
+        if not replica_schedule_string or replica_schedule_string.lower() == "none":
+            return replica_schedule, warnings
+
+        # Split the string by semicolons and validate each entry.
+        for entry_string in replica_schedule_string.split(';'):
+            if not entry_string.strip():
+                continue
+            entry_parts = entry_string.split()
+            days = _get_weekdays_from_string(entry_parts[0]) if len(entry_parts) >= 3 else None
+            start_minute, end_minute = _get_minute_window_from_string(entry_parts[1]) if len(entry_parts) >= 3 else (None, None)
+            replicas = {}
+            for replicas_string in entry_parts[2:]:
+                key, separator, value = replicas_string.partition('=')
+                if separator == '=' and key.lower() in ("min", "max") and value.isdigit():
+                    replicas[key.lower()] = int(value)
+                else:
+                    replicas = {}
+                    break
+            if days is None or start_minute is None or not replicas or replicas.get("min", 1) < 1:
+                warnings.append(f"Invalid replica schedule entry: <EMPHASIZE_STRING_START_TAG>{entry_string.strip()}</EMPHASIZE_STRING_END_TAG> must be <EMPHASIZE_STRING_START_TAG>days HH:MM-HH:MM min=replicas max=replicas</EMPHASIZE_STRING_END_TAG>, like <EMPHASIZE_STRING_START_TAG>Mon-Fri 07:45-18:00 min=6</EMPHASIZE_STRING_END_TAG>, with min at least 1.")
+                continue
+            replica_schedule.append({
+                "days": days,
+                "start_minute": start_minute,
+                "end_minute": end_minute,
+                "minimum_replicas": replicas.get("min", None),
+                "maximum_replicas": replicas.get("max", None)
+            })
+
+        return replica_schedule, warnings
+
+    except Exception as e:
+        # If any unexpected error occurs, add a warning with details.
+        warnings.append(f"Error extracting replica schedule from string <EMPHASIZE_STRING_START_TAG>{replica_schedule_string}</EMPHASIZE_STRING_END_TAG>: {str(e)}")
+        return replica_schedule, warnings
+
+
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+_MINUTE_WINDOW_REGEX = re.compile(r"^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$")
+
+def _get_weekdays_from_string(days_string):
+    """
+    Get the set of weekdays (Monday is 0) of a string like "*", "Mon-Fri" or "Sat,Sun", or None if invalid.
+    """
+    if days_string == "*":
+        return set(range(7))
+    weekdays = set()
+    for day_range_string in days_string.lower().split(','):
+        first_day, separator, last_day = day_range_string.partition('-')
+        if first_day not in _WEEKDAYS or (separator and last_day not in _WEEKDAYS):
+            return None
+        weekday = _WEEKDAYS.index(first_day)
+        last_weekday = _WEEKDAYS.index(last_day) if separator else weekday
+        # Ranges may wrap around the week, like "Sat-Mon".
+        weekdays.add(weekday)
+        while weekday != last_weekday:
+            weekday = (weekday + 1) % 7
+            weekdays.add(weekday)
+    return weekdays
+
+def _get_minute_window_from_string(window_string):
+    """
+    Get start and end minute of the day of a string like "07:45-18:00", or (None, None) if invalid.
+    """
+    match = _MINUTE_WINDOW_REGEX.match(window_string)
+    if not match:
+        return None, None
+    start_minute = int(match.group(1)) * 60 + int(match.group(2))
+    end_minute = int(match.group(3)) * 60 + int(match.group(4))
+    if int(match.group(2)) > 59 or int(match.group(4)) > 59 or start_minute >= 24 * 60 or end_minute > 24 * 60:
+        return None, None
+    return start_minute, end_minute
+
+
+def _get_scaling_metric_name_from_string(metric_name_string):
+    """
+    Get the ScalingMetricName for a case insensitive metric name like "cpu" or None if unknown.
+    """
+    try:
+        return ScalingMetricName(metric_name_string.strip().upper())
+    except ValueError:
+        return None
+
+
+
+# Time.
+def time_duration_to_seconds(time_duration):
+    """
+    Convert a prometheus time duration like "5m" to seconds.
+    """
+    time_duration = str(time_duration).strip().lower()
+    try:
+        return int(float(time_duration[:-1]) * _TIME_DURATION_UNIT_SECONDS[time_duration[-1]])
+    except Exception as e:
+        raise ValueError("Invalid time duration format. Please use a number followed by one of s, m, h, d, w, y.")
+
+def docker_timestamp_to_seconds(docker_timestamp):
+    """
+    Convert a docker api timestamp like "2024-05-01T12:34:56.123456789Z" to seconds since the epoch.
+
+    Returns:
+        float|None: None if the timestamp is invalid.
+    """
+    match = _DOCKER_TIMESTAMP_REGEX.match(str(docker_timestamp).strip())
+    if not match:
+        return None
+    try:
+        # Docker reports nanoseconds, datetime parses microseconds.
+        microseconds = (match.group(2) or "0")[:6].ljust(6, "0")
+        utc_offset = match.group(3) if match.group(3) and match.group(3) != "Z" else "+00:00"
+        return datetime.fromisoformat(f"{match.group(1)}.{microseconds}{utc_offset}").timestamp()
+    except ValueError:
+        return None
+
+def seconds_to_docker_timestamp(seconds):
+    """
+    Convert seconds since the epoch to a docker api timestamp.
+    """
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f000Z")
+
+_DOCKER_TIMESTAMP_REGEX = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})?$")
+
+_TIME_DURATION_UNIT_SECONDS = {
+    's': 1,
+    'm': 60,
+    'h': 60 * 60,
+    'd': 60 * 60 * 24,
+    'w': 60 * 60 * 24 * 7,
+    'y': 60 * 60 * 24 * 365
+}
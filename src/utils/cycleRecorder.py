@@ -0,0 +1,148 @@
+# Records the inputs of every autoscaling cycle to reproduce decisions later.
+
+# Serialization.
+import json
+
+# Timestamps.
+import time
+
+
+class CycleRecorder:
+    """
+    Appends one JSON line per autoscaling cycle to a file.
+
+    Each line holds everything the decisions of that cycle were based on:
+        {
+            "cycle": 1,
+            "timestamp": 1700000000.0,
+            "services": [{"id": ..., "name": ..., "version": ..., "labels": {...}, "replicas": 2, "resources": {...}, "updated_at": ..., "service_status": {...}}],
+            "prometheus": [{"query": ..., "result": [...]}],
+            "cluster": {"nodes": [{"id": ..., "availability": ..., "state": ..., "nano_cpus": ..., "memory_bytes": ...}], "tasks": [{"service_id": ..., "node_id": ..., "reservations": {...}}]},
+            "replicas": {"web": 2},
+            "scaled": {"web": 3}
+        }
+
+    "cluster" is only present in cycles that read the nodes and tasks for CLUSTER_CAPACITY_CHECK.
+    The file can be replayed with src/replay_cycles.py.
+    """
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): File to append the recordings to.
+        """
+        self._file_path = file_path
+        self._cycle = 0
+        self._current_cycle = None
+
+
+    def start_cycle(self, timestamp=None):
+        """
+        Start recording a new cycle.
+
+        Args:
+            timestamp (float|None): Time of the cycle in seconds since the epoch, defaults to now.
+        """
+        self._cycle += 1
+        self._current_cycle = {
+            "cycle": self._cycle,
+            "timestamp": timestamp if timestamp is not None else time.time(),
+            "services": [],
+            "prometheus": [],
+            "replicas": {},
+            "scaled": {}
+        }
+
+
+    def record_service(self, service):
+        """
+        Record a discovered autoscale service.
+
+        Args:
+            service (docker.models.services.Service): The discovered service.
+        """
+        if self._current_cycle is None:
+            return
+        spec = service.attrs.get("Spec", {})
+        self._current_cycle["services"].append({
+            "id": service.attrs.get("ID", ""),
+            "name": spec.get("Name", ""),
+            "version": service.attrs.get("Version", {}).get("Index", 0),
+            "labels": {label: value for label, value in spec.get("Labels", {}).items() if label.startswith("autoscale")},
+            "replicas": spec.get("Mode", {}).get("Replicated", {}).get("Replicas", 0),
+            "resources": spec.get("TaskTemplate", {}).get("Resources", {}),
+            "updated_at": service.attrs.get("UpdatedAt", None),
+            "service_status": service.attrs.get("ServiceStatus", None)
+        })
+
+
+    def record_prometheus_query(self, query, result):
+        """
+        Record a raw prometheus query result.
+        """
+        if self._current_cycle is None:
+            return
+        self._current_cycle["prometheus"].append({"query": query, "result": result})
+
+
+    def record_cluster(self, nodes, tasks):
+        """
+        Record the nodes and the reservations of their tasks read for the cluster capacity.
+
+        Args:
+            nodes (list of docker.models.nodes.Node): All nodes.
+            tasks (list of dict): Running tasks of the low level api.
+        """
+        if self._current_cycle is None:
+            return
+        self._current_cycle["cluster"] = {
+            "nodes": [{
+                "id": node.id,
+                "availability": node.attrs.get("Spec", {}).get("Availability", ""),
+                "state": node.attrs.get("Status", {}).get("State", ""),
+                "nano_cpus": node.attrs.get("Description", {}).get("Resources", {}).get("NanoCPUs", 0),
+                "memory_bytes": node.attrs.get("Description", {}).get("Resources", {}).get("MemoryBytes", 0)
+            } for node in nodes],
+            "tasks": [{
+                "service_id": task.get("ServiceID", ""),
+                "node_id": task.get("NodeID", ""),
+                "reservations": task.get("Spec", {}).get("Resources", {}).get("Reservations", {})
+            } for task in tasks]
+        }
+
+
+    def record_replicas(self, service_name, replicas):
+        """
+        Record the replicas read before deciding about a service.
+        """
+        if self._current_cycle is None:
+            return
+        self._current_cycle["replicas"][service_name] = replicas
+
+
+    def record_scaling(self, service_name, replicas):
+        """
+        Record a successful scaling of a service.
+        """
+        if self._current_cycle is None:
+            return
+        self._current_cycle["scaled"][service_name] = replicas
+
+
+    def finish_cycle(self):
+        """
+        Append the current cycle to the file.
+
+        Returns:
+            str|None: Error message if the cycle could not be written.
+        """
+        if self._current_cycle is None:
+            return None
+        try:
+            with open(self._file_path, "a") as recording_file:
+                recording_file.write(json.dumps(self._current_cycle, separators=(",", ":")) + "\n")
+            return None
+        except Exception as e:
+            return f"CycleRecorder: Could not write cycle to <EMPHASIZE_STRING_START_TAG>{self._file_path}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+        finally:
+            self._current_cycle = None
@@ -2,8 +2,6 @@
 
 # Get date.
 from datetime import datetime
-# For making time timezone aware.
-import pytz
 # Get environment vars.
 import os
 
@@ -45,6 +43,9 @@ def getTimezone():
     Returns:
         pytz.timezone: A pytz timezone object representing the timezone.
     """
+    # For making time timezone aware, imported on first use.
+    import pytz
+
     # Default timezone to UTC.
     timezone = 'Etc/UTC'
     try:
@@ -0,0 +1,14 @@
+# Helpers for docker api responses.
+
+
+def is_update_out_of_sequence(api_error):
+    """
+    Whether docker rejected a service update, because the passed spec version is outdated.
+
+    Args:
+        api_error (docker.errors.APIError): The error of the update.
+
+    Returns:
+        bool: True if the service was updated by someone else since it was read.
+    """
+    return "update out of sequence" in str(api_error).lower()
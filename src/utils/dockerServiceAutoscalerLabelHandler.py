@@ -1,9 +1,6 @@
 # Connect to docker via python api.
 import docker
 
-# String verification.
-import re
-
 # Own AutoScaleService class.
 import autoScaleService as AutoScaleService
 
@@ -13,9 +10,15 @@ import converterUtils
 # Validation.
 import validationUtils
 
+# Metric aggregation.
+import metricAggregationUtils as MetricAggregationUtils
+
+# Cache lookups.
+import autoscalerMetrics as AutoscalerMetrics
+
 # Definitions.
-from label_definitions import cpu_labels, memory_labels, email_labels, telegram_labels
-from valid_values import ScalingConflictResolution, LogLevel
+from label_definitions import cpu_labels, memory_labels, decision_labels, scale_to_zero_labels, email_labels, telegram_labels
+from valid_values import ScalingConflictResolution, LogLevel, MemoryThresholdReference, MetricAggregation, ServicePriority
 
 class DockerServiceAutoscalerLabelHandler:
     """
@@ -23,8 +26,12 @@ class DockerServiceAutoscalerLabelHandler:
 
         Parameters:
             service (docker.models.services.Service): Docker service object.
+            validation_cache (LabelValidationCache|None): Verification results of label sets, None to verify every time.
     """
-    def __init__(self, service):
+    def __init__(self, service, validation_cache=None):
+        # Verification results of label sets.
+        self._validation_cache = validation_cache
+
         # Labels of service.
         if "Labels" in service.attrs["Spec"]:
             self._labels = service.attrs["Spec"]["Labels"]
@@ -37,6 +44,16 @@ class DockerServiceAutoscalerLabelHandler:
         else:
             self._service_name = {}
 
+        # Resource limits and reservations of service.
+        self._service_resources = service.attrs["Spec"].get("TaskTemplate", {}).get("Resources", {})
+
+        # Rollout state of service, ServiceStatus is only reported when listing with status=True.
+        self._service_rollout = {
+            "updated_at": service.attrs.get("UpdatedAt", None),
+            "running_tasks": service.attrs.get("ServiceStatus", {}).get("RunningTasks", None),
+            "desired_tasks": service.attrs.get("ServiceStatus", {}).get("DesiredTasks", None)
+        }
+
             
 
     def is_autoscale_service(self):
@@ -63,9 +80,22 @@ class DockerServiceAutoscalerLabelHandler:
         if self.is_autoscale_service():
             try:
                 autoscale_labels = self._get_all_autoscale_labels()
-                verification_errors, verification_warnings = self.verify_autoscale_labels()
+                parsed_labels = None
+                if self._validation_cache is None:
+                    verification_errors, verification_warnings = self.verify_autoscale_labels()
+                else:
+                    # Unchanged and shared label sets are verified once.
+                    fingerprint = self._validation_cache.get_fingerprint(autoscale_labels, self._get_validated_spec_inputs())
+                    cache_entry = self._validation_cache.get(fingerprint)
+                    AutoscalerMetrics.LABEL_VALIDATION_CACHE_LOOKUPS.inc(result="miss" if cache_entry is None else "hit")
+                    if cache_entry is None:
+                        verification_errors, verification_warnings = self.verify_autoscale_labels()
+                        cache_entry = self._validation_cache.put(fingerprint, autoscale_labels, verification_errors, verification_warnings)
+                    autoscale_labels = cache_entry["autoscale_labels"]
+                    parsed_labels = cache_entry["parsed_labels"]
+                    verification_errors, verification_warnings = list(cache_entry["errors"]), list(cache_entry["warnings"])
                 if verification_errors == []:
-                    return True, AutoScaleService.AutoScaleService(self._service_name, autoscale_labels), verification_warnings
+                    return True, AutoScaleService.AutoScaleService(self._service_name, autoscale_labels, self._service_resources, self._service_rollout, parsed_labels), verification_warnings
                 else:
                     return False, verification_errors, verification_warnings
             except Exception as e:
@@ -122,18 +152,24 @@ class DockerServiceAutoscalerLabelHandler:
             # Check if autoscale.scaling_conflict_resolution holds valid value.
             if "autoscale.scaling_conflict_resolution" in autoscale_labels:
                 value = autoscale_labels["autoscale.scaling_conflict_resolution"]
-                if value not in [item.value for item in ScalingConflictResolution]:
+                if not validationUtils.is_setting_value_valid("scaling_conflict_resolution", value):
                     valid_values_str = ", ".join([item.value for item in ScalingConflictResolution])
                     warning_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>autoscale.scaling_conflict_resolution</EMPHASIZE_STRING_END_TAG> must be one of: {valid_values_str}. Provided invalid value: <EMPHASIZE_STRING_START_TAG>{value}</EMPHASIZE_STRING_END_TAG>")
 
             # Check if autoscale.log_level holds valid value.
             if "autoscale.log_level" in autoscale_labels:
                 value = autoscale_labels["autoscale.log_level"]
-                if value not in [item.value for item in LogLevel]:
+                if not validationUtils.is_setting_value_valid("log_level", value):
                     valid_values_str = ", ".join([item.value for item in LogLevel])
                     warning_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>autoscale.log_level</EMPHASIZE_STRING_END_TAG> must be one of: {valid_values_str}. Provided invalid value: <EMPHASIZE_STRING_START_TAG>{value}</EMPHASIZE_STRING_END_TAG>")
 
 
+            # Decision engine related labels.
+            warning_messages += self._verify_decision_labels(autoscale_labels)
+
+            # Scale to zero related labels.
+            warning_messages += self._verify_scale_to_zero_labels(autoscale_labels)
+
             # Email related labels.
             warning_messages += self._verify_email_labels(autoscale_labels)
 
@@ -157,6 +193,46 @@ class DockerServiceAutoscalerLabelHandler:
         return error_messages, warning_messages
     
 
+    def _verify_decision_labels(self, autoscale_labels):
+        """
+        Verify if decision engine labels hold valid values for the given service.
+
+        Args:
+            autoscale_labels (dict): A dictionary containing autoscale labels.
+
+        Returns:
+            list: A list containing warning messages.
+                If labels are set correctly, returns an empty list.
+        """
+        warning_messages = []
+        for decision_label_obj in decision_labels:
+            if decision_label_obj["label"] in autoscale_labels:
+                warning_messages += self._verify_label(decision_label_obj["label"], autoscale_labels[decision_label_obj["label"]], decision_label_obj["value_type"])
+        return warning_messages
+    
+
+    def _verify_scale_to_zero_labels(self, autoscale_labels):
+        """
+        Verify if scale to zero labels hold valid values for the given service.
+
+        Args:
+            autoscale_labels (dict): A dictionary containing autoscale labels.
+
+        Returns:
+            list: A list containing warning messages.
+                If labels are set correctly, returns an empty list.
+        """
+        warning_messages = []
+        for scale_to_zero_label_obj in scale_to_zero_labels:
+            if scale_to_zero_label_obj["label"] in autoscale_labels:
+                warning_messages += self._verify_label(scale_to_zero_label_obj["label"], autoscale_labels[scale_to_zero_label_obj["label"]], scale_to_zero_label_obj["value_type"])
+        if "autoscale.wake_query" in autoscale_labels and "autoscale.scale_to_zero_after" not in autoscale_labels:
+            warning_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>autoscale.wake_query</EMPHASIZE_STRING_END_TAG> is only used with Label <EMPHASIZE_STRING_START_TAG>autoscale.scale_to_zero_after</EMPHASIZE_STRING_END_TAG>")
+        if "autoscale.scale_to_zero_after" in autoscale_labels and "autoscale.wake_query" not in autoscale_labels and not all(cpu_label_obj["label"] in autoscale_labels for cpu_label_obj in cpu_labels if cpu_label_obj["required"]):
+            warning_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>autoscale.scale_to_zero_after</EMPHASIZE_STRING_END_TAG> requires Label <EMPHASIZE_STRING_START_TAG>autoscale.wake_query</EMPHASIZE_STRING_END_TAG> or cpu scaling to detect idle time, the service is not scaled to zero")
+        return warning_messages
+    
+
     def _verify_email_labels(self, autoscale_labels):
         """
         Verify if email autoscaling labels are set correctly for the given service.
@@ -325,10 +401,35 @@ class DockerServiceAutoscalerLabelHandler:
                 else:
                     error_messages += self._verify_label(memory_label_obj["label"], autoscale_labels[memory_label_obj["label"]], memory_label_obj["value_type"])
 
+            # Relative thresholds require both thresholds to be percentages and the referenced memory setting in the service spec.
+            upscale_threshold = autoscale_labels.get("autoscale.memory_upscale_threshold", None)
+            downscale_threshold = autoscale_labels.get("autoscale.memory_downscale_threshold", None)
+            if upscale_threshold is not None and downscale_threshold is not None:
+                if converterUtils.is_percentage_string(upscale_threshold) != converterUtils.is_percentage_string(downscale_threshold):
+                    error_messages.append(f"Labels <EMPHASIZE_STRING_START_TAG>autoscale.memory_upscale_threshold</EMPHASIZE_STRING_END_TAG> and <EMPHASIZE_STRING_START_TAG>autoscale.memory_downscale_threshold</EMPHASIZE_STRING_END_TAG> must either both be percentages or both be bytes. Provided: <EMPHASIZE_STRING_START_TAG>{upscale_threshold}</EMPHASIZE_STRING_END_TAG>, <EMPHASIZE_STRING_START_TAG>{downscale_threshold}</EMPHASIZE_STRING_END_TAG>")
+                elif converterUtils.is_percentage_string(upscale_threshold):
+                    reference = autoscale_labels.get("autoscale.memory_threshold_reference", MemoryThresholdReference.LIMIT.value)
+                    resources_key = "Reservations" if reference == MemoryThresholdReference.RESERVATION.value else "Limits"
+                    if not self._service_resources.get(resources_key, {}).get("MemoryBytes", 0):
+                        error_messages.append(f"Percentage memory thresholds require a memory {resources_key.lower()[:-1]} in the service spec (deploy.resources.{resources_key.lower()}.memory). Provided thresholds: <EMPHASIZE_STRING_START_TAG>{upscale_threshold}</EMPHASIZE_STRING_END_TAG>, <EMPHASIZE_STRING_START_TAG>{downscale_threshold}</EMPHASIZE_STRING_END_TAG>")
+
         return error_messages
     
 
     
+    def _get_validated_spec_inputs(self):
+        """
+        Get the parts of the service spec the verification depends on, besides the labels.
+
+        Returns:
+            dict: Memory limit and reservation in bytes, 0 if not set.
+        """
+        return {
+            "limit_memory_bytes": self._service_resources.get("Limits", {}).get("MemoryBytes", 0),
+            "reservation_memory_bytes": self._service_resources.get("Reservations", {}).get("MemoryBytes", 0)
+        }
+
+
     def _is_any_memory_label_set(self, autoscale_labels):
         """
         Check if any memory-related autoscale label is set.
@@ -359,22 +460,36 @@ class DockerServiceAutoscalerLabelHandler:
         Returns:
             list: A list containing verification error message.
         """
+        # Most values are valid, check them with the precompiled validator of their value type first.
+        if value_type in validationUtils.VALUE_TYPE_VALIDATORS and validationUtils.is_value_valid(value_type, value):
+            return []
+
+        # Explain invalid values.
         error_messages = []
         provided_invalid_value_message_addendum=f". Provided invalid value: <EMPHASIZE_STRING_START_TAG>{value}</EMPHASIZE_STRING_END_TAG>"
 
         if value_type == "percentage":
-            try:
-                converterUtils.percentage_to_float(value)
-            except Exception as e:
-                error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> {str(e)}{provided_invalid_value_message_addendum}")
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> {validationUtils.INVALID_PERCENTAGE_MESSAGE}{provided_invalid_value_message_addendum}")
         elif value_type == "valid time_duration":
-            if not re.match(r'^\d+[smhdwy]$', value):
-                error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be a valid time_duration (https://prometheus.io/docs/prometheus/latest/querying/basics/#time-durations){provided_invalid_value_message_addendum}")
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be a valid time_duration (https://prometheus.io/docs/prometheus/latest/querying/basics/#time-durations){provided_invalid_value_message_addendum}")
         elif value_type == "byte":
-            try:
-                converterUtils.human_readable_storage_to_bytes(value)
-            except Exception as e:
-                error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> {str(e)}{provided_invalid_value_message_addendum}")
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> {validationUtils.INVALID_SIZE_MESSAGE}{provided_invalid_value_message_addendum}")
+        elif value_type == "aggregation":
+            if not MetricAggregationUtils.is_aggregation_valid(value):
+                valid_values_str = ", ".join([item.value for item in MetricAggregation])
+                error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be one of: {valid_values_str} or a percentile p1 - p99{provided_invalid_value_message_addendum}")
+        elif value_type == "byte_or_percentage":
+            invalid_message = validationUtils.INVALID_PERCENTAGE_MESSAGE if converterUtils.is_percentage_string(value) else validationUtils.INVALID_SIZE_MESSAGE
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> {invalid_message}{provided_invalid_value_message_addendum}")
+        elif value_type == "memory_threshold_reference":
+            valid_values_str = ", ".join([item.value for item in MemoryThresholdReference])
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be one of: {valid_values_str}{provided_invalid_value_message_addendum}")
+        elif value_type == "service_priority":
+            valid_values_str = ", ".join([item.value for item in ServicePriority])
+            error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be one of: {valid_values_str}{provided_invalid_value_message_addendum}")
+        elif value_type == "prometheus_query":
+            if not value.strip() or value.count("(") != value.count(")") or value.count("{") != value.count("}"):
+                error_messages.append(f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG> must be a prometheus query with balanced brackets{provided_invalid_value_message_addendum}")
         elif value_type == "email_list":
             # Get warnings from converter utils.
             valid_emails, warnings = converterUtils.get_email_array_from_emails_list_string(value)
@@ -389,6 +504,27 @@ class DockerServiceAutoscalerLabelHandler:
             warnings = [f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG>: {warning}{provided_invalid_value_message_addendum}" for warning in warnings]
             # Merge warnings with errors.
             error_messages.extend(warnings)
+        elif value_type == "metric_weight_list":
+            # Get warnings from converter utils.
+            metric_weights, warnings = converterUtils.get_metric_weights_from_metric_weights_list_string(value)
+            # Append custom label to each warning.
+            warnings = [f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG>: {warning}{provided_invalid_value_message_addendum}" for warning in warnings]
+            # Merge warnings with errors.
+            error_messages.extend(warnings)
+        elif value_type == "metric_list":
+            # Get warnings from converter utils.
+            metric_names, warnings = converterUtils.get_metric_names_from_metric_list_string(value)
+            # Append custom label to each warning.
+            warnings = [f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG>: {warning}{provided_invalid_value_message_addendum}" for warning in warnings]
+            # Merge warnings with errors.
+            error_messages.extend(warnings)
+        elif value_type == "replica_schedule":
+            # Get warnings from converter utils.
+            replica_schedule, warnings = converterUtils.get_replica_schedule_from_string(value)
+            # Append custom label to each warning.
+            warnings = [f"Label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG>: {warning}" for warning in warnings]
+            # Merge warnings with errors.
+            error_messages.extend(warnings)
 
         else: 
             error_messages.append(f"DockerServiceAutoscalerLabelHandler._verify_label(): Unknown value type <EMPHASIZE_STRING_START_TAG>{value_type}</EMPHASIZE_STRING_END_TAG> for label <EMPHASIZE_STRING_START_TAG>{label}</EMPHASIZE_STRING_END_TAG>")
@@ -426,12 +562,18 @@ class DockerServiceAutoscalerLabelHandler:
                 autoscale_labels["autoscale.cpu_downscale_threshold"] = self._labels["autoscale.cpu_downscale_threshold"]
             if "autoscale.cpu_downscale_time_duration" in self._labels:
                 autoscale_labels["autoscale.cpu_downscale_time_duration"] = self._labels["autoscale.cpu_downscale_time_duration"]
+            if "autoscale.cpu_aggregation" in self._labels:
+                autoscale_labels["autoscale.cpu_aggregation"] = self._labels["autoscale.cpu_aggregation"]
 
             # Memory metrics.
             if "autoscale.memory_upscale_threshold" in self._labels:
                 autoscale_labels["autoscale.memory_upscale_threshold"] = self._labels["autoscale.memory_upscale_threshold"]
             if "autoscale.memory_downscale_threshold" in self._labels:
                 autoscale_labels["autoscale.memory_downscale_threshold"] = self._labels["autoscale.memory_downscale_threshold"]
+            if "autoscale.memory_threshold_reference" in self._labels:
+                autoscale_labels["autoscale.memory_threshold_reference"] = self._labels["autoscale.memory_threshold_reference"]
+            if "autoscale.memory_aggregation" in self._labels:
+                autoscale_labels["autoscale.memory_aggregation"] = self._labels["autoscale.memory_aggregation"]
 
             # Optional settings.
             if "autoscale.scaling_conflict_resolution" in self._labels:
@@ -439,6 +581,24 @@ class DockerServiceAutoscalerLabelHandler:
             if "autoscale.log_level" in self._labels:
                 autoscale_labels["autoscale.log_level"] = self._labels["autoscale.log_level"]
 
+            # Decision engine related labels.
+            if "autoscale.scaling_metric_weights" in self._labels:
+                autoscale_labels["autoscale.scaling_metric_weights"] = self._labels["autoscale.scaling_metric_weights"]
+            if "autoscale.scaling_metric_priority" in self._labels:
+                autoscale_labels["autoscale.scaling_metric_priority"] = self._labels["autoscale.scaling_metric_priority"]
+            if "autoscale.scaling_warmup" in self._labels:
+                autoscale_labels["autoscale.scaling_warmup"] = self._labels["autoscale.scaling_warmup"]
+            if "autoscale.replica_schedule" in self._labels:
+                autoscale_labels["autoscale.replica_schedule"] = self._labels["autoscale.replica_schedule"]
+            if "autoscale.priority" in self._labels:
+                autoscale_labels["autoscale.priority"] = self._labels["autoscale.priority"]
+
+            # Scale to zero related labels.
+            if "autoscale.scale_to_zero_after" in self._labels:
+                autoscale_labels["autoscale.scale_to_zero_after"] = self._labels["autoscale.scale_to_zero_after"]
+            if "autoscale.wake_query" in self._labels:
+                autoscale_labels["autoscale.wake_query"] = self._labels["autoscale.wake_query"]
+
             # Email related labels.
             if "autoscale.additional_email_recipients_important_msgs" in self._labels:
                 autoscale_labels["autoscale.additional_email_recipients_important_msgs"] = self._labels["autoscale.additional_email_recipients_important_msgs"]
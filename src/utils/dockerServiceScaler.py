@@ -1,25 +1,63 @@
 # Connect to docker via python api.
 import docker
 
+# Get environment variables.
+import os
+
 # Own class to get autoscale services from labels.
 import dockerServiceAutoscalerLabelHandler as DockerServiceAutoscalerLabelHandler
 
 # For retrieving container/ service metrics via prometheus.
 import prometheusConnector as PrometheusConnector
-prometheusConnector = PrometheusConnector.PrometheusConnector()
 
 # Definitions.
-from valid_values import ScalingConflictResolution, ScalingSuggestion, ScalingMetricName, MessagingPlatforms
+from valid_values import ScalingSuggestion, ScalingMetricName, MessagingPlatforms, ScaleLimitReason
 
 # Custom Scaling Metrics class.
 import scalingMetrics as ScalingMetrics
 
+# Combines the suggestions of all metrics.
+import scalingDecisionEngine as ScalingDecisionEngine
+
+# Aggregates per task metric values.
+import metricAggregationUtils as MetricAggregationUtils
+
 # Logger.
 import messagePlatformHandler as MessagePlatformHandler
 
 # Conversion.
 import converterUtils
 
+# Recording of cycle inputs.
+import cycleRecorder as CycleRecorder
+
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
+# Cycle duration.
+import time
+
+# Tracing spans.
+import spanTracing as SpanTracing
+
+# Conflicting updates.
+import dockerApiUtils as DockerApiUtils
+
+# Scheduled replicas in the configured timezone.
+import dateStringUtils as DateStringUtils
+from datetime import datetime
+
+# Applying the scalings of a cycle together.
+import scaleExecutor as ScaleExecutor
+import scaleOperation as ScaleOperation
+import clusterCapacity as ClusterCapacity
+
+# Pre-pass over the metrics of all services.
+import thresholdClassifier as ThresholdClassifier
+
+# Verification results of label sets.
+import labelValidationCache as LabelValidationCache
+
 class DockerServiceScaler:
     """
     A class for scaling Docker services.
@@ -28,53 +66,274 @@ class DockerServiceScaler:
     and retrieve the current number of replicas for a given service.
     """
 
-    def __init__(self):
-        self.client = docker.from_env()
-        self._messagePlatformHandler = MessagePlatformHandler.MessagePlatformHandler()
+    # Attempts to scale a service whose spec changes between reading and scaling.
+    _MAX_SCALE_ATTEMPTS = 3
 
-    def auto_scale_services(self):
+    # Time after an update, after which a service whose tasks still do not all run is evaluated anyway (e.g. tasks that cannot be scheduled).
+    _MAX_CONVERGENCE_WAIT_SECONDS = 600
+
+    def __init__(self, client=None, prometheus_connector=None, message_platform_handler=None, cycle_recorder=None, service_filter=None, scale_executor=None, clock=None):
         """
-        Look for services with autoscale enabled and then scale based on prometheus metrics.
+        Constructor of the scaler.
+
+        All dependencies can be replaced, e.g. by fakes of the simulation.
+
+        Args:
+            client (docker.DockerClient|None): Docker client, defaults to docker.from_env().
+            prometheus_connector (PrometheusConnector|None): Source of metrics, defaults to PrometheusConnector().
+            message_platform_handler (MessagePlatformHandler|None): Handles all messages, defaults to MessagePlatformHandler().
+            cycle_recorder (CycleRecorder|None): Records the inputs of each cycle, defaults to a recorder writing to CYCLE_RECORDING_FILE if set.
+            service_filter (callable|None): Only services whose name it returns True for are evaluated, e.g. the shard of this replica.
+            scale_executor (ScaleExecutor|None): Applies the scalings of a cycle, defaults to one configured by SCALE_CONCURRENCY, SCALE_MAX_NEW_TASKS_PER_CYCLE, CLUSTER_CAPACITY_CHECK and SCALE_PREEMPTION.
+            clock (callable|None): Returns the current time in seconds since the epoch, defaults to time.time, e.g. simulated time.
         """
-        # Loop through all autoscale services.
-        autoscale_services = self._get_autoscale_services()
-        for autoscale_service in autoscale_services:
+        self.client = client if client is not None else docker.from_env()
+        self._prometheusConnector = prometheus_connector if prometheus_connector is not None else PrometheusConnector.PrometheusConnector()
+        self._messagePlatformHandler = message_platform_handler if message_platform_handler is not None else MessagePlatformHandler.MessagePlatformHandler()
+        self._serviceFilter = service_filter
+        self._executionCheck = None
+        self._clock = clock if clock is not None else time.time
+        self._cycle_timestamp = self._clock()
+        self._scaleExecutor = scale_executor if scale_executor is not None else self._create_scale_executor()
+
+        # Optional fast path for services comfortably inside their thresholds.
+        self._fast_path_margin = None
+        fast_path_margin = os.getenv("FAST_PATH_MARGIN", "").strip().strip("\"")
+        if fast_path_margin:
+            try:
+                self._fast_path_margin = converterUtils.percentage_to_float(fast_path_margin) / 100
+            except ValueError as e:
+                self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>FAST_PATH_MARGIN</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{fast_path_margin}</EMPHASIZE_STRING_END_TAG>: {e} Evaluating all services in detail.")
+
+        # Cache of label verification results, unless disabled by 0.
+        self._labelValidationCache = None
+        label_validation_cache_size = os.getenv("LABEL_VALIDATION_CACHE_SIZE", "").strip().strip("\"")
+        max_entries = 1024
+        if label_validation_cache_size:
+            try:
+                max_entries = int(label_validation_cache_size)
+                if max_entries < 0:
+                    raise ValueError("Must be at least 0.")
+            except ValueError as e:
+                max_entries = 1024
+                self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>LABEL_VALIDATION_CACHE_SIZE</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{label_validation_cache_size}</EMPHASIZE_STRING_END_TAG>: {e} Defaulting to <EMPHASIZE_STRING_START_TAG>{max_entries}</EMPHASIZE_STRING_END_TAG>.")
+        if max_entries > 0:
+            self._labelValidationCache = LabelValidationCache.LabelValidationCache(max_entries)
+
+        # Optional recording of each cycle's inputs.
+        self._cycleRecorder = cycle_recorder
+        cycle_recording_file = os.getenv("CYCLE_RECORDING_FILE", "").strip().strip("\"")
+        if self._cycleRecorder is None and cycle_recording_file:
+            self._cycleRecorder = CycleRecorder.CycleRecorder(cycle_recording_file)
+            self._messagePlatformHandler.handle_verbose_info(f"DockerServiceScaler: Recording cycle inputs to <EMPHASIZE_STRING_START_TAG>{cycle_recording_file}</EMPHASIZE_STRING_END_TAG>")
+        if self._cycleRecorder is not None:
+            self._prometheusConnector.set_cycle_recorder(self._cycleRecorder)
+            if self._scaleExecutor.get_cluster_capacity() is not None:
+                self._scaleExecutor.get_cluster_capacity().set_cycle_recorder(self._cycleRecorder)
+
+        # Optional tracing of each cycle's steps.
+        trace_file = os.getenv("TRACE_FILE", "").strip().strip("\"")
+        if trace_file and not SpanTracing.is_enabled():
+            SpanTracing.set_exporter(SpanTracing.ChromeTraceExporter(trace_file))
+            self._messagePlatformHandler.handle_verbose_info(f"DockerServiceScaler: Writing trace spans to <EMPHASIZE_STRING_START_TAG>{trace_file}</EMPHASIZE_STRING_END_TAG>")
+
+    def _create_scale_executor(self):
+        """
+        Create the scale executor configured by the environment.
 
-            # Add additional recipients for the service.
-            self._messagePlatformHandler.add_additional_recipients(autoscale_service)
+        Returns:
+            ScaleExecutor.
+        """
+        max_workers = 1
+        scale_concurrency = os.getenv("SCALE_CONCURRENCY", "").strip().strip("\"")
+        if scale_concurrency:
+            try:
+                max_workers = int(scale_concurrency)
+                if max_workers < 1:
+                    raise ValueError("Must be at least 1.")
+            except ValueError as e:
+                max_workers = 1
+                self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>SCALE_CONCURRENCY</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{scale_concurrency}</EMPHASIZE_STRING_END_TAG>: {e} Defaulting to <EMPHASIZE_STRING_START_TAG>{max_workers}</EMPHASIZE_STRING_END_TAG>.")
+
+        max_new_tasks_per_cycle = None
+        scale_max_new_tasks_per_cycle = os.getenv("SCALE_MAX_NEW_TASKS_PER_CYCLE", "").strip().strip("\"")
+        if scale_max_new_tasks_per_cycle:
+            try:
+                max_new_tasks_per_cycle = int(scale_max_new_tasks_per_cycle)
+                if max_new_tasks_per_cycle < 1:
+                    raise ValueError("Must be at least 1.")
+            except ValueError as e:
+                max_new_tasks_per_cycle = None
+                self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>SCALE_MAX_NEW_TASKS_PER_CYCLE</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{scale_max_new_tasks_per_cycle}</EMPHASIZE_STRING_END_TAG>: {e} Not limiting new tasks.")
+
+        cluster_capacity = None
+        if os.getenv("CLUSTER_CAPACITY_CHECK", "").strip().strip("\"").lower() == "true":
+            refresh_interval_seconds = 0
+            cluster_capacity_refresh_interval = os.getenv("CLUSTER_CAPACITY_REFRESH_INTERVAL", "").strip().strip("\"")
+            if cluster_capacity_refresh_interval:
+                try:
+                    refresh_interval_seconds = converterUtils.time_duration_to_seconds(cluster_capacity_refresh_interval)
+                except ValueError as e:
+                    self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>CLUSTER_CAPACITY_REFRESH_INTERVAL</EMPHASIZE_STRING_END_TAG>: Invalid value: <EMPHASIZE_STRING_START_TAG>{cluster_capacity_refresh_interval}</EMPHASIZE_STRING_END_TAG>: {e} Refreshing every cycle.")
+            cluster_capacity = ClusterCapacity.ClusterCapacity(self.client, refresh_interval_seconds, self._clock)
+
+        preemption = os.getenv("SCALE_PREEMPTION", "").strip().strip("\"").lower() == "true"
+        if preemption and cluster_capacity is None:
+            preemption = False
+            self._messagePlatformHandler.handle_warning(f"Environment Variable <EMPHASIZE_STRING_START_TAG>SCALE_PREEMPTION</EMPHASIZE_STRING_END_TAG> requires <EMPHASIZE_STRING_START_TAG>CLUSTER_CAPACITY_CHECK</EMPHASIZE_STRING_END_TAG>, not preempting.")
+
+        return ScaleExecutor.ScaleExecutor(max_workers, max_new_tasks_per_cycle, cluster_capacity, preemption)
+
+
+    def set_service_filter(self, service_filter):
+        """
+        Only evaluate services whose name service_filter returns True for, None evaluates all.
+        """
+        self._serviceFilter = service_filter
 
-            # Get individual metric's suggestions.
-            cpu_scale_metrics = self._get_cpu_scale_metrics(autoscale_service)
-            memory_scale_metrics = self._get_memory_scale_metrics(autoscale_service)
-            allScalingMetrics=[cpu_scale_metrics, memory_scale_metrics]
 
-            # Get final scaling suggestion based on conflict resolution settings.
-            scaling_suggestion=self._get_final_scale_suggestion(autoscale_service, cpu_scale_metrics.get_scaling_suggestion(), memory_scale_metrics.get_scaling_suggestion())
-            
-            # Rescale service based on scaling suggestion.
-            self._handle_scaling_suggestion(autoscale_service, scaling_suggestion, allScalingMetrics)
+    def set_execution_check(self, execution_check):
+        """
+        Only apply the scalings decided within a cycle if execution_check returns True right before, e.g. the leader lease was renewed.
+        None applies them unconditionally.
+        """
+        self._executionCheck = execution_check
 
-        # Send all accumulated messages.
-        self._messagePlatformHandler.send_all_accumulated_messages()
 
+    def auto_scale_services(self):
+        """
+        Look for services with autoscale enabled and then scale based on prometheus metrics.
+        """
+        cycle_start = time.perf_counter()
+        self._cycle_timestamp = self._clock()
+
+        # Decisions of a previous cycle that failed before its execution are based on outdated metrics.
+        discarded_count = self._scaleExecutor.discard_pending()
+        if discarded_count:
+            self._messagePlatformHandler.handle_warning(f"Discarded <EMPHASIZE_STRING_START_TAG>{discarded_count}</EMPHASIZE_STRING_END_TAG> scale operations of the previous cycle, which failed before applying them.")
+
+        # Start recording.
+        if self._cycleRecorder is not None:
+            self._cycleRecorder.start_cycle(self._cycle_timestamp)
+
+        with SpanTracing.span("auto_scale_services", category="cycle"):
+
+            # Loop through all autoscale services.
+            with AutoscalerMetrics.PHASE_DURATION.time(phase="discovery"), SpanTracing.span("get_autoscale_services", category="discovery"):
+                autoscale_services = self._get_autoscale_services()
+
+            # Classify all services at once, only services near or past a threshold are evaluated in detail.
+            comfortable_service_names = set()
+            if self._fast_path_margin is not None:
+                with AutoscalerMetrics.PHASE_DURATION.time(phase="metric_fetch"), SpanTracing.span("classify_services", category="metrics", services=len(autoscale_services)):
+                    comfortable_service_names = self._get_comfortable_service_names(autoscale_services)
+
+            for autoscale_service in autoscale_services:
+                with SpanTracing.span("service", category="cycle", service=autoscale_service.get_service_name()):
+
+                    # Add additional recipients for the service.
+                    self._messagePlatformHandler.add_additional_recipients(autoscale_service)
+
+                    # Scaled to zero, only the demand decides about waking it up.
+                    if autoscale_service.is_scale_to_zero_enabled() and autoscale_service.get_desired_tasks() == 0:
+                        with AutoscalerMetrics.PHASE_DURATION.time(phase="scaling"):
+                            self._handle_scaled_to_zero(autoscale_service)
+                        continue
+
+                    # Metrics do not reflect the replicas yet, while tasks of the last update start or warm up.
+                    if self._is_settling(autoscale_service):
+                        continue
+
+                    # Comfortably inside all thresholds, keeps its replicas.
+                    if autoscale_service.get_service_name() in comfortable_service_names:
+                        self._keep_comfortable_service(autoscale_service)
+                        continue
+
+                    # Get individual metric's suggestions.
+                    with AutoscalerMetrics.PHASE_DURATION.time(phase="metric_fetch"):
+                        cpu_scale_metrics = self._get_cpu_scale_metrics(autoscale_service)
+                        memory_scale_metrics = self._get_memory_scale_metrics(autoscale_service)
+                    allScalingMetrics=[cpu_scale_metrics, memory_scale_metrics]
+
+                    # Get final scaling suggestion based on conflict resolution settings.
+                    with AutoscalerMetrics.PHASE_DURATION.time(phase="decision"):
+                        scaling_suggestion=self._get_final_scale_suggestion(autoscale_service, allScalingMetrics)
+
+                    # Decide replicas based on scaling suggestion.
+                    with AutoscalerMetrics.PHASE_DURATION.time(phase="scaling"):
+                        self._handle_scaling_suggestion(autoscale_service, scaling_suggestion, allScalingMetrics)
+
+            # Later cycles need fresh metrics.
+            if self._fast_path_margin is not None:
+                self._prometheusConnector.clear_prefetched_task_metrics()
+
+            # Rescale all services together, unless e.g. the leadership was lost while deciding.
+            if self._executionCheck is not None and not self._executionCheck():
+                discarded_count = self._scaleExecutor.discard_pending()
+                if discarded_count:
+                    self._messagePlatformHandler.handle_warning(f"Discarded <EMPHASIZE_STRING_START_TAG>{discarded_count}</EMPHASIZE_STRING_END_TAG> scale operations, this replica may no longer scale.")
+            with AutoscalerMetrics.PHASE_DURATION.time(phase="scale_execution"), SpanTracing.span("execute_scale_operations", category="scaling", operations=self._scaleExecutor.get_pending_count()):
+                self._execute_scale_operations()
+
+            # Finish recording.
+            if self._cycleRecorder is not None:
+                recording_error = self._cycleRecorder.finish_cycle()
+                if recording_error:
+                    self._messagePlatformHandler.handle_warning(recording_error)
+
+            # Send all accumulated messages.
+            with AutoscalerMetrics.PHASE_DURATION.time(phase="messaging"), SpanTracing.span("send_all_accumulated_messages", category="messaging"):
+                self._messagePlatformHandler.send_all_accumulated_messages()
+
+        AutoscalerMetrics.CYCLE_DURATION.observe(time.perf_counter() - cycle_start)
+
+        # Export the spans of this cycle.
+        tracing_error = SpanTracing.flush()
+        if tracing_error:
+            self._messagePlatformHandler.handle_warning(tracing_error)
+
+
+    def warm_up(self):
+        """
+        Keep a standby replica ready to take over without scaling or messaging anything.
 
-    def _scale_service(self, autoscale_service, replicas, scaling_metrics=[]):
+        Primes the docker and prometheus connections and validates all autoscale labels.
         """
-        Scale the specified service to the given number of replicas.
+        with SpanTracing.span("warm_up", category="cycle"):
+            with AutoscalerMetrics.DOCKER_API_DURATION.time(call="services.list"):
+                services = self.client.services.list()
+            for service in services:
+                serviceLabelHandler = DockerServiceAutoscalerLabelHandler.DockerServiceAutoscalerLabelHandler(service, self._labelValidationCache)
+                if serviceLabelHandler.is_autoscale_service():
+                    serviceLabelHandler.get_autoscale_service()
+            self._prometheusConnector.get_all_services()
+        SpanTracing.flush()
+
+
+    def _scale_service(self, autoscale_service, service, current_replicas, replicas, scaling_metrics=[]):
+        """
+        Scale the specified service to the given number of replicas, if its spec did not change since it was read.
 
         Parameters:
             autoscale_service (AutoScaleService): An AutoScaleService object.
+            service (docker.models.services.Service): The service as read before deciding, docker rejects the update if its version is outdated.
+            current_replicas (int): The replicas of the read spec.
             replicas (int): The desired number of replicas for the service.
+
+        Returns:
+            bool: True if the spec changed since it was read (update out of sequence), so the decision has to be re-evaluated.
         """
         try:
-            # Get the service.
-            service = self.client.services.get(autoscale_service.get_service_name())
-            
-            # Update the service with the new number of replicas.
-            success_scaling = service.scale(replicas)
+            # Update the service with the new number of replicas, based on the read spec version.
+            with AutoscalerMetrics.DOCKER_API_DURATION.time(call="service.scale"), SpanTracing.span("docker.scale_service", category="docker", service=autoscale_service.get_service_name(), replicas=replicas):
+                success_scaling = service.scale(replicas)
 
             # Evaluate sclaing success and return state of scaling attempt.    
             if success_scaling:
+                if self._cycleRecorder is not None:
+                    self._cycleRecorder.record_scaling(autoscale_service.get_service_name(), replicas)
+                AutoscalerMetrics.SCALE_EVENTS.inc(service=autoscale_service.get_service_name(), direction="up" if replicas > current_replicas else "down")
+                AutoscalerMetrics.SERVICE_REPLICAS.set(replicas, service=autoscale_service.get_service_name())
                 successMsg = f"Successfully scaled service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> to <EMPHASIZE_STRING_START_TAG>{replicas}</EMPHASIZE_STRING_END_TAG> replicas."
                 self._messagePlatformHandler.handle_important_info(successMsg, autoscale_service, scaling_metrics)
             else:
@@ -88,26 +347,35 @@ class DockerServiceScaler:
             self._messagePlatformHandler.handle_error(errorMsg, autoscale_service)
         # Other error.
         except docker.errors.APIError as e:
+            # Spec changed since reading it, e.g. by a deploy.
+            if DockerApiUtils.is_update_out_of_sequence(e):
+                return True
             # Print, log and return error message.
             errorMsg=f"Error occurred while scaling service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
             self._messagePlatformHandler.handle_error(errorMsg, autoscale_service)
+        return False
 
 
-    def _get_current_replicas(self, service_name):
+    def _get_current_service(self, service_name):
         """
-        Retrieve the current number of replicas for the specified service.
+        Retrieve the specified service and its current number of replicas.
 
         Parameters:
             service_name (str): The name of the service to query.
 
-        Returns: Amount of replicas.
+        Returns:
+            tuple: (docker.models.services.Service, amount of replicas). The service carries the read spec version for scaling.
         """
         # Get the service.
-        service = self.client.services.get(service_name)
+        with AutoscalerMetrics.DOCKER_API_DURATION.time(call="services.get"), SpanTracing.span("docker.get_current_replicas", category="docker", service=service_name):
+            service = self.client.services.get(service_name)
         
         # Access the replicas attribute of the service.
-        current_replicas = service.attrs['Spec']['Mode']['Replicated']['Replicas']
-        return int(current_replicas)
+        current_replicas = int(service.attrs['Spec']['Mode']['Replicated']['Replicas'])
+        AutoscalerMetrics.SERVICE_REPLICAS.set(current_replicas, service=service_name)
+        if self._cycleRecorder is not None:
+            self._cycleRecorder.record_replicas(service_name, current_replicas)
+        return service, current_replicas
 
 
 
@@ -121,12 +389,19 @@ class DockerServiceScaler:
         """
         autoscale_services = []
         try:
-            services = self.client.services.list()
+            with AutoscalerMetrics.DOCKER_API_DURATION.time(call="services.list"), SpanTracing.span("docker.services.list", category="docker"):
+                services = self.client.services.list(status=True)
             for service in services:
 
+                # Evaluated by another replica?
+                if self._serviceFilter is not None and not self._serviceFilter(service.attrs["Spec"]["Name"]):
+                    continue
+
                 # Check if the label "autoscale" is set to "true"
-                serviceLabelHandler = DockerServiceAutoscalerLabelHandler.DockerServiceAutoscalerLabelHandler(service)
+                serviceLabelHandler = DockerServiceAutoscalerLabelHandler.DockerServiceAutoscalerLabelHandler(service, self._labelValidationCache)
                 if serviceLabelHandler.is_autoscale_service():
+                    if self._cycleRecorder is not None:
+                        self._cycleRecorder.record_service(service)
                     isValidAutoscaleService, autoScaleServiceOrErrorMsgArray, verficationWarnings = serviceLabelHandler.get_autoscale_service()
                     if isValidAutoscaleService:
                         autoscale_services.append(autoScaleServiceOrErrorMsgArray)
@@ -158,6 +433,120 @@ class DockerServiceScaler:
             return autoscale_services
 
 
+    def _get_comfortable_service_names(self, autoscale_services):
+        """
+        Prefetch the metrics of all services and classify them against their thresholds in one pass.
+
+        A service is comfortable if all its enabled metrics are at least FAST_PATH_MARGIN inside their thresholds
+        and its replicas are within its min and max replicas. It keeps its replicas without a detailed evaluation,
+        so neither further queries nor docker calls are needed for it. Services scaling to zero or offered for preemption
+        always need the detailed evaluation.
+
+        Returns:
+            set: Names of the comfortable services.
+        """
+        # All metrics at once, services near a threshold reuse them in the detailed evaluation.
+        cpu_time_durations = set()
+        for autoscale_service in autoscale_services:
+            if autoscale_service.is_scaling_based_on_cpu_enabled():
+                cpu_time_durations.add(autoscale_service.get_cpu_upscale_time_duration())
+                cpu_time_durations.add(autoscale_service.get_cpu_downscale_time_duration())
+        try:
+            self._prometheusConnector.prefetch_task_metrics(cpu_time_durations)
+        except Exception as e:
+            self._messagePlatformHandler.handle_warning(f"DockerServiceScaler: Could not prefetch the metrics of all services, evaluating all services in detail: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+            return set()
+
+        # Candidates with known replicas within their bounds.
+        candidates = []
+        for autoscale_service in autoscale_services:
+            replicas = autoscale_service.get_desired_tasks()
+            if replicas is None or autoscale_service.is_scale_to_zero_enabled() or self._scaleExecutor.is_preemption_enabled():
+                continue
+            min_replicas, max_replicas, active_entries = self._get_replica_bounds(autoscale_service)
+            if min_replicas <= replicas <= max_replicas:
+                candidates.append(autoscale_service)
+
+        # One column per metric value and threshold.
+        cpu_services = [autoscale_service for autoscale_service in candidates if autoscale_service.is_scaling_based_on_cpu_enabled()]
+        cpu_flags = ThresholdClassifier.get_comfortable_flags(
+            [MetricAggregationUtils.aggregate_task_values(self._prometheusConnector.get_cpu_task_metrics(autoscale_service.get_service_name(), autoscale_service.get_cpu_upscale_time_duration()), autoscale_service.get_cpu_aggregation()) for autoscale_service in cpu_services],
+            [autoscale_service.get_cpu_upscale_threshold() for autoscale_service in cpu_services],
+            [MetricAggregationUtils.aggregate_task_values(self._prometheusConnector.get_cpu_task_metrics(autoscale_service.get_service_name(), autoscale_service.get_cpu_downscale_time_duration()), autoscale_service.get_cpu_aggregation()) for autoscale_service in cpu_services],
+            [autoscale_service.get_cpu_downscale_threshold() for autoscale_service in cpu_services],
+            self._fast_path_margin
+        )
+        memory_services = [autoscale_service for autoscale_service in candidates if autoscale_service.is_scaling_based_on_memory_enabled()]
+        memory_values = [
+            MetricAggregationUtils.aggregate_task_values(self._prometheusConnector.get_memory_task_metrics(autoscale_service.get_service_name(), autoscale_service.get_memory_reference_bytes() if autoscale_service.is_memory_threshold_relative() else None), autoscale_service.get_memory_aggregation())
+            for autoscale_service in memory_services
+        ]
+        memory_flags = ThresholdClassifier.get_comfortable_flags(
+            memory_values,
+            [autoscale_service.get_memory_upscale_threshold() for autoscale_service in memory_services],
+            memory_values,
+            [autoscale_service.get_memory_downscale_threshold() for autoscale_service in memory_services],
+            self._fast_path_margin
+        )
+
+        # Comfortable if no enabled metric is near or past a threshold.
+        uncomfortable_service_names = {autoscale_service.get_service_name() for autoscale_service, is_comfortable in zip(cpu_services, cpu_flags) if not is_comfortable}
+        uncomfortable_service_names.update(autoscale_service.get_service_name() for autoscale_service, is_comfortable in zip(memory_services, memory_flags) if not is_comfortable)
+        comfortable_service_names = {autoscale_service.get_service_name() for autoscale_service in candidates} - uncomfortable_service_names
+        AutoscalerMetrics.FAST_PATH_SERVICES.set(len(comfortable_service_names))
+        return comfortable_service_names
+
+
+    def _keep_comfortable_service(self, autoscale_service):
+        """
+        Keeps the replicas of a service the pre-pass found comfortably inside its thresholds.
+        """
+        current_amount_replicas = autoscale_service.get_desired_tasks()
+        AutoscalerMetrics.SERVICE_REPLICAS.set(current_amount_replicas, service=autoscale_service.get_service_name())
+        AutoscalerMetrics.SERVICE_TARGET_REPLICAS.set(current_amount_replicas, service=autoscale_service.get_service_name())
+        verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> All metrics at least <EMPHASIZE_STRING_START_TAG>{converterUtils.float_to_percentage(self._fast_path_margin * 100)}</EMPHASIZE_STRING_END_TAG> inside their thresholds, skipping detailed evaluation"
+        self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+        keeping_replica_msg = f"Keeping replicas of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> at <EMPHASIZE_STRING_START_TAG>{current_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
+        self._messagePlatformHandler.handle_information(keeping_replica_msg, autoscale_service)
+
+
+    def _is_settling(self, autoscale_service):
+        """
+        Check if the service was updated recently (e.g. scaled) and its tasks are still starting or warming up.
+
+        Evaluating it then would react to metrics of the old amount of tasks, or of tasks still starting,
+        and scale again in the same or even the opposite direction.
+
+        Returns:
+            bool: True if the service should not be evaluated in this cycle.
+        """
+        updated_at_seconds = autoscale_service.get_updated_at_seconds()
+        if updated_at_seconds is None:
+            return False
+        seconds_since_update = self._cycle_timestamp - updated_at_seconds
+
+        # All tasks of the current spec running?
+        running_tasks = autoscale_service.get_running_tasks()
+        desired_tasks = autoscale_service.get_desired_tasks()
+        if running_tasks is not None and desired_tasks is not None and running_tasks < desired_tasks:
+            if seconds_since_update < self._MAX_CONVERGENCE_WAIT_SECONDS:
+                AutoscalerMetrics.SETTLING_SKIPS.inc(service=autoscale_service.get_service_name(), reason="converging")
+                skippingMsg = f"Not evaluating service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> while it converges: <EMPHASIZE_STRING_START_TAG>{running_tasks}</EMPHASIZE_STRING_END_TAG> of <EMPHASIZE_STRING_START_TAG>{desired_tasks}</EMPHASIZE_STRING_END_TAG> tasks running, updated <EMPHASIZE_STRING_START_TAG>{int(seconds_since_update)}s</EMPHASIZE_STRING_END_TAG> ago"
+                self._messagePlatformHandler.handle_information(skippingMsg, autoscale_service)
+                return True
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Only <EMPHASIZE_STRING_START_TAG>{running_tasks}</EMPHASIZE_STRING_END_TAG> of <EMPHASIZE_STRING_START_TAG>{desired_tasks}</EMPHASIZE_STRING_END_TAG> tasks running <EMPHASIZE_STRING_START_TAG>{int(seconds_since_update)}s</EMPHASIZE_STRING_END_TAG> after the last update, evaluating anyway"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            return False
+
+        # New tasks warmed up?
+        if seconds_since_update < autoscale_service.get_scaling_warmup_seconds():
+            AutoscalerMetrics.SETTLING_SKIPS.inc(service=autoscale_service.get_service_name(), reason="warmup")
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Not evaluating while new tasks warm up: updated <EMPHASIZE_STRING_START_TAG>{int(seconds_since_update)}s</EMPHASIZE_STRING_END_TAG> ago, warm-up <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_scaling_warmup_seconds()}s</EMPHASIZE_STRING_END_TAG>"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            return True
+        return False
+
+
     def _get_cpu_scale_metrics(self, autoscale_service):
         """
         Gets the scaling suggestion based on cpu thresholds, settings and values.
@@ -176,7 +565,10 @@ class DockerServiceScaler:
         if autoscale_service.is_scaling_based_on_cpu_enabled():
 
             # CPU Upscale.
-            current_cpu_upscale_value=prometheusConnector.get_custom_cpu_metric(autoscale_service.get_service_name(), autoscale_service.get_cpu_upscale_time_duration())
+            cpu_upscale_task_values=self._prometheusConnector.get_cpu_task_metrics(autoscale_service.get_service_name(), autoscale_service.get_cpu_upscale_time_duration())
+            current_cpu_upscale_value=MetricAggregationUtils.aggregate_task_values(cpu_upscale_task_values, autoscale_service.get_cpu_aggregation())
+            cpu_task_metric_spread=MetricAggregationUtils.get_task_metric_spread(cpu_upscale_task_values)
+            self._log_task_metric_spread(autoscale_service, "cpu", autoscale_service.get_cpu_aggregation(), cpu_task_metric_spread, converterUtils.float_to_percentage)
             verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> current_cpu_upscale_value: <EMPHASIZE_STRING_START_TAG>{current_cpu_upscale_value}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.float_to_percentage(current_cpu_upscale_value)}</EMPHASIZE_STRING_END_TAG>), using time_duration:  <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_cpu_upscale_time_duration()}</EMPHASIZE_STRING_END_TAG>"
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
@@ -189,7 +581,8 @@ class DockerServiceScaler:
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
             # CPU Downscale.
-            current_cpu_downscale_value=prometheusConnector.get_custom_cpu_metric(autoscale_service.get_service_name(), autoscale_service.get_cpu_downscale_time_duration())
+            cpu_downscale_task_values=self._prometheusConnector.get_cpu_task_metrics(autoscale_service.get_service_name(), autoscale_service.get_cpu_downscale_time_duration())
+            current_cpu_downscale_value=MetricAggregationUtils.aggregate_task_values(cpu_downscale_task_values, autoscale_service.get_cpu_aggregation())
             verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> current_cpu_downscale_value: <EMPHASIZE_STRING_START_TAG>{current_cpu_downscale_value}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.float_to_percentage(current_cpu_downscale_value)}</EMPHASIZE_STRING_END_TAG>), using time_duration:  <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_cpu_downscale_time_duration()}</EMPHASIZE_STRING_END_TAG>"
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
@@ -197,7 +590,10 @@ class DockerServiceScaler:
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
             
             # Downscaling based on CPU?
-            if current_cpu_downscale_value < autoscale_service.get_cpu_downscale_threshold():
+            if current_cpu_downscale_value < autoscale_service.get_cpu_downscale_threshold() and self._is_any_task_saturated(autoscale_service, "cpu", cpu_task_metric_spread, autoscale_service.get_cpu_upscale_threshold()):
+                # Keep replicas, a single saturated task would only get hotter.
+                pass
+            elif current_cpu_downscale_value < autoscale_service.get_cpu_downscale_threshold():
 
                 if cpu_scale_suggestion == ScalingSuggestion.KEEP_REPLICAS:
                     cpu_scale_suggestion = ScalingSuggestion.SCALE_DOWN
@@ -206,14 +602,7 @@ class DockerServiceScaler:
                     self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
                 else:
                     # Conflict resolution.
-                    if scaling_conflict_resolution == ScalingConflictResolution.KEEP_REPLICAS:
-                        cpu_scale_suggestion = ScalingSuggestion.KEEP_REPLICAS
-                    elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_DOWN:
-                        cpu_scale_suggestion = ScalingSuggestion.SCALE_DOWN
-                    elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_UP:
-                        cpu_scale_suggestion = ScalingSuggestion.SCALE_UP
-                    else:
-                        cpu_scale_suggestion = ScalingSuggestion.KEEP_REPLICAS
+                    cpu_scale_suggestion = ScalingDecisionEngine.resolve_metric_conflict(scaling_conflict_resolution)
                     
                     # Conflict resolution verbse info.
                     verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> ScalingConflictResolution: <EMPHASIZE_STRING_START_TAG>{scaling_conflict_resolution}</EMPHASIZE_STRING_END_TAG>"
@@ -228,6 +617,8 @@ class DockerServiceScaler:
             cpuScalingMetrics.set_upscale_value(current_cpu_upscale_value)
             cpuScalingMetrics.set_downscale_threshold(autoscale_service.get_cpu_downscale_threshold())
             cpuScalingMetrics.set_downscale_value(current_cpu_downscale_value)
+            cpuScalingMetrics.set_aggregation(autoscale_service.get_cpu_aggregation())
+            cpuScalingMetrics.set_task_metric_spread(cpu_task_metric_spread)
             cpuScalingMetrics.set_conflict_resolution(scaling_conflict_resolution)
             cpuScalingMetrics.set_scaling_suggestion(cpu_scale_suggestion)
             
@@ -257,9 +648,22 @@ class DockerServiceScaler:
         # Is memory based scaling enabled?
         if autoscale_service.is_scaling_based_on_memory_enabled():
 
+            # Memory thresholds may be relative to the memory limit or reservation of the service.
+            if autoscale_service.is_memory_threshold_relative():
+                memory_reference_bytes = autoscale_service.get_memory_reference_bytes()
+                format_memory_value = converterUtils.float_to_percentage
+                verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> memory thresholds relative to memory {autoscale_service.get_memory_threshold_reference().value}: <EMPHASIZE_STRING_START_TAG>{memory_reference_bytes}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.bytes_to_human_readable_storage(memory_reference_bytes)}</EMPHASIZE_STRING_END_TAG>)"
+                self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            else:
+                memory_reference_bytes = None
+                format_memory_value = converterUtils.bytes_to_human_readable_storage
+
             # Get current value.
-            current_memory_value=prometheusConnector.get_custom_memory_metric(autoscale_service.get_service_name())
-            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> current_memory_value: <EMPHASIZE_STRING_START_TAG>{current_memory_value}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.bytes_to_human_readable_storage(current_memory_value)}</EMPHASIZE_STRING_END_TAG>)"
+            memory_task_values=self._prometheusConnector.get_memory_task_metrics(autoscale_service.get_service_name(), memory_reference_bytes)
+            current_memory_value=MetricAggregationUtils.aggregate_task_values(memory_task_values, autoscale_service.get_memory_aggregation())
+            memory_task_metric_spread=MetricAggregationUtils.get_task_metric_spread(memory_task_values)
+            self._log_task_metric_spread(autoscale_service, "memory", autoscale_service.get_memory_aggregation(), memory_task_metric_spread, format_memory_value)
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> current_memory_value: <EMPHASIZE_STRING_START_TAG>{current_memory_value}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{format_memory_value(current_memory_value)}</EMPHASIZE_STRING_END_TAG>)"
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
             # Upscaling based on Memory?
@@ -267,15 +671,18 @@ class DockerServiceScaler:
                 memory_scale_suggestion = ScalingSuggestion.SCALE_UP
 
             # Upscale suggestion verbose info.
-            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> memory upscale threshold: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_memory_upscale_threshold()}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.bytes_to_human_readable_storage(autoscale_service.get_memory_upscale_threshold())}</EMPHASIZE_STRING_END_TAG>), memory upscale suggestion: <EMPHASIZE_STRING_START_TAG>{memory_scale_suggestion}</EMPHASIZE_STRING_END_TAG>"
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> memory upscale threshold: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_memory_upscale_threshold()}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{format_memory_value(autoscale_service.get_memory_upscale_threshold())}</EMPHASIZE_STRING_END_TAG>), memory upscale suggestion: <EMPHASIZE_STRING_START_TAG>{memory_scale_suggestion}</EMPHASIZE_STRING_END_TAG>"
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
             # Downscale threshold verbose info.
-            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> memory downscale threshold: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_memory_downscale_threshold()}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{converterUtils.bytes_to_human_readable_storage(autoscale_service.get_memory_downscale_threshold())}</EMPHASIZE_STRING_END_TAG>)"
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> memory downscale threshold: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_memory_downscale_threshold()}</EMPHASIZE_STRING_END_TAG> (<EMPHASIZE_STRING_START_TAG>{format_memory_value(autoscale_service.get_memory_downscale_threshold())}</EMPHASIZE_STRING_END_TAG>)"
             self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
             
             # Downscaling based on Memory?
-            if current_memory_value < autoscale_service.get_memory_downscale_threshold():
+            if current_memory_value < autoscale_service.get_memory_downscale_threshold() and self._is_any_task_saturated(autoscale_service, "memory", memory_task_metric_spread, autoscale_service.get_memory_upscale_threshold()):
+                # Keep replicas, a single saturated task would only get hotter.
+                pass
+            elif current_memory_value < autoscale_service.get_memory_downscale_threshold():
                 if memory_scale_suggestion == ScalingSuggestion.KEEP_REPLICAS:
                     memory_scale_suggestion = ScalingSuggestion.SCALE_DOWN
 
@@ -284,14 +691,7 @@ class DockerServiceScaler:
                     self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
                 else:
                     # Conflict resolution.
-                    if scaling_conflict_resolution == ScalingConflictResolution.KEEP_REPLICAS:
-                        memory_scale_suggestion = ScalingSuggestion.KEEP_REPLICAS
-                    elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_DOWN:
-                        memory_scale_suggestion = ScalingSuggestion.SCALE_DOWN
-                    elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_UP:
-                        memory_scale_suggestion = ScalingSuggestion.SCALE_UP
-                    else:
-                        memory_scale_suggestion = ScalingSuggestion.KEEP_REPLICAS
+                    memory_scale_suggestion = ScalingDecisionEngine.resolve_metric_conflict(scaling_conflict_resolution)
                     
                     # Conflict resolution verbse info.
                     verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> ScalingConflictResolution: <EMPHASIZE_STRING_START_TAG>{scaling_conflict_resolution}</EMPHASIZE_STRING_END_TAG>"
@@ -306,6 +706,8 @@ class DockerServiceScaler:
             memoryScalingMetrics.set_upscale_value(current_memory_value)
             memoryScalingMetrics.set_downscale_threshold(autoscale_service.get_memory_downscale_threshold())
             memoryScalingMetrics.set_downscale_value(current_memory_value)
+            memoryScalingMetrics.set_aggregation(autoscale_service.get_memory_aggregation())
+            memoryScalingMetrics.set_task_metric_spread(memory_task_metric_spread)
             memoryScalingMetrics.set_conflict_resolution(scaling_conflict_resolution)
             memoryScalingMetrics.set_scaling_suggestion(memory_scale_suggestion)
         else:
@@ -318,10 +720,48 @@ class DockerServiceScaler:
     
 
     
-    def _get_final_scale_suggestion(self, autoscale_service, cpu_scale_suggestion, memory_scale_suggestion):
+    def _log_task_metric_spread(self, autoscale_service, metric_description, aggregation, task_metric_spread, format_value):
+        """
+        Log how a metric is spread across the tasks and nodes of a service as verbose info.
+
+        Args:
+            autoscale_service (AutoScaleService): An AutoScaleService object.
+            metric_description (str): Name of the metric for the log message.
+            aggregation (str): The aggregation used for the scaling decision.
+            task_metric_spread (TaskMetricSpread): The spread to log.
+            format_value (function): Converts a value into a human readable string.
+        """
+        verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> {metric_description} aggregation: <EMPHASIZE_STRING_START_TAG>{aggregation}</EMPHASIZE_STRING_END_TAG>, tasks: <EMPHASIZE_STRING_START_TAG>{task_metric_spread.get_task_count()}</EMPHASIZE_STRING_END_TAG>, min: <EMPHASIZE_STRING_START_TAG>{format_value(task_metric_spread.get_minimum())}</EMPHASIZE_STRING_END_TAG>, avg: <EMPHASIZE_STRING_START_TAG>{format_value(task_metric_spread.get_average())}</EMPHASIZE_STRING_END_TAG>, max: <EMPHASIZE_STRING_START_TAG>{format_value(task_metric_spread.get_maximum())}</EMPHASIZE_STRING_END_TAG>"
+        self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+
+        # Per node breakdown.
+        node_averages_string = ", ".join([f"{node_id}: {format_value(node_average)}" for node_id, node_average in task_metric_spread.get_node_averages().items()])
+        verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> {metric_description} per node averages: <EMPHASIZE_STRING_START_TAG>{node_averages_string}</EMPHASIZE_STRING_END_TAG>"
+        self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+
+
+    def _is_any_task_saturated(self, autoscale_service, metric_description, task_metric_spread, upscale_threshold):
+        """
+        Check if any single task exceeds the upscale threshold, which prevents downscaling based on a low aggregate.
+
+        Returns:
+            bool: True if at least one task is above the upscale threshold.
+        """
+        if task_metric_spread.get_maximum() > upscale_threshold:
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> {metric_description} downscale prevented: at least one task is above the upscale threshold"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            return True
+        return False
+
+
+    def _get_final_scale_suggestion(self, autoscale_service, scaling_metrics):
         """
         Gets the scaling suggestion based on ScalingConflictResolution settings and priorly retrieved individual metric's suggestions.
 
+        Args:
+            autoscale_service (AutoScaleService): An AutoScaleService object.
+            scaling_metrics (list of ScalingMetrics): The individual metric's suggestions.
+
         Returns:
             ScalingSuggestion.
         """
@@ -329,63 +769,21 @@ class DockerServiceScaler:
         scaling_conflict_resolution=autoscale_service.get_scaling_conflict_resolution()
 
         # Logging verbose information about final scaling suggestion.
-        verbose_info = f"Calculating final scaling suggestion for service: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>, CPU Suggestion: <EMPHASIZE_STRING_START_TAG>{cpu_scale_suggestion}</EMPHASIZE_STRING_END_TAG>, Memory Suggestion: <EMPHASIZE_STRING_START_TAG>{memory_scale_suggestion}</EMPHASIZE_STRING_END_TAG>, Conflict Resolution: <EMPHASIZE_STRING_START_TAG>{scaling_conflict_resolution}</EMPHASIZE_STRING_END_TAG>"
+        metric_suggestions_string = ", ".join([f"{scaling_metric.get_metric_name().value} Suggestion: <EMPHASIZE_STRING_START_TAG>{scaling_metric.get_scaling_suggestion() if scaling_metric.is_metric_based_scaling_enabled() else 'not enabled'}</EMPHASIZE_STRING_END_TAG>" for scaling_metric in scaling_metrics])
+        verbose_info = f"Calculating final scaling suggestion for service: <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>, {metric_suggestions_string}, Conflict Resolution: <EMPHASIZE_STRING_START_TAG>{scaling_conflict_resolution}</EMPHASIZE_STRING_END_TAG>"
         self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
 
-        # Memory and CPU enabled.
-        if autoscale_service.is_scaling_based_on_cpu_enabled() and autoscale_service.is_scaling_based_on_memory_enabled():
-
-            # Logging verbose information about final scaling suggestion.
-            verbose_info = f"Memory and cpu autoscaling enabled for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>"
-            self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
-
-            if cpu_scale_suggestion == memory_scale_suggestion:
-                scaling_suggestion = cpu_scale_suggestion
-
-                # Logging verbose information about final scaling suggestion.
-                verbose_info = f"All suggestions are the same for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: using <EMPHASIZE_STRING_START_TAG>{scaling_suggestion}</EMPHASIZE_STRING_END_TAG> as final suggestion"
-                self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
-            else:
-                # Conflict resolution.
-                if scaling_conflict_resolution == ScalingConflictResolution.KEEP_REPLICAS:
-                    scaling_suggestion = ScalingSuggestion.KEEP_REPLICAS
-                elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_DOWN:
-                    if cpu_scale_suggestion == ScalingSuggestion.SCALE_DOWN or cpu_scale_suggestion == ScalingSuggestion.SCALE_DOWN:
-                        scaling_suggestion = ScalingSuggestion.SCALE_DOWN
-                    else:
-                        scaling_suggestion = ScalingSuggestion.KEEP_REPLICAS
-                elif scaling_conflict_resolution == ScalingConflictResolution.SCALE_UP:
-                    if cpu_scale_suggestion == ScalingSuggestion.SCALE_UP or cpu_scale_suggestion == ScalingSuggestion.SCALE_UP:
-                        scaling_suggestion = ScalingSuggestion.SCALE_UP
-                    else:
-                        scaling_suggestion = ScalingSuggestion.KEEP_REPLICAS
-                elif scaling_conflict_resolution == ScalingConflictResolution.ADHERE_TO_MEMORY:
-                    scaling_suggestion = memory_scale_suggestion
-                elif scaling_conflict_resolution == ScalingConflictResolution.ADHERE_TO_CPU:
-                    scaling_suggestion = cpu_scale_suggestion
-                else:
-                    scaling_suggestion = ScalingSuggestion.KEEP_REPLICAS
+        # Combine suggestions.
+        scaling_suggestion = ScalingDecisionEngine.get_final_scaling_suggestion(
+            scaling_metrics,
+            scaling_conflict_resolution,
+            autoscale_service.get_scaling_metric_weights(),
+            autoscale_service.get_scaling_metric_priority()
+        )
 
-                    
-                # Logging verbose information about final scaling suggestion.
-                verbose_info = f"Result of conflict resolution for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: using <EMPHASIZE_STRING_START_TAG>{scaling_suggestion}</EMPHASIZE_STRING_END_TAG> as final suggestion"
-                self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
-
-        # Just CPU enabled.
-        elif autoscale_service.is_scaling_based_on_cpu_enabled() and not autoscale_service.is_scaling_based_on_memory_enabled():
-                scaling_suggestion = cpu_scale_suggestion
-                
-                # Logging verbose information about final scaling suggestion.
-                verbose_info = f"Only cpu autoscaling enabled for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>, Using cpu suggestion: <EMPHASIZE_STRING_START_TAG>{scaling_suggestion}</EMPHASIZE_STRING_END_TAG> as final suggestion"
-                self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
-                
-        # Just Memory enabled.
-        elif not autoscale_service.is_scaling_based_on_cpu_enabled() and autoscale_service.is_scaling_based_on_memory_enabled():
-                scaling_suggestion = memory_scale_suggestion
-                
-                # Logging verbose information about final scaling suggestion.
-                verbose_info = f"Only memory autoscaling enabled for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>, Using memory suggestion: <EMPHASIZE_STRING_START_TAG>{scaling_suggestion}</EMPHASIZE_STRING_END_TAG> as final suggestion"
-                self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
+        # Logging verbose information about final scaling suggestion.
+        verbose_info = f"Final scaling suggestion for <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{scaling_suggestion}</EMPHASIZE_STRING_END_TAG>"
+        self._messagePlatformHandler.handle_verbose_info(verbose_info, autoscale_service)
         
         # Return scaling suggestion.
         return scaling_suggestion
@@ -393,20 +791,137 @@ class DockerServiceScaler:
     
     def _handle_scaling_suggestion(self, autoscale_service, scaling_suggestion, scaling_metrics=[]):
         """
-        Scales the service based on the scaling suggestion.
+        Decides the replicas of the service based on the scaling suggestion and queues the scaling for the end of the cycle.
 
         Checks if within min and max replicas.
 
         """
         # Current amount of replicas already running.
-        current_amount_replicas = self._get_current_replicas(autoscale_service.get_service_name())
+        service, current_amount_replicas = self._get_current_service(autoscale_service.get_service_name())
         verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Before rescaling amount of replicas: <EMPHASIZE_STRING_START_TAG>{current_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
         self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
-        # Min and max amount of replicas.
-        min_replicas = autoscale_service.get_minimum_replicas()
-        max_replicas = autoscale_service.get_maximum_replicas()
+        new_amount_replicas = self._get_new_replicas(autoscale_service, scaling_suggestion, current_amount_replicas)
+        if autoscale_service.is_scale_to_zero_enabled() and new_amount_replicas == current_amount_replicas and self._is_idle(autoscale_service, scaling_suggestion, current_amount_replicas):
+            new_amount_replicas = 0
+        AutoscalerMetrics.SERVICE_TARGET_REPLICAS.set(new_amount_replicas, service=autoscale_service.get_service_name())
+
+        # Does amount of replicas have to be changed?
+        if new_amount_replicas != current_amount_replicas:
+            self._scaleExecutor.add(ScaleOperation.ScaleOperation(autoscale_service, service, current_amount_replicas, new_amount_replicas, scaling_suggestion, scaling_metrics))
+        else:
+            # Info about keeping replicas.
+            keeping_replica_msg = f"Keeping replicas of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> at <EMPHASIZE_STRING_START_TAG>{current_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
+            self._messagePlatformHandler.handle_information(keeping_replica_msg, autoscale_service)
+
+            # May give up tasks to higher priority services.
+            if self._scaleExecutor.is_preemption_enabled():
+                min_replicas, max_replicas, active_entries = self._get_replica_bounds(autoscale_service)
+                self._scaleExecutor.add_preemption_candidate(ScaleOperation.ScaleOperation(autoscale_service, service, current_amount_replicas, current_amount_replicas, ScalingSuggestion.KEEP_REPLICAS), min_replicas)
+
+
+    def _get_replica_bounds(self, autoscale_service):
+        """
+        Gets the min and max replicas, overridden by the replica schedule, evaluated in the configured TIMEZONE.
+
+        Returns:
+            tuple: (min replicas, max replicas, amount of active schedule entries).
+        """
+        if autoscale_service.get_replica_schedule():
+            local_datetime = datetime.fromtimestamp(self._cycle_timestamp, DateStringUtils.getTimezone())
+            return autoscale_service.get_scheduled_replica_bounds(local_datetime)
+        return autoscale_service.get_minimum_replicas(), autoscale_service.get_maximum_replicas(), 0
+
+
+    def _is_idle(self, autoscale_service, scaling_suggestion, current_amount_replicas):
+        """
+        Check if a service at its minimum replicas had no demand for its scale to zero idle time.
+
+        With a wake query, the demand is its highest value within the idle time. Without one, the service is idle
+        if its metrics suggest scaling down and the cpu of all its tasks stayed below the cpu downscale threshold
+        for the whole idle time. Either way it must not have been updated (e.g. woken up) within the idle time,
+        and no replica schedule entry may be active.
+
+        Returns:
+            bool: True if the service should be scaled to zero.
+        """
+        # At its minimum and not updated within the idle time?
+        idle_seconds = autoscale_service.get_scale_to_zero_after_seconds()
+        min_replicas, max_replicas, active_entries = self._get_replica_bounds(autoscale_service)
+        if current_amount_replicas != min_replicas or active_entries > 0 or scaling_suggestion == ScalingSuggestion.SCALE_UP:
+            return False
+        updated_at_seconds = autoscale_service.get_updated_at_seconds()
+        if updated_at_seconds is not None and self._cycle_timestamp - updated_at_seconds < idle_seconds:
+            return False
+
+        # Any demand within the idle time?
+        wake_query = autoscale_service.get_wake_query()
+        if wake_query is None and (scaling_suggestion != ScalingSuggestion.SCALE_DOWN or not autoscale_service.is_scaling_based_on_cpu_enabled()):
+            return False
+        try:
+            if wake_query is None:
+                # The current suggestion only covers the cpu downscale time duration, not the whole idle time.
+                highest_cpu = self._prometheusConnector.get_highest_task_cpu(autoscale_service.get_service_name(), autoscale_service.get_cpu_downscale_time_duration(), f"{idle_seconds}s")
+                is_idle = highest_cpu < autoscale_service.get_cpu_downscale_threshold()
+            else:
+                is_idle = self._prometheusConnector.get_demand(wake_query, f"{idle_seconds}s") <= 0
+        except Exception as e:
+            errorMsg = f"Could not query the demand of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>, not scaling it to zero: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+            self._messagePlatformHandler.handle_warning(errorMsg, autoscale_service)
+            return False
+        if is_idle:
+            idleMsg = f"Service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> had no demand for <EMPHASIZE_STRING_START_TAG>{idle_seconds}s</EMPHASIZE_STRING_END_TAG>, scaling it to zero"
+            self._messagePlatformHandler.handle_information(idleMsg, autoscale_service)
+        return is_idle
+
+
+    def _handle_scaled_to_zero(self, autoscale_service):
+        """
+        Wakes a service scaled to zero up to its minimum replicas, as soon as its wake query reports demand.
+
+        Without a wake query it stays at zero until it is scaled externally, e.g. by a webhook running docker service scale.
+        """
+        wake_query = autoscale_service.get_wake_query()
+        if wake_query is None:
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Scaled to zero without wake query, waiting to be scaled externally"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            return
+
+        # Any demand?
+        try:
+            demand = self._prometheusConnector.get_demand(wake_query)
+        except Exception as e:
+            errorMsg = f"Could not query the demand of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> scaled to zero: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+            self._messagePlatformHandler.handle_error(errorMsg, autoscale_service)
+            return
+        if demand <= 0:
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Scaled to zero, no demand"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+            return
+
+        # Wake up.
+        service, current_amount_replicas = self._get_current_service(autoscale_service.get_service_name())
+        min_replicas, max_replicas, active_entries = self._get_replica_bounds(autoscale_service)
+        if current_amount_replicas >= min_replicas:
+            return
+        wakingMsg = f"Waking service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> up to <EMPHASIZE_STRING_START_TAG>{min_replicas}</EMPHASIZE_STRING_END_TAG> replicas, demand: <EMPHASIZE_STRING_START_TAG>{demand}</EMPHASIZE_STRING_END_TAG>"
+        self._messagePlatformHandler.handle_information(wakingMsg, autoscale_service)
+        AutoscalerMetrics.SERVICE_TARGET_REPLICAS.set(min_replicas, service=autoscale_service.get_service_name())
+        self._scaleExecutor.add(ScaleOperation.ScaleOperation(autoscale_service, service, current_amount_replicas, min_replicas, ScalingSuggestion.SCALE_UP))
+
+
+    def _get_new_replicas(self, autoscale_service, scaling_suggestion, current_amount_replicas):
+        """
+        Gets the replicas based on the scaling suggestion within min and max replicas.
+
+        Returns:
+            int: New amount of replicas.
+        """
+        # Min and max amount of replicas, overridden by the replica schedule.
+        min_replicas, max_replicas, active_entries = self._get_replica_bounds(autoscale_service)
         verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Minimum replicas: <EMPHASIZE_STRING_START_TAG>{min_replicas}</EMPHASIZE_STRING_END_TAG>, Maximum replicas: <EMPHASIZE_STRING_START_TAG>{max_replicas}</EMPHASIZE_STRING_END_TAG>"
+        if autoscale_service.get_replica_schedule():
+            verboseInfo += f", Active replica schedule entries: <EMPHASIZE_STRING_START_TAG>{active_entries}</EMPHASIZE_STRING_END_TAG>"
         self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
 
         # Unchecked incrementation or decrementation of service.
@@ -425,11 +940,76 @@ class DockerServiceScaler:
             new_amount_replicas = max_replicas
         verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> New replicas after adhering to min and max replica thresholds: <EMPHASIZE_STRING_START_TAG>{new_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
         self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+        return new_amount_replicas
 
-        # Does amount of replicas have to be changed?
-        if new_amount_replicas != current_amount_replicas:
-            self._scale_service(autoscale_service, new_amount_replicas, scaling_metrics)
-        else:
-            # Info about keeping replicas.
-            keeping_replica_msg = f"Keeping replicas of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> at <EMPHASIZE_STRING_START_TAG>{current_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
-            self._messagePlatformHandler.handle_information(keeping_replica_msg, autoscale_service)
+
+    def _apply_scale_operation(self, scale_operation):
+        """
+        Applies a queued scaling, called by the ScaleExecutor, possibly from several threads.
+
+        Re-evaluates the decision with a fresh spec as long as the spec changes between reading and scaling.
+        """
+        autoscale_service = scale_operation.get_autoscale_service()
+        if scale_operation.get_preempted_for() is not None:
+            AutoscalerMetrics.PREEMPTED_TASKS.inc(scale_operation.get_current_replicas() - scale_operation.get_new_replicas(), service=autoscale_service.get_service_name())
+            preemptingMsg = f"Preempting <EMPHASIZE_STRING_START_TAG>{scale_operation.get_current_replicas() - scale_operation.get_new_replicas()}</EMPHASIZE_STRING_END_TAG> tasks of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> (priority <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_priority().value}</EMPHASIZE_STRING_END_TAG>) to free capacity for service <EMPHASIZE_STRING_START_TAG>{scale_operation.get_preempted_for().get_service_name()}</EMPHASIZE_STRING_END_TAG> (priority <EMPHASIZE_STRING_START_TAG>{scale_operation.get_preempted_for().get_priority().value}</EMPHASIZE_STRING_END_TAG>)"
+            self._messagePlatformHandler.handle_information(preemptingMsg, autoscale_service)
+        if scale_operation.get_limit_reason() is not None:
+            limitedMsg = f"Limiting scaling service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> to <EMPHASIZE_STRING_START_TAG>{scale_operation.get_new_replicas()}</EMPHASIZE_STRING_END_TAG> instead of <EMPHASIZE_STRING_START_TAG>{scale_operation.get_requested_replicas()}</EMPHASIZE_STRING_END_TAG> replicas: {self._get_limit_reason_description(scale_operation.get_limit_reason())}"
+            self._messagePlatformHandler.handle_information(limitedMsg, autoscale_service)
+        for attempt in range(1, self._MAX_SCALE_ATTEMPTS + 1):
+            is_conflict = self._scale_service(autoscale_service, scale_operation.get_service(), scale_operation.get_current_replicas(), scale_operation.get_new_replicas(), scale_operation.get_scaling_metrics())
+            if not is_conflict:
+                return
+            verboseInfo = f"<EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> Spec changed since reading the replicas, re-evaluating with a fresh spec (attempt <EMPHASIZE_STRING_START_TAG>{attempt}</EMPHASIZE_STRING_END_TAG> of <EMPHASIZE_STRING_START_TAG>{self._MAX_SCALE_ATTEMPTS}</EMPHASIZE_STRING_END_TAG>)"
+            self._messagePlatformHandler.handle_verbose_info(verboseInfo, autoscale_service)
+
+            # Re-evaluate, without creating more tasks than reserved in the budget of the cycle.
+            new_tasks_reserved = scale_operation.get_new_tasks()
+            service, current_amount_replicas = self._get_current_service(autoscale_service.get_service_name())
+            new_amount_replicas = min(self._get_new_replicas(autoscale_service, scale_operation.get_scaling_suggestion(), current_amount_replicas), current_amount_replicas + new_tasks_reserved)
+            scale_operation.set_observed_service(service, current_amount_replicas)
+            scale_operation.set_new_replicas(new_amount_replicas)
+            if new_amount_replicas == current_amount_replicas:
+                keeping_replica_msg = f"Keeping replicas of service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> at <EMPHASIZE_STRING_START_TAG>{current_amount_replicas}</EMPHASIZE_STRING_END_TAG>"
+                self._messagePlatformHandler.handle_information(keeping_replica_msg, autoscale_service)
+                return
+
+        # Spec kept changing.
+        errorMsg = f"Could not scale service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG>: Its spec changed concurrently in all <EMPHASIZE_STRING_START_TAG>{self._MAX_SCALE_ATTEMPTS}</EMPHASIZE_STRING_END_TAG> attempts."
+        self._messagePlatformHandler.handle_error(errorMsg, autoscale_service)
+
+
+    def _execute_scale_operations(self):
+        """
+        Applies all scalings decided within the cycle and reports the ones deferred by the budget of new tasks or the cluster capacity.
+        """
+        # Free capacity of the nodes, only needed for scale-ups.
+        cluster_capacity = self._scaleExecutor.get_cluster_capacity()
+        if cluster_capacity is not None and self._scaleExecutor.has_pending_scale_ups():
+            errorMsg = cluster_capacity.refresh()
+            if errorMsg:
+                self._messagePlatformHandler.handle_warning(errorMsg)
+
+        deferred_scale_operations = self._scaleExecutor.execute(self._apply_scale_operation)
+        for scale_operation in deferred_scale_operations:
+            autoscale_service = scale_operation.get_autoscale_service()
+            deferredMsg = f"Deferred scaling service <EMPHASIZE_STRING_START_TAG>{autoscale_service.get_service_name()}</EMPHASIZE_STRING_END_TAG> to <EMPHASIZE_STRING_START_TAG>{scale_operation.get_requested_replicas()}</EMPHASIZE_STRING_END_TAG> replicas: {self._get_limit_reason_description(scale_operation.get_limit_reason())} It is evaluated again next cycle."
+            self._messagePlatformHandler.handle_information(deferredMsg, autoscale_service)
+            AutoscalerMetrics.DEFERRED_SCALINGS.inc(service=autoscale_service.get_service_name(), reason=scale_operation.get_limit_reason().value)
+
+
+    def _get_limit_reason_description(self, limit_reason):
+        """
+        Describes why a scale-up was reduced or deferred.
+
+        Args:
+            limit_reason (ScaleLimitReason): The limit.
+
+        Returns:
+            str: Description for messages.
+        """
+        if limit_reason == ScaleLimitReason.CLUSTER_CAPACITY:
+            free_nano_cpus, free_memory_bytes = self._scaleExecutor.get_cluster_capacity().get_free_capacity()
+            return f"The nodes cannot place more tasks with its reservations (free in total: <EMPHASIZE_STRING_START_TAG>{free_nano_cpus / 1e9:.2f}</EMPHASIZE_STRING_END_TAG> cpus, <EMPHASIZE_STRING_START_TAG>{converterUtils.bytes_to_human_readable_storage(free_memory_bytes)}</EMPHASIZE_STRING_END_TAG>)."
+        return f"The budget of <EMPHASIZE_STRING_START_TAG>{self._scaleExecutor.get_max_new_tasks_per_cycle()}</EMPHASIZE_STRING_END_TAG> new tasks per cycle is used up."
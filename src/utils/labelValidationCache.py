@@ -0,0 +1,93 @@
+# Validation results of autoscale label sets, so unchanged and shared label sets are not verified again every cycle.
+
+# Fingerprint.
+import hashlib
+import json
+
+# Least recently used eviction.
+from collections import OrderedDict
+
+# Thread safety, the standby warm up and the cycle may validate concurrently.
+import threading
+
+
+class LabelValidationCache:
+    """
+    Least recently used cache of the verification result per autoscale label set.
+
+    Verification depends on the autoscale labels and the memory settings of the service spec, so services sharing
+    a label template from the same stack file and the same memory settings share one entry. Each entry also keeps
+    the label values converted by the AutoScaleService getters, shared by all AutoScaleService objects created from it.
+    """
+
+    def __init__(self, max_entries=1024):
+        """
+        Args:
+            max_entries (int): Label sets kept, the least recently used one is evicted beyond.
+        """
+        self._max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+
+    @staticmethod
+    def get_fingerprint(autoscale_labels, spec_inputs=None):
+        """
+        Get a hash identifying the label set and the verified spec inputs regardless of order.
+
+        Args:
+            autoscale_labels (dict): Autoscale labels of a service.
+            spec_inputs (dict|None): Parts of the service spec the verification depends on, e.g. the memory limit.
+
+        Returns:
+            str: Hex digest of the label set and spec inputs.
+        """
+        return hashlib.sha256(json.dumps([autoscale_labels, spec_inputs or {}], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+    def get(self, fingerprint):
+        """
+        Get the entry of a label set and mark it as recently used.
+
+        Returns:
+            dict|None: Entry with "autoscale_labels", "errors", "warnings" and "parsed_labels", None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint, None)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(fingerprint)
+            self._hits += 1
+            return entry
+
+
+    def put(self, fingerprint, autoscale_labels, errors, warnings):
+        """
+        Keep the verification result of a label set, evicting the least recently used beyond max_entries.
+
+        Returns:
+            dict: The new entry.
+        """
+        entry = {"autoscale_labels": autoscale_labels, "errors": errors, "warnings": warnings, "parsed_labels": {}}
+        with self._lock:
+            self._entries[fingerprint] = entry
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+
+    def get_size(self):
+        return len(self._entries)
+
+    def get_max_entries(self):
+        return self._max_entries
+
+    def get_hits(self):
+        return self._hits
+
+    def get_misses(self):
+        return self._misses
@@ -0,0 +1,122 @@
+# Leader election between autoscaler replicas via a lease in the labels of their own service.
+
+# Docker errors.
+import docker
+
+# Lease timestamps.
+import time
+
+# Conflicting updates.
+import dockerApiUtils as DockerApiUtils
+
+
+# Labels of the lease on the autoscaler's own service.
+LEADER_HOLDER_LABEL = "autoscaler.leader.holder"
+LEADER_RENEWED_AT_LABEL = "autoscaler.leader.renewed_at"
+
+
+class LeaderElector:
+    """
+    Lets exactly one of several autoscaler replicas scale services.
+
+    The lease (holder and last renewal) is stored in the labels of the autoscaler's own service.
+    Every update passes the spec version that was read, so docker rejects it with
+    "update out of sequence" if another replica updated the service in between (compare-and-swap).
+    Changing service labels does not restart any task.
+
+    Lease timestamps are wall clock times, so the clocks of the nodes should be synchronized
+    well below the lease duration.
+    """
+
+    def __init__(self, client, service_name, identity, lease_duration_seconds):
+        """
+        Args:
+            client (docker.DockerClient): Docker client.
+            service_name (str): Name of the autoscaler's own service.
+            identity (str): Unique identity of this replica, e.g. its hostname.
+            lease_duration_seconds (float): A lease not renewed within this time can be taken over.
+        """
+        self._client = client
+        self._service_name = service_name
+        self._identity = identity
+        self._lease_duration_seconds = lease_duration_seconds
+        self._is_leader = False
+
+
+    def get_identity(self):
+        return self._identity
+
+    def is_leader(self):
+        """
+        Whether the last acquire or renewal succeeded.
+        """
+        return self._is_leader
+
+
+    def try_acquire_or_renew(self):
+        """
+        Renew the lease if held, take it over if expired.
+
+        Returns:
+            tuple: (is_leader (bool), error message (str|None) if the lease could not be read or written).
+        """
+        try:
+            service = self._client.services.get(self._service_name)
+            labels = service.attrs.get("Spec", {}).get("Labels", {}) or {}
+            holder = labels.get(LEADER_HOLDER_LABEL, "")
+            renewed_at = self._get_renewed_at(labels)
+
+            # Held by another replica with a valid lease?
+            now = time.time()
+            if holder and holder != self._identity and now - renewed_at <= self._lease_duration_seconds:
+                self._is_leader = False
+                return self._is_leader, None
+
+            # Acquire or renew, only succeeds if nobody else changed the service since reading it.
+            self._write_lease(service, labels, self._identity, now)
+            self._is_leader = True
+            return self._is_leader, None
+
+        except docker.errors.APIError as e:
+            self._is_leader = False
+            if DockerApiUtils.is_update_out_of_sequence(e):
+                # Another replica was faster.
+                return self._is_leader, None
+            return self._is_leader, f"LeaderElector: Could not acquire lease on service <EMPHASIZE_STRING_START_TAG>{self._service_name}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+
+
+    def release(self):
+        """
+        Give up the lease, so another replica can take over right away, e.g. on shutdown.
+
+        Returns:
+            str|None: Error message if the lease could not be released.
+        """
+        if not self._is_leader:
+            return None
+        self._is_leader = False
+        try:
+            service = self._client.services.get(self._service_name)
+            labels = service.attrs.get("Spec", {}).get("Labels", {}) or {}
+            if labels.get(LEADER_HOLDER_LABEL, "") == self._identity:
+                self._write_lease(service, labels, "", 0)
+            return None
+        except docker.errors.APIError as e:
+            return f"LeaderElector: Could not release lease on service <EMPHASIZE_STRING_START_TAG>{self._service_name}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+
+
+    def _write_lease(self, service, labels, holder, renewed_at):
+        """
+        Write the lease labels with the observed spec version.
+        """
+        new_labels = dict(labels)
+        new_labels[LEADER_HOLDER_LABEL] = holder
+        new_labels[LEADER_RENEWED_AT_LABEL] = str(renewed_at)
+        self._client.api.update_service(service.id, service.version, labels=new_labels, fetch_current_spec=True)
+
+
+    def _get_renewed_at(self, labels):
+        try:
+            return float(labels.get(LEADER_RENEWED_AT_LABEL, 0))
+        except ValueError:
+            return 0.0
@@ -1,10 +1,5 @@
 # Sends emails.
 
-# Email specific imports.
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-
 # Get environment variables.
 import os
 
@@ -17,6 +12,12 @@ import converterUtils
 # MessagePlatformHandler.
 import messagePlatformHandler as MessagePlatformHandler
 
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
+# Tracing spans.
+import spanTracing as SpanTracing
+
 class EmailUtils:
 
     def __init__(self, messagePlatformHandler: MessagePlatformHandler, useDateStringUtils=True):
@@ -188,6 +189,8 @@ class EmailUtils:
         if service_name not in self._additional_recipients_important:
             self._additional_recipients_important[service_name] = []
         self._add_service_name(service_name)
+        if email_address in self._additional_recipients_important[service_name]:
+            return
         self._additional_recipients_important[service_name].append(email_address)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"EmailUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>important</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{email_address}</EMPHASIZE_STRING_END_TAG>")
@@ -204,6 +207,8 @@ class EmailUtils:
         if service_name not in self._additional_recipients_information:
             self._additional_recipients_information[service_name] = []
         self._add_service_name(service_name)
+        if email_address in self._additional_recipients_information[service_name]:
+            return
         self._additional_recipients_information[service_name].append(email_address)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"EmailUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>information</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{email_address}</EMPHASIZE_STRING_END_TAG>")
@@ -220,6 +225,8 @@ class EmailUtils:
         if service_name not in self._additional_recipients_verbose:
             self._additional_recipients_verbose[service_name] = []
         self._add_service_name(service_name)
+        if email_address in self._additional_recipients_verbose[service_name]:
+            return
         self._additional_recipients_verbose[service_name].append(email_address)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"EmailUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>verbose</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{email_address}</EMPHASIZE_STRING_END_TAG>")
@@ -353,6 +360,9 @@ class EmailUtils:
 
 
     def _test_smtp_login(self, sender):
+        # Email specific imports, only needed once email is enabled.
+        import smtplib
+
         try:
             if (sender["port"]) not in VALID_SMTP_PORTS: 
                 raise Exception("Port %s not one of %s" % (sender["port"], VALID_SMTP_PORTS))
@@ -376,6 +386,10 @@ class EmailUtils:
 
 
     def _send_email(self, sender, recipient_email, subject, message):
+        # Email specific imports, only needed once email is enabled.
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
 
         # Set up the MIME.
         msg = MIMEMultipart()
@@ -481,6 +495,13 @@ class EmailUtils:
         return recipients
     
 
+    def clear_accumulated_messages(self):
+        """
+        Forget all accumulated messages, e.g. after sending them.
+        """
+        self._messages_to_send = {}
+
+
     def send_all_accumulated_messages(self):
         """
         Send all accumulated messages via email to respective recipients.
@@ -610,8 +631,9 @@ class EmailUtils:
                 elif highest_message_level == MessageLevel.VERBOSE:
                     subject = subject.replace("Autoscaler info: ", "🔍 Autoscaler verbose info: ")
 
-                # Finally send the email.
-                self._send_email(self._sender, recipient_mail, subject, msg_to_send)
+                # Finally send the email, including connecting and login.
+                with AutoscalerMetrics.NOTIFICATION_SEND_DURATION.time(platform="email"), SpanTracing.span("email.send", category="messaging", recipient=recipient_mail):
+                    self._send_email(self._sender, recipient_mail, subject, msg_to_send)
 
         
 
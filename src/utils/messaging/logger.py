@@ -7,6 +7,9 @@ import dateStringUtils
 # MessagePlatformHandler.
 import messagePlatformHandler as MessagePlatformHandler
 
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
 
 class Logger:
 
@@ -34,7 +37,9 @@ class Logger:
             self.logtext_error = "UNKNOWN_ERROR"
             self.logtext_important = "UNKNOWN_IMPORTANT"
 
-        self.logPath = os.path.join("/code", "logs")
+        self.logPath = os.getenv("LOG_PATH", "").strip().strip("\"")
+        if not self.logPath:
+            self.logPath = os.path.join("/code", "logs")
         self.globalErrorLogFile = os.path.join(self.logPath, "errorlog.txt")
         self.globalImportantLogFile = os.path.join(self.logPath, "importantlog.txt")
         self.globalLogFile = os.path.join(self.logPath, "log.txt")
@@ -199,6 +204,8 @@ class Logger:
             # Log style printing?
             if self._log_style == "PRINT_ONLY" or self._log_style == "PRINT_AND_LOGFILE":
                 self._print_log_message(fullLogText)
+        else:
+            AutoscalerMetrics.SUPPRESSED_MESSAGES.inc(level="information")
 
     def verboseInfo(self, verboseInformationToLog, customLogLevel=None):
         """
@@ -225,6 +232,8 @@ class Logger:
             # Log style printing?
             if self._log_style == "PRINT_ONLY" or self._log_style == "PRINT_AND_LOGFILE":
                 self._print_log_message(fullLogText)
+        else:
+            AutoscalerMetrics.SUPPRESSED_MESSAGES.inc(level="verbose")
 
     def _determine_log_level(self, customLogLevel, sourceMethodForLogMsg):
         """
@@ -191,29 +191,43 @@ class MessagePlatformHandler:
 
         
 
+    def get_pending_message_count(self):
+        """
+        Get the amount of accumulated messages not sent via the message platforms yet.
+        """
+        return len(self._important_information_array) + len(self._error_array) + len(self._warning_array) + len(self._information_array) + len(self._verbose_information_array)
+
+
     def send_all_accumulated_messages(self):
         """
         Send all accumulated messages via all messaging platforms.
         """
+        # Take the messages of this cycle, messages handled while sending (e.g. its errors) are sent next cycle.
+        important_information_array, self._important_information_array = self._important_information_array, []
+        error_array, self._error_array = self._error_array, []
+        warning_array, self._warning_array = self._warning_array, []
+        information_array, self._information_array = self._information_array, []
+        verbose_information_array, self._verbose_information_array = self._verbose_information_array, []
+
         try:
             ### Handle accumulated messages ###
-            for important_information_dict in self._important_information_array: 
+            for important_information_dict in important_information_array: 
                 self._emailUtils.handle_important_info(important_information_dict["message"], important_information_dict["autoscale_service"], important_information_dict["scaling_metrics"])
                 self._telegramUtils.handle_important_info(important_information_dict["message"], important_information_dict["autoscale_service"], important_information_dict["scaling_metrics"])
             
-            for error_dict in self._error_array: 
+            for error_dict in error_array: 
                 self._emailUtils.handle_error(error_dict["message"], error_dict["autoscale_service"])
                 self._telegramUtils.handle_error(error_dict["message"], error_dict["autoscale_service"])
 
-            for warning_dict in self._warning_array: 
+            for warning_dict in warning_array: 
                 self._emailUtils.handle_warning(warning_dict["message"], warning_dict["autoscale_service"])
                 self._telegramUtils.handle_warning(warning_dict["message"], warning_dict["autoscale_service"])
 
-            for information_dict in self._information_array: 
+            for information_dict in information_array: 
                 self._emailUtils.handle_information(information_dict["message"], information_dict["autoscale_service"])
                 self._telegramUtils.handle_information(information_dict["message"], information_dict["autoscale_service"])
 
-            for verbose_information_dict in self._verbose_information_array: 
+            for verbose_information_dict in verbose_information_array: 
                 self._emailUtils.handle_verbose_info(verbose_information_dict["message"], verbose_information_dict["autoscale_service"])
                 self._telegramUtils.handle_verbose_info(verbose_information_dict["message"], verbose_information_dict["autoscale_service"])
 
@@ -224,6 +238,11 @@ class MessagePlatformHandler:
         except Exception as e:
             self.handle_error(f"MessagePlatformHandler.send_all_accumulated_messages(): Was not able to send messages via message platforms: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
             pass # In case the instantiation of the message platforms themself causes errors.
+
+        finally:
+            # Forget the messages handed to the platforms, the next cycle only sends its own.
+            self._emailUtils.clear_accumulated_messages()
+            self._telegramUtils.clear_accumulated_messages()
         
         
         
\ No newline at end of file
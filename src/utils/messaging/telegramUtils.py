@@ -3,9 +3,6 @@
 # Get environment variables.
 import os
 
-# Telegram bots.
-import telebot
-
 # Definitions.
 from valid_values import MessagingPlatforms, LogLevel, MessageLevel
 
@@ -15,6 +12,12 @@ import converterUtils
 # MessagePlatformHandler.
 import messagePlatformHandler as MessagePlatformHandler
 
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
+# Tracing spans.
+import spanTracing as SpanTracing
+
 class TelegramUtils:
 
     def __init__(self, messagePlatformHandler: MessagePlatformHandler, useDateStringUtils=True):
@@ -89,6 +92,8 @@ class TelegramUtils:
 
             # Initiate telegram bot from bot token.
             try:
+                # Telegram bots, only imported once telegram is enabled.
+                import telebot
                 self._sender_telegram_bot = telebot.TeleBot(self._sender_telegram_bot_token, parse_mode="HTML")
             except Exception as e:
                 warning_messages.append(f"TelegramUtils: Unable to initiate telegram bot. Disabling Telegram status messages. Error: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
@@ -154,6 +159,8 @@ class TelegramUtils:
         if service_name not in self._additional_recipients_important:
             self._additional_recipients_important[service_name] = []
         self._add_service_name(service_name)
+        if telegram_chat_id in self._additional_recipients_important[service_name]:
+            return
         self._additional_recipients_important[service_name].append(telegram_chat_id)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"TelegramUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>important</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{telegram_chat_id}</EMPHASIZE_STRING_END_TAG>")
@@ -170,6 +177,8 @@ class TelegramUtils:
         if service_name not in self._additional_recipients_information:
             self._additional_recipients_information[service_name] = []
         self._add_service_name(service_name)
+        if telegram_chat_id in self._additional_recipients_information[service_name]:
+            return
         self._additional_recipients_information[service_name].append(telegram_chat_id)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"TelegramUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>information</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{telegram_chat_id}</EMPHASIZE_STRING_END_TAG>")
@@ -186,6 +195,8 @@ class TelegramUtils:
         if service_name not in self._additional_recipients_verbose:
             self._additional_recipients_verbose[service_name] = []
         self._add_service_name(service_name)
+        if telegram_chat_id in self._additional_recipients_verbose[service_name]:
+            return
         self._additional_recipients_verbose[service_name].append(telegram_chat_id)
         # Log verbose info about recipient.
         self._messagePlatformHandler.handle_verbose_info(f"TelegramUtils: Service <EMPHASIZE_STRING_START_TAG>{service_name}</EMPHASIZE_STRING_END_TAG>: Additional <EMPHASIZE_STRING_START_TAG>verbose</EMPHASIZE_STRING_END_TAG> recipient: <EMPHASIZE_STRING_START_TAG>{telegram_chat_id}</EMPHASIZE_STRING_END_TAG>")
@@ -342,14 +353,16 @@ class TelegramUtils:
             individualMessagesToSend = self.splitLongTextIntoWorkingMessages(message)
             for individualMessageToSend in individualMessagesToSend:
                 try:
-                    self._sender_telegram_bot.send_message(recipient_telegram, individualMessageToSend)
+                    with AutoscalerMetrics.NOTIFICATION_SEND_DURATION.time(platform="telegram"), SpanTracing.span("telegram.send", category="messaging", recipient=recipient_telegram):
+                        self._sender_telegram_bot.send_message(recipient_telegram, individualMessageToSend)
                 except Exception as e:
                     self._messagePlatformHandler.handle_error(f"TelegramUtils: Could not send telegram message <EMPHASIZE_STRING_START_TAG>{individualMessageToSend}</EMPHASIZE_STRING_END_TAG> to recipient <EMPHASIZE_STRING_START_TAG>{recipient_telegram}</EMPHASIZE_STRING_END_TAG>. Error message: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
 
         else:
             # Message does not have to be split.
             try:
-                self._sender_telegram_bot.send_message(recipient_telegram, message)
+                with AutoscalerMetrics.NOTIFICATION_SEND_DURATION.time(platform="telegram"), SpanTracing.span("telegram.send", category="messaging", recipient=recipient_telegram):
+                    self._sender_telegram_bot.send_message(recipient_telegram, message)
             except Exception as e:
                 self._messagePlatformHandler.handle_error(f"TelegramUtils: Could not send telegram message <EMPHASIZE_STRING_START_TAG>{message}</EMPHASIZE_STRING_END_TAG> to recipient <EMPHASIZE_STRING_START_TAG>{recipient_telegram}</EMPHASIZE_STRING_END_TAG>. Error message: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
 
@@ -412,6 +425,13 @@ class TelegramUtils:
                         
         return recipients
     
+    def clear_accumulated_messages(self):
+        """
+        Forget all accumulated messages, e.g. after sending them.
+        """
+        self._messages_to_send = {}
+
+
     def send_all_accumulated_messages(self):
         """
         Send all accumulated messages via telegram to respective recipients.
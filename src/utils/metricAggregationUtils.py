@@ -0,0 +1,98 @@
+# Aggregation of per task metric values into the single value scaling decisions are based on.
+#
+# Task values are tuples of (task_name, node_id, value) as returned by the PrometheusConnector.
+
+# String verification.
+import re
+
+# Spread model.
+import taskMetricSpread as TaskMetricSpread
+
+# Definitions.
+from valid_values import MetricAggregation
+
+# Percentile aggregations like "p90".
+_PERCENTILE_REGEX = re.compile(r'^p([1-9]\d?)$')
+
+
+def is_aggregation_valid(aggregation):
+    """
+    Check if the given aggregation is one of avg, max, node_max or a percentile p1 - p99.
+    """
+    return aggregation in _AGGREGATION_VALUES or _PERCENTILE_REGEX.match(str(aggregation)) is not None
+
+
+def aggregate_task_values(task_values, aggregation=MetricAggregation.AVG.value):
+    """
+    Aggregate per task values into a single value.
+
+    Args:
+        task_values (list): Tuples of (task_name, node_id, value).
+        aggregation (str): avg, max, node_max (highest per node mean) or a percentile like p90.
+
+    Returns:
+        float: The aggregated value, 0.0 if no task reported a value.
+    """
+    if not task_values:
+        return 0.0
+
+    if aggregation == MetricAggregation.MAX.value:
+        return max([task_value[2] for task_value in task_values])
+
+    if aggregation == MetricAggregation.NODE_MAX.value:
+        return max(get_node_averages(task_values).values())
+
+    percentile_match = _PERCENTILE_REGEX.match(str(aggregation))
+    if percentile_match:
+        return _get_percentile(sorted([task_value[2] for task_value in task_values]), int(percentile_match.group(1)))
+
+    # Average.
+    return sum([task_value[2] for task_value in task_values]) / len(task_values)
+
+
+def get_node_averages(task_values):
+    """
+    Get the mean value of the tasks running on each node.
+
+    Returns:
+        dict: Node id -> mean value.
+    """
+    node_sums = {}
+    node_counts = {}
+    for task_name, node_id, value in task_values:
+        node_sums[node_id] = node_sums.get(node_id, 0.0) + value
+        node_counts[node_id] = node_counts.get(node_id, 0) + 1
+    return {node_id: node_sums[node_id] / node_counts[node_id] for node_id in node_sums}
+
+
+def get_task_metric_spread(task_values):
+    """
+    Get the spread of the values across tasks and nodes.
+
+    Returns:
+        TaskMetricSpread.
+    """
+    if not task_values:
+        return TaskMetricSpread.TaskMetricSpread()
+    values = [task_value[2] for task_value in task_values]
+    return TaskMetricSpread.TaskMetricSpread(
+        task_count=len(values),
+        minimum=min(values),
+        average=sum(values) / len(values),
+        maximum=max(values),
+        node_averages=get_node_averages(task_values)
+    )
+
+
+def _get_percentile(sorted_values, percentile):
+    """
+    Linear interpolated percentile of already sorted values.
+    """
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower_index = int(position)
+    upper_index = min(lower_index + 1, len(sorted_values) - 1)
+    fraction = position - lower_index
+    return sorted_values[lower_index] + (sorted_values[upper_index] - sorted_values[lower_index]) * fraction
+
+
+_AGGREGATION_VALUES = [item.value for item in MetricAggregation]
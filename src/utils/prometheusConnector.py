@@ -1,17 +1,64 @@
-from prometheus_api_client import PrometheusConnect
+# Get environment variables.
+import os
+
+# Prometheus HTTP api.
+import prometheusHttpClient as PrometheusHttpClient
+
+# Metrics about the autoscaler itself.
+import autoscalerMetrics as AutoscalerMetrics
+
+# Tracing spans.
+import spanTracing as SpanTracing
 
 class PrometheusConnector:
-    def __init__(self):
-        _prometheus_url = "http://prometheus:9090"
-        self._prometheusClient = PrometheusConnect(url=_prometheus_url)
-        self._customizable_cpu_query = "avg(rate(container_cpu_usage_seconds_total{{container_label_com_docker_swarm_service_name='{}', container_label_com_docker_swarm_task_name=~'.+'}}[{}])) * 100"
-        self._customizable_memory_query="avg(container_memory_usage_bytes{{container_label_com_docker_swarm_service_name='{}', container_label_com_docker_swarm_task_name=~'.+'}})"
+    def __init__(self, prometheus_client=None):
+        """
+        Args:
+            prometheus_client (PrometheusHttpClient|None): Client offering custom_query(query=...), e.g. a recorded one for replays.
+        """
+        _prometheus_url = os.getenv("PROMETHEUS_URL", "").strip().strip("\"")
+        if not _prometheus_url:
+            _prometheus_url = "http://prometheus:9090"
+        self._prometheusClient = prometheus_client if prometheus_client is not None else PrometheusHttpClient.PrometheusHttpClient(_prometheus_url)
+        self._cycleRecorder = None
+        # Per task queries, aggregation across tasks happens in metricAggregationUtils.
+        self._customizable_cpu_query = "sum by (container_label_com_docker_swarm_task_name, container_label_com_docker_swarm_node_id) (rate(container_cpu_usage_seconds_total{{container_label_com_docker_swarm_service_name='{}', container_label_com_docker_swarm_task_name=~'.+'}}[{}])) * 100"
+        self._customizable_memory_query="sum by (container_label_com_docker_swarm_task_name, container_label_com_docker_swarm_node_id) (container_memory_usage_bytes{{container_label_com_docker_swarm_service_name='{}', container_label_com_docker_swarm_task_name=~'.+'}})"
+        self._customizable_relative_memory_query="{} / {} * 100"
         self._cpuQuery30Seconds="avg(rate(container_cpu_usage_seconds_total{container_label_com_docker_swarm_task_name=~'.+'}[30s]))BY(container_label_com_docker_swarm_service_name)*100"
+        # Per task queries of all services at once.
+        self._customizable_all_services_cpu_query = "sum by (container_label_com_docker_swarm_service_name, container_label_com_docker_swarm_task_name, container_label_com_docker_swarm_node_id) (rate(container_cpu_usage_seconds_total{{container_label_com_docker_swarm_task_name=~'.+'}}[{}])) * 100"
+        self._all_services_memory_query = "sum by (container_label_com_docker_swarm_service_name, container_label_com_docker_swarm_task_name, container_label_com_docker_swarm_node_id) (container_memory_usage_bytes{container_label_com_docker_swarm_task_name=~'.+'})"
+        # Prefetched task values: time_duration -> service name -> task values, service name -> task values.
+        self._prefetched_cpu_task_values = None
+        self._prefetched_memory_task_values = None
+
+    def set_cycle_recorder(self, cycle_recorder):
+        """
+        Record all raw query results with the given CycleRecorder (None disables recording).
+        """
+        self._cycleRecorder = cycle_recorder
+
+
+    def _custom_query(self, query):
+        """
+        Execute a prometheus query and record its raw result, if recording is enabled.
+        """
+        try:
+            with AutoscalerMetrics.PROMETHEUS_QUERY_DURATION.time(), SpanTracing.span("prometheus.query", category="prometheus", query=query):
+                result = self._prometheusClient.custom_query(query=query)
+        except Exception:
+            AutoscalerMetrics.PROMETHEUS_QUERY_FAILURES.inc()
+            raise
+        if self._cycleRecorder is not None:
+            self._cycleRecorder.record_prometheus_query(query, result)
+        return result
+
 
     def get_all_services(self):
 
         # Execute prometheus query.
-        result = self._prometheusClient.custom_query(query=self._cpuQuery30Seconds)
+        result = self._custom_query(self._cpuQuery30Seconds)
 
         # Return services.
         services = []
@@ -20,23 +67,140 @@ class PrometheusConnector:
         return services
 
 
-    def get_custom_cpu_metric(self, service_name, time_duration):
+    def prefetch_task_metrics(self, cpu_time_durations):
+        """
+        Fetch the per task cpu and memory usage of all services at once, instead of querying each service.
+
+        Until clear_prefetched_task_metrics, get_cpu_task_metrics and get_memory_task_metrics serve prefetched values.
+
+        Args:
+            cpu_time_durations (iterable): Prometheus time durations the cpu rates are needed for, one query each.
+        """
+        prefetched_cpu_task_values = {}
+        for time_duration in sorted(set(cpu_time_durations)):
+            result = self._custom_query(self._customizable_all_services_cpu_query.format(time_duration))
+            prefetched_cpu_task_values[time_duration] = self._get_task_values_per_service(result)
+        result = self._custom_query(self._all_services_memory_query)
+        self._prefetched_memory_task_values = self._get_task_values_per_service(result)
+        self._prefetched_cpu_task_values = prefetched_cpu_task_values
+
+
+    def clear_prefetched_task_metrics(self):
+        """
+        Query each service again, e.g. at the end of a cycle.
+        """
+        self._prefetched_cpu_task_values = None
+        self._prefetched_memory_task_values = None
+
+
+    def get_cpu_task_metrics(self, service_name, time_duration):
+        """
+        Get the cpu usage of each task of the service in one query.
+
+        Args:
+            service_name (str): Name of the service.
+            time_duration (str): Prometheus time duration to compute the rate over.
+
+        Returns:
+            list: Tuples of (task_name, node_id, cpu percentage).
+        """
+        # Prefetched?
+        if self._prefetched_cpu_task_values is not None and time_duration in self._prefetched_cpu_task_values:
+            return list(self._prefetched_cpu_task_values[time_duration].get(service_name, []))
 
         # Execute prometheus query.
         customized_cpu_query = self._customizable_cpu_query.format(service_name, time_duration)
-        result = self._prometheusClient.custom_query(query=customized_cpu_query)
-        
-        # Return cpu value.
-        return float(result[0]['value'][1]) if result[0]['value'][1] else 0.0
+        result = self._custom_query(customized_cpu_query)
+
+        # Return cpu values per task.
+        return self._get_task_values(result)
+
 
+    def get_memory_task_metrics(self, service_name, reference_bytes=None):
+        """
+        Get the memory usage of each task of the service in one query.
 
-    def get_custom_memory_metric(self, service_name):
+        Args:
+            service_name (str): Name of the service.
+            reference_bytes (int|None): If set, the usage is returned as percentage of these bytes, computed by prometheus.
+
+        Returns:
+            list: Tuples of (task_name, node_id, bytes or percentage of reference_bytes).
+        """
+        # Prefetched?
+        if self._prefetched_memory_task_values is not None:
+            task_values = self._prefetched_memory_task_values.get(service_name, [])
+            if reference_bytes:
+                return [(task_name, node_id, value / int(reference_bytes) * 100) for task_name, node_id, value in task_values]
+            return list(task_values)
 
         # Execute prometheus query.
         customized_memory_query = self._customizable_memory_query.format(service_name)
-        result = self._prometheusClient.custom_query(query=customized_memory_query)
+        if reference_bytes:
+            customized_memory_query = self._customizable_relative_memory_query.format(customized_memory_query, int(reference_bytes))
+        result = self._custom_query(customized_memory_query)
+
+        # Return memory values per task.
+        return self._get_task_values(result)
+
+
+    def get_demand(self, query, time_duration=None):
+        """
+        Get the highest value of a demand query, e.g. the request rate of a service.
+
+        Args:
+            query (str): Prometheus query, usually returning one series.
+            time_duration (str|None): If set, the highest value within this prometheus time duration, computed by a subquery.
+
+        Returns:
+            float: Highest value of all series, 0 if the query returns no series.
+        """
+        # Execute prometheus query.
+        if time_duration:
+            query = f"max_over_time(({query})[{time_duration}:])"
+        result = self._custom_query(query)
+
+        # Highest value.
+        values = [float(item['value'][1]) for item in result if item['value'][1]]
+        return max(values) if values else 0.0
 
-        # Return memory value.
-        return float(result[0]['value'][1]) if result[0]['value'][1] else 0.0
 
-    
\ No newline at end of file
+    def get_highest_task_cpu(self, service_name, time_duration, idle_time_duration):
+        """
+        Get the highest cpu usage of any task of the service within idle_time_duration.
+
+        Args:
+            service_name (str): Name of the service.
+            time_duration (str): Prometheus time duration to compute the rate over.
+            idle_time_duration (str): Prometheus time duration to look back, computed by a subquery.
+
+        Returns:
+            float: Highest cpu percentage, 0 if the service had no tasks.
+        """
+        return self.get_demand(self._customizable_cpu_query.format(service_name, time_duration), idle_time_duration)
+
+
+    def _get_task_values_per_service(self, result):
+        """
+        Convert a per task query result of all services to a dict of service name -> tuples of (task_name, node_id, value).
+        """
+        task_values_per_service = {}
+        for item in result:
+            service_name = item['metric'].get('container_label_com_docker_swarm_service_name', "")
+            task_values_per_service.setdefault(service_name, []).extend(self._get_task_values([item]))
+        return task_values_per_service
+
+
+    def _get_task_values(self, result):
+        """
+        Convert a per task query result to tuples of (task_name, node_id, value).
+        """
+        task_values = []
+        for item in result:
+            value = item['value'][1]
+            task_values.append((
+                item['metric'].get('container_label_com_docker_swarm_task_name', ""),
+                item['metric'].get('container_label_com_docker_swarm_node_id', ""),
+                float(value) if value else 0.0
+            ))
+        return task_values
@@ -0,0 +1,175 @@
+# Minimal client of the prometheus HTTP api, offering the custom_query the PrometheusConnector uses.
+
+# Connections.
+import base64
+import http.client
+import threading
+from urllib.parse import urlsplit, urlencode, unquote
+
+# Responses.
+import json
+
+
+class PrometheusQueryError(Exception):
+    """
+    Raised if prometheus cannot be reached or answers a query with an error.
+    """
+
+
+class PrometheusHttpClient:
+    """
+    Queries the instant and range query endpoints of prometheus over pooled keep-alive connections.
+
+    Results have the shape of the prometheus api's data.result (list of dicts with "metric" and "value" or "values"),
+    like prometheus_api_client's PrometheusConnect, so recorded cycles and replays stay compatible.
+    Queries longer than post_threshold_bytes are sent as form encoded POST, since batched queries of many services
+    can exceed the url length limits of prometheus or proxies in front of it.
+    """
+
+    def __init__(self, url, timeout_seconds=30, max_idle_connections=4, post_threshold_bytes=2048):
+        """
+        Args:
+            url (str): Base url of prometheus, e.g. http://prometheus:9090, may contain user:password@ for basic auth and a path prefix.
+            timeout_seconds (float): Timeout of connecting and of each read.
+            max_idle_connections (int): Idle keep-alive connections kept for reuse.
+            post_threshold_bytes (int): Encoded query length from which POST is used instead of GET.
+        """
+        url_parts = urlsplit(url)
+        if url_parts.scheme not in ("http", "https") or not url_parts.hostname:
+            raise ValueError(f"Invalid prometheus url <EMPHASIZE_STRING_START_TAG>{url}</EMPHASIZE_STRING_END_TAG>, must be like http://prometheus:9090")
+        self._connection_class = http.client.HTTPSConnection if url_parts.scheme == "https" else http.client.HTTPConnection
+        self._host = url_parts.hostname
+        self._port = url_parts.port
+        self._path_prefix = url_parts.path.rstrip("/")
+        self._headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        if url_parts.username is not None:
+            credentials = f"{unquote(url_parts.username)}:{unquote(url_parts.password or '')}"
+            self._headers["Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        self._timeout_seconds = timeout_seconds
+        self._max_idle_connections = max(0, max_idle_connections)
+        self._post_threshold_bytes = post_threshold_bytes
+        self._idle_connections = []
+        self._lock = threading.Lock()
+
+
+    def custom_query(self, query, params=None):
+        """
+        Evaluate an instant query.
+
+        Args:
+            query (str): PromQL query.
+            params (dict|None): Additional parameters, e.g. {"time": ...}.
+
+        Returns:
+            list: data.result of the response.
+        """
+        return self._query("/api/v1/query", dict(params or {}, query=query))
+
+
+    def custom_query_range(self, query, start_time, end_time, step, params=None):
+        """
+        Evaluate a range query.
+
+        Args:
+            query (str): PromQL query.
+            start_time (datetime|float): Start, as datetime or seconds since the epoch.
+            end_time (datetime|float): End, as datetime or seconds since the epoch.
+            step (str): Resolution, e.g. "30s".
+            params (dict|None): Additional parameters.
+
+        Returns:
+            list: data.result of the response, series with "values".
+        """
+        return self._query("/api/v1/query_range", dict(
+            params or {},
+            query=query,
+            start=start_time.timestamp() if hasattr(start_time, "timestamp") else start_time,
+            end=end_time.timestamp() if hasattr(end_time, "timestamp") else end_time,
+            step=step
+        ))
+
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            idle_connections, self._idle_connections = self._idle_connections, []
+        for connection in idle_connections:
+            connection.close()
+
+
+    def _query(self, endpoint, parameters):
+        """
+        Send a query as GET or POST and return data.result of the response.
+        """
+        encoded_parameters = urlencode(parameters)
+        if len(encoded_parameters) >= self._post_threshold_bytes:
+            method, path, body = "POST", self._path_prefix + endpoint, encoded_parameters.encode("utf-8")
+            headers = dict(self._headers, **{"Content-Type": "application/x-www-form-urlencoded"})
+        else:
+            method, path, body = "GET", f"{self._path_prefix}{endpoint}?{encoded_parameters}", None
+            headers = self._headers
+
+        status, response = self._request(method, path, body, headers)
+        if status != 200 or response.get("status") != "success":
+            raise PrometheusQueryError(f"Prometheus query failed with HTTP status <EMPHASIZE_STRING_START_TAG>{status}</EMPHASIZE_STRING_END_TAG>: {response.get('errorType', '')} {response.get('error', '')}".strip())
+        return response.get("data", {}).get("result", [])
+
+
+    def _request(self, method, path, body, headers):
+        """
+        Send a request over a pooled connection, retrying once on a fresh connection if a reused one was closed meanwhile.
+
+        Returns:
+            tuple: (HTTP status, parsed json body).
+        """
+        for attempt in range(2):
+            connection, is_reused = self._get_connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                http_response = connection.getresponse()
+                # Parsed straight from the response stream, reading it completely so the connection can be reused.
+                try:
+                    response = json.load(http_response)
+                except ValueError:
+                    response = {}
+                http_response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                connection.close()
+                if is_reused and attempt == 0:
+                    continue
+                raise PrometheusQueryError(f"Prometheus closed the connection: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise PrometheusQueryError(f"Could not query prometheus at <EMPHASIZE_STRING_START_TAG>{self._host}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>")
+
+            if http_response.will_close:
+                connection.close()
+            else:
+                self._release_connection(connection)
+            return http_response.status, response
+
+
+    def _get_connection(self):
+        """
+        Get an idle connection or open a new one.
+
+        Returns:
+            tuple: (connection, whether it was used before).
+        """
+        with self._lock:
+            if self._idle_connections:
+                return self._idle_connections.pop(), True
+        return self._connection_class(self._host, self._port, timeout=self._timeout_seconds), False
+
+
+    def _release_connection(self, connection):
+        """
+        Keep a connection for reuse, or close it if enough are idle.
+        """
+        with self._lock:
+            if len(self._idle_connections) < self._max_idle_connections:
+                self._idle_connections.append(connection)
+                return
+        connection.close()
@@ -0,0 +1,197 @@
+# Applies the scalings decided within a cycle together, instead of one by one while evaluating the services.
+
+# Bounded parallelism.
+from concurrent.futures import ThreadPoolExecutor
+
+# Definitions.
+from valid_values import ScaleLimitReason
+
+
+class ScaleExecutor:
+    """
+    Collects the scale operations of a cycle and applies them at its end.
+
+    Scale-ups are applied before scale-downs, scale-ups of higher priority services first, otherwise in the order they were decided.
+    The tasks all scale-ups of a cycle create are limited to max_new_tasks_per_cycle and, with a cluster
+    capacity, to the tasks the nodes can place. A scale-up exceeding a limit is reduced to it, or deferred
+    if nothing is left. Since the services are evaluated again in the next cycle, deferred ones are not queued, just reported.
+    This keeps a traffic spike across many services from flooding the swarm managers with tasks to schedule,
+    and from creating tasks that stay pending.
+
+    With preemption, a scale-up the nodes have no room for scales down lower priority services, which keep their replicas
+    in this cycle, down to their minimum replicas, lowest priority first. Those scale-downs are applied before all other scalings.
+    """
+
+    def __init__(self, max_workers=1, max_new_tasks_per_cycle=None, cluster_capacity=None, preemption=False):
+        """
+        Args:
+            max_workers (int): Scale operations applied in parallel, 1 applies them one by one.
+            max_new_tasks_per_cycle (int|None): Maximum tasks created by all scale-ups of a cycle, None for no limit.
+            cluster_capacity (ClusterCapacity|None): Free reservations of the nodes, refreshed by the caller, None to not check.
+            preemption (bool): Free capacity for scale-ups by scaling down lower priority services, requires a cluster capacity.
+        """
+        self._max_workers = max(1, max_workers)
+        self._max_new_tasks_per_cycle = max_new_tasks_per_cycle
+        self._cluster_capacity = cluster_capacity
+        self._preemption = preemption and cluster_capacity is not None
+        self._scale_operations = []
+        self._preemption_candidates = []
+
+
+    def get_max_workers(self):
+        return self._max_workers
+
+    def get_max_new_tasks_per_cycle(self):
+        return self._max_new_tasks_per_cycle
+
+    def get_cluster_capacity(self):
+        return self._cluster_capacity
+
+    def is_preemption_enabled(self):
+        return self._preemption
+
+
+    def add(self, scale_operation):
+        """
+        Queue a scale operation until execute.
+
+        Args:
+            scale_operation (ScaleOperation): The decided scaling.
+        """
+        self._scale_operations.append(scale_operation)
+
+
+    def add_preemption_candidate(self, scale_operation, minimum_replicas):
+        """
+        Offer a service keeping its replicas in this cycle for preemption, ignored without preemption.
+
+        Args:
+            scale_operation (ScaleOperation): The service with equal current and new replicas.
+            minimum_replicas (int): Replicas it is never scaled below.
+        """
+        if self._preemption:
+            self._preemption_candidates.append((scale_operation, minimum_replicas))
+
+
+    def discard_pending(self):
+        """
+        Drop all queued scale operations and preemption candidates, e.g. the ones of a cycle that failed before execute.
+
+        Returns:
+            int: Scale operations dropped.
+        """
+        discarded_count = len(self._scale_operations)
+        self._scale_operations = []
+        self._preemption_candidates = []
+        return discarded_count
+
+
+    def get_pending_count(self):
+        return len(self._scale_operations)
+
+    def has_pending_scale_ups(self):
+        return any(scale_operation.is_scale_up() for scale_operation in self._scale_operations)
+
+
+    def execute(self, apply_scale_operation):
+        """
+        Apply all queued scale operations within the budget and cluster capacity.
+
+        Args:
+            apply_scale_operation (callable): Applies one ScaleOperation, called from up to max_workers threads.
+
+        Returns:
+            list: ScaleOperations deferred, their limit reason tells why.
+        """
+        scale_operations, self._scale_operations = self._scale_operations, []
+        preemption_candidates, self._preemption_candidates = self._preemption_candidates, []
+
+        # Scale-ups first, higher priorities first, otherwise keep the order of decisions.
+        scale_operations.sort(key=lambda scale_operation: (0, -scale_operation.get_autoscale_service().get_priority().get_rank()) if scale_operation.is_scale_up() else (1, 0))
+
+        # Budget of new tasks and cluster capacity.
+        accepted_scale_operations = []
+        deferred_scale_operations = []
+        remaining_new_tasks = self._max_new_tasks_per_cycle
+        for scale_operation in scale_operations:
+            if scale_operation.is_scale_up():
+                allowed_new_tasks = scale_operation.get_new_tasks()
+                limit_reason = None
+                if remaining_new_tasks is not None and allowed_new_tasks > remaining_new_tasks:
+                    allowed_new_tasks = max(0, remaining_new_tasks)
+                    limit_reason = ScaleLimitReason.TASK_BUDGET
+                if self._cluster_capacity is not None and allowed_new_tasks > 0:
+                    autoscale_service = scale_operation.get_autoscale_service()
+                    placeable_tasks = self._cluster_capacity.reserve(autoscale_service.get_reserved_nano_cpus(), autoscale_service.get_reserved_memory_bytes(), allowed_new_tasks)
+                    if self._preemption and placeable_tasks < allowed_new_tasks:
+                        placeable_tasks += self._preempt(autoscale_service, allowed_new_tasks - placeable_tasks, preemption_candidates)
+                    if placeable_tasks < allowed_new_tasks:
+                        allowed_new_tasks = placeable_tasks
+                        limit_reason = ScaleLimitReason.CLUSTER_CAPACITY
+                if limit_reason is not None:
+                    scale_operation.limit_new_replicas(scale_operation.get_current_replicas() + allowed_new_tasks, limit_reason)
+                if remaining_new_tasks is not None:
+                    remaining_new_tasks -= allowed_new_tasks
+                if allowed_new_tasks == 0:
+                    deferred_scale_operations.append(scale_operation)
+                    continue
+            accepted_scale_operations.append(scale_operation)
+
+        # Apply, preemptions first to free the capacity.
+        self._apply_all([scale_operation for scale_operation, minimum_replicas in preemption_candidates if scale_operation.is_scaling()], apply_scale_operation)
+        self._apply_all(accepted_scale_operations, apply_scale_operation)
+
+        return deferred_scale_operations
+
+
+    def _preempt(self, autoscale_service, missing_tasks, preemption_candidates):
+        """
+        Scale down lower priority candidates one task at a time until the missing tasks fit.
+
+        Only candidates whose tasks reserve at least as much as a task of the service are preempted,
+        so every removed task makes room for a new one on its node.
+
+        Returns:
+            int: Amount of missing tasks placed.
+        """
+        nano_cpus = autoscale_service.get_reserved_nano_cpus()
+        memory_bytes = autoscale_service.get_reserved_memory_bytes()
+        priority_rank = autoscale_service.get_priority().get_rank()
+        victims = [
+            (scale_operation, minimum_replicas) for scale_operation, minimum_replicas in preemption_candidates
+            if scale_operation.get_autoscale_service().get_priority().get_rank() < priority_rank
+            and scale_operation.get_autoscale_service().get_reserved_nano_cpus() >= nano_cpus
+            and scale_operation.get_autoscale_service().get_reserved_memory_bytes() >= memory_bytes
+        ]
+        victims.sort(key=lambda victim: victim[0].get_autoscale_service().get_priority().get_rank())
+
+        placed_tasks = 0
+        for scale_operation, minimum_replicas in victims:
+            victim_service = scale_operation.get_autoscale_service()
+            while placed_tasks < missing_tasks and scale_operation.get_new_replicas() > minimum_replicas:
+                victim_service_id = scale_operation.get_service().id
+                node_id = self._cluster_capacity.release(victim_service_id, victim_service.get_reserved_nano_cpus(), victim_service.get_reserved_memory_bytes())
+                if node_id is None:
+                    break
+                if self._cluster_capacity.reserve(nano_cpus, memory_bytes, 1) == 0:
+                    # Node still overcommitted, keep the task, preempting more of this service may not help either.
+                    self._cluster_capacity.restore(victim_service_id, node_id, victim_service.get_reserved_nano_cpus(), victim_service.get_reserved_memory_bytes())
+                    break
+                scale_operation.preempt_for(autoscale_service)
+                placed_tasks += 1
+            if placed_tasks >= missing_tasks:
+                break
+        return placed_tasks
+
+
+    def _apply_all(self, scale_operations, apply_scale_operation):
+        """
+        Apply scale operations with up to max_workers threads.
+        """
+        if self._max_workers == 1 or len(scale_operations) <= 1:
+            for scale_operation in scale_operations:
+                apply_scale_operation(scale_operation)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(scale_operations)), thread_name_prefix="scale") as pool:
+                # Consume the results to raise the first exception like applying one by one would.
+                list(pool.map(apply_scale_operation, scale_operations))
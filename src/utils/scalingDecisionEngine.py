@@ -0,0 +1,173 @@
+# Table driven decision engine combining the suggestions of any number of scaling metrics.
+#
+# Pure functions without side effects: no logging, no docker or prometheus calls.
+# Runs for every service on every cycle, so it avoids building intermediate lists.
+
+# Definitions.
+from valid_values import ScalingConflictResolution, ScalingSuggestion, ScalingMetricName
+
+
+def get_final_scaling_suggestion(scaling_metrics, conflict_resolution=ScalingConflictResolution.SCALE_UP, metric_weights=None, metric_priority=()):
+    """
+    Combine the individual suggestions of all enabled scaling metrics into one suggestion.
+
+    If all enabled metrics agree, their suggestion is used. Otherwise the conflict
+    resolution policy decides.
+
+    Args:
+        scaling_metrics (iterable of ScalingMetrics): Metrics of one service.
+        conflict_resolution (ScalingConflictResolution): Policy to apply in case of disagreement.
+        metric_weights (dict|None): ScalingMetricName -> weight, used by WEIGHTED_VOTE. Missing metrics weigh 1.
+        metric_priority (tuple): ScalingMetricName, highest priority first, used by PRIORITY_ORDER.
+
+    Returns:
+        ScalingSuggestion.
+    """
+    # Detect unanimity in a single pass.
+    first_suggestion = None
+    is_unanimous = True
+    for scaling_metric in scaling_metrics:
+        if not scaling_metric.is_metric_based_scaling_enabled():
+            continue
+        suggestion = scaling_metric.get_scaling_suggestion()
+        if first_suggestion is None:
+            first_suggestion = suggestion
+        elif suggestion is not first_suggestion:
+            is_unanimous = False
+            break
+
+    # No metric enabled.
+    if first_suggestion is None:
+        return ScalingSuggestion.KEEP_REPLICAS
+
+    # All metrics agree.
+    if is_unanimous:
+        return first_suggestion
+
+    # Conflict resolution.
+    resolver = _CONFLICT_RESOLVERS.get(conflict_resolution, _resolve_keep_replicas)
+    return resolver(scaling_metrics, metric_weights, metric_priority)
+
+
+def resolve_metric_conflict(conflict_resolution):
+    """
+    Resolve the conflict of a single metric suggesting to scale up and down at the same time.
+
+    Happens if the upscale and downscale thresholds overlap or use different time durations.
+
+    Args:
+        conflict_resolution (ScalingConflictResolution): Policy to apply.
+
+    Returns:
+        ScalingSuggestion.
+    """
+    return _METRIC_CONFLICT_RESOLUTIONS.get(conflict_resolution, ScalingSuggestion.KEEP_REPLICAS)
+
+
+
+### Conflict resolvers ###
+# All resolvers share the signature (scaling_metrics, metric_weights, metric_priority).
+
+def _resolve_any_up(scaling_metrics, metric_weights, metric_priority):
+    """
+    Scale up if any metric wants to scale up, scale down only if all metrics agree (handled by unanimity).
+    """
+    for scaling_metric in scaling_metrics:
+        if scaling_metric.is_metric_based_scaling_enabled() and scaling_metric.get_scaling_suggestion() is ScalingSuggestion.SCALE_UP:
+            return ScalingSuggestion.SCALE_UP
+    return ScalingSuggestion.KEEP_REPLICAS
+
+
+def _resolve_any_down(scaling_metrics, metric_weights, metric_priority):
+    """
+    Scale down if any metric wants to scale down, scale up only if all metrics agree (handled by unanimity).
+    """
+    for scaling_metric in scaling_metrics:
+        if scaling_metric.is_metric_based_scaling_enabled() and scaling_metric.get_scaling_suggestion() is ScalingSuggestion.SCALE_DOWN:
+            return ScalingSuggestion.SCALE_DOWN
+    return ScalingSuggestion.KEEP_REPLICAS
+
+
+def _resolve_keep_replicas(scaling_metrics, metric_weights, metric_priority):
+    """
+    Do not scale at all on disagreement.
+    """
+    return ScalingSuggestion.KEEP_REPLICAS
+
+
+def _resolve_weighted_vote(scaling_metrics, metric_weights, metric_priority):
+    """
+    Sum up the weights of each suggestion. The heaviest suggestion wins, ties keep replicas.
+    """
+    scale_up_weight = 0.0
+    scale_down_weight = 0.0
+    keep_replicas_weight = 0.0
+    for scaling_metric in scaling_metrics:
+        if not scaling_metric.is_metric_based_scaling_enabled():
+            continue
+        weight = metric_weights.get(scaling_metric.get_metric_name(), 1.0) if metric_weights else 1.0
+        suggestion = scaling_metric.get_scaling_suggestion()
+        if suggestion is ScalingSuggestion.SCALE_UP:
+            scale_up_weight += weight
+        elif suggestion is ScalingSuggestion.SCALE_DOWN:
+            scale_down_weight += weight
+        else:
+            keep_replicas_weight += weight
+
+    if scale_up_weight > scale_down_weight and scale_up_weight > keep_replicas_weight:
+        return ScalingSuggestion.SCALE_UP
+    if scale_down_weight > scale_up_weight and scale_down_weight > keep_replicas_weight:
+        return ScalingSuggestion.SCALE_DOWN
+    return ScalingSuggestion.KEEP_REPLICAS
+
+
+def _resolve_priority_order(scaling_metrics, metric_weights, metric_priority):
+    """
+    The enabled metric with the highest priority decides. Metrics without priority follow in their given order.
+    """
+    for metric_name in metric_priority:
+        for scaling_metric in scaling_metrics:
+            if scaling_metric.get_metric_name() is metric_name and scaling_metric.is_metric_based_scaling_enabled():
+                return scaling_metric.get_scaling_suggestion()
+    for scaling_metric in scaling_metrics:
+        if scaling_metric.is_metric_based_scaling_enabled():
+            return scaling_metric.get_scaling_suggestion()
+    return ScalingSuggestion.KEEP_REPLICAS
+
+
+def _resolve_adhere_to_cpu(scaling_metrics, metric_weights, metric_priority):
+    """
+    The cpu metric decides.
+    """
+    return _resolve_priority_order(scaling_metrics, metric_weights, _CPU_FIRST)
+
+
+def _resolve_adhere_to_memory(scaling_metrics, metric_weights, metric_priority):
+    """
+    The memory metric decides.
+    """
+    return _resolve_priority_order(scaling_metrics, metric_weights, _MEMORY_FIRST)
+
+
+
+### Decision tables ###
+
+_CPU_FIRST = (ScalingMetricName.CPU,)
+_MEMORY_FIRST = (ScalingMetricName.MEMORY,)
+
+# How to combine disagreeing metrics.
+_CONFLICT_RESOLVERS = {
+    ScalingConflictResolution.SCALE_UP: _resolve_any_up,
+    ScalingConflictResolution.SCALE_DOWN: _resolve_any_down,
+    ScalingConflictResolution.KEEP_REPLICAS: _resolve_keep_replicas,
+    ScalingConflictResolution.ADHERE_TO_CPU: _resolve_adhere_to_cpu,
+    ScalingConflictResolution.ADHERE_TO_MEMORY: _resolve_adhere_to_memory,
+    ScalingConflictResolution.WEIGHTED_VOTE: _resolve_weighted_vote,
+    ScalingConflictResolution.PRIORITY_ORDER: _resolve_priority_order,
+}
+
+# How to resolve one metric exceeding both its upscale and its downscale threshold.
+_METRIC_CONFLICT_RESOLUTIONS = {
+    ScalingConflictResolution.SCALE_UP: ScalingSuggestion.SCALE_UP,
+    ScalingConflictResolution.SCALE_DOWN: ScalingSuggestion.SCALE_DOWN,
+}
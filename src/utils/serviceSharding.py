@@ -0,0 +1,102 @@
+# Splits the autoscale services between several autoscaler replicas with rendezvous hashing.
+
+# Docker errors.
+import docker
+
+# Stable hashes across processes.
+import hashlib
+
+
+def get_owner(service_name, members):
+    """
+    Get the member owning a service (rendezvous / highest random weight hashing).
+
+    Every member computes the same owner from the same members. If a member joins or leaves,
+    only the services it gains or owned move.
+
+    Args:
+        service_name (str): Name of the autoscale service.
+        members (list): Identities of all members.
+
+    Returns:
+        str|None: The owning member, None if there are no members.
+    """
+    owner = None
+    highest_weight = -1
+    for member in members:
+        weight = int.from_bytes(hashlib.sha256(f"{member}/{service_name}".encode()).digest()[:8], "big")
+        if weight > highest_weight or (weight == highest_weight and member < owner):
+            owner = member
+            highest_weight = weight
+    return owner
+
+
+class ServiceSharder:
+    """
+    Decides which autoscale services this autoscaler replica evaluates.
+
+    Members are the running tasks of the autoscaler's own service, discovered through the docker api
+    and identified by their container id. A replica recognizes itself by its hostname, which swarm sets
+    to the short container id by default. Membership is refreshed before every cycle, so ownership
+    rebalances when a replica joins or leaves. While replicas see different members, e.g. during a
+    rolling update, a service may be evaluated twice or not at all for one cycle.
+    """
+
+    def __init__(self, client, service_name, identity):
+        """
+        Args:
+            client (docker.DockerClient): Docker client.
+            service_name (str): Name of the autoscaler's own service.
+            identity (str): Hostname of this replica.
+        """
+        self._client = client
+        self._service_name = service_name
+        self._identity = identity
+        self._members = [identity]
+        self._own_member = identity
+
+
+    def get_members(self):
+        return list(self._members)
+
+
+    def refresh_members(self):
+        """
+        Discover the running replicas of the autoscaler.
+
+        Returns:
+            tuple: (changed (bool), error message (str|None)). On errors the previous members are kept.
+        """
+        try:
+            service = self._client.services.get(self._service_name)
+            tasks = service.tasks(filters={"desired-state": "running"})
+        except docker.errors.APIError as e:
+            return False, f"ServiceSharder: Could not discover replicas of service <EMPHASIZE_STRING_START_TAG>{self._service_name}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
+
+        members = sorted(
+            task["Status"]["ContainerStatus"]["ContainerID"]
+            for task in tasks
+            if task.get("Status", {}).get("State") == "running" and task.get("Status", {}).get("ContainerStatus", {}).get("ContainerID")
+        )
+
+        # Recognize this replica.
+        own_members = [member for member in members if member.startswith(self._identity)]
+        error = None
+        if own_members:
+            own_member = own_members[0]
+        else:
+            own_member = self._identity
+            members = sorted(members + [own_member])
+            error = f"ServiceSharder: This replica <EMPHASIZE_STRING_START_TAG>{self._identity}</EMPHASIZE_STRING_END_TAG> is not a running task of service <EMPHASIZE_STRING_START_TAG>{self._service_name}</EMPHASIZE_STRING_END_TAG>, other replicas do not know about it. Do not override the hostname when sharding."
+
+        changed = members != self._members
+        self._members = members
+        self._own_member = own_member
+        return changed, error
+
+
+    def owns(self, service_name):
+        """
+        Whether this replica evaluates the service.
+        """
+        return get_owner(service_name, self._members) == self._own_member
@@ -0,0 +1,150 @@
+# Lightweight tracing spans around the steps of an autoscaling cycle.
+
+# Serialization.
+import json
+
+# Timing and thread ids.
+import threading
+import time
+import os
+
+
+class _Span:
+    """
+    Measures a with block and hands it to the buffer of finished spans.
+    """
+    __slots__ = ("_name", "_category", "_args", "_start_timestamp", "_start")
+
+    def __init__(self, name, category, args):
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start_timestamp = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._args["error"] = f"{exc_type.__name__}: {exc_value}"
+        _add_finished_span({
+            "name": self._name,
+            "cat": self._category,
+            "ph": "X",
+            "ts": int(self._start_timestamp * 1000000),
+            "dur": int(duration * 1000000),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self._args
+        })
+        return False
+
+
+class _NoopSpan:
+    """
+    Span doing nothing, used while tracing is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_exporter = None
+_finished_spans = []
+_finished_spans_lock = threading.Lock()
+
+
+def set_exporter(exporter):
+    """
+    Enable tracing with the given exporter, None disables tracing.
+
+    Args:
+        exporter: Object offering export(spans) returning an error message or None, e.g. ChromeTraceExporter.
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def is_enabled():
+    return _exporter is not None
+
+
+def span(name, category="autoscaler", **args):
+    """
+    Get a span measuring a with block, e.g. with span("docker.scale_service", service="web"): ...
+
+    Args:
+        name (str): Name of the span.
+        category (str): Category of the span, e.g. "docker" or "prometheus".
+        args: Additional information shown with the span.
+
+    Returns:
+        A context manager, which does nothing if tracing is disabled.
+    """
+    if _exporter is None:
+        return _NOOP_SPAN
+    return _Span(name, category, args)
+
+
+def flush():
+    """
+    Export all finished spans.
+
+    Returns:
+        str|None: Error message if the spans could not be exported.
+    """
+    global _finished_spans
+    if _exporter is None:
+        return None
+    with _finished_spans_lock:
+        spans, _finished_spans = _finished_spans, []
+    if not spans:
+        return None
+    return _exporter.export(spans)
+
+
+def _add_finished_span(finished_span):
+    with _finished_spans_lock:
+        _finished_spans.append(finished_span)
+
+
+class ChromeTraceExporter:
+    """
+    Appends spans to a file in the Chrome trace event format.
+
+    The file is a JSON array which is never closed, so it can be appended to
+    cycle after cycle. chrome://tracing and https://ui.perfetto.dev accept it as is.
+    """
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): File to append the spans to.
+        """
+        self._file_path = file_path
+
+
+    def export(self, spans):
+        """
+        Append spans to the trace file.
+
+        Returns:
+            str|None: Error message if the spans could not be written.
+        """
+        try:
+            is_new_file = not os.path.exists(self._file_path) or os.path.getsize(self._file_path) == 0
+            with open(self._file_path, "a") as trace_file:
+                if is_new_file:
+                    trace_file.write("[\n")
+                for finished_span in spans:
+                    trace_file.write(json.dumps(finished_span, separators=(",", ":")) + ",\n")
+            return None
+        except Exception as e:
+            return f"ChromeTraceExporter: Could not write spans to <EMPHASIZE_STRING_START_TAG>{self._file_path}</EMPHASIZE_STRING_END_TAG>: <EMPHASIZE_STRING_START_TAG>{e}</EMPHASIZE_STRING_END_TAG>"
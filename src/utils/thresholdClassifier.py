@@ -0,0 +1,115 @@
+# Classifies the metric values of many services against their thresholds at once.
+#
+# Columns are lists with one entry per service, so a whole cycle is classified in one pass
+# instead of one detailed evaluation per service. Runs in plain python by default, converting the lists of a
+# cycle to numpy arrays and back costs more than the vectorized comparison saves at thousands of services.
+
+# Optional vectorization, numpy is only imported on first use since importing it is slow.
+import importlib.util
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Definitions.
+from valid_values import ScalingSuggestion
+
+# Conflict resolution of a single metric.
+import scalingDecisionEngine as ScalingDecisionEngine
+
+
+# Suggestion codes: bit 1 scale up, bit 2 scale down.
+KEEP_REPLICAS = 0
+SCALE_UP = 1
+SCALE_DOWN = 2
+CONFLICT = 3
+
+_SUGGESTIONS_OF_CODES = {
+    KEEP_REPLICAS: ScalingSuggestion.KEEP_REPLICAS,
+    SCALE_UP: ScalingSuggestion.SCALE_UP,
+    SCALE_DOWN: ScalingSuggestion.SCALE_DOWN
+}
+
+
+def is_numpy_available():
+    return _NUMPY_AVAILABLE
+
+
+def get_suggestion_codes(upscale_values, upscale_thresholds, downscale_values, downscale_thresholds, task_maximums=None, use_numpy=False):
+    """
+    Get the suggestion of one metric for each service, like the detailed evaluation of the scaler.
+
+    Scale up if the value is above the upscale threshold. Scale down if the value is below the downscale
+    threshold, unless any task is above the upscale threshold. Both at once is a conflict, resolved
+    per service by to_scaling_suggestions.
+
+    Args:
+        upscale_values (list of float): Values compared with the upscale thresholds.
+        upscale_thresholds (list of float): Upscale threshold per value.
+        downscale_values (list of float): Values compared with the downscale thresholds, e.g. over another time duration.
+        downscale_thresholds (list of float): Downscale threshold per value.
+        task_maximums (list of float|None): Highest task value per service, None to not prevent downscaling.
+        use_numpy (bool): Use the numpy kernel instead of the python kernel, requires numpy.
+
+    Returns:
+        list of int: Suggestion code per service.
+    """
+    if use_numpy:
+        import numpy
+        upscale_threshold_array = numpy.asarray(upscale_thresholds, dtype=float)
+        is_upscale = numpy.asarray(upscale_values, dtype=float) > upscale_threshold_array
+        is_downscale = numpy.asarray(downscale_values, dtype=float) < numpy.asarray(downscale_thresholds, dtype=float)
+        if task_maximums is not None:
+            is_downscale &= ~(numpy.asarray(task_maximums, dtype=float) > upscale_threshold_array)
+        return (is_upscale.astype(numpy.int8) | (is_downscale.astype(numpy.int8) << 1)).tolist()
+
+    if task_maximums is None:
+        task_maximums = [None] * len(upscale_values)
+    return [
+        (SCALE_UP if upscale_value > upscale_threshold else 0)
+        | (SCALE_DOWN if downscale_value < downscale_threshold and not (task_maximum is not None and task_maximum > upscale_threshold) else 0)
+        for upscale_value, upscale_threshold, downscale_value, downscale_threshold, task_maximum
+        in zip(upscale_values, upscale_thresholds, downscale_values, downscale_thresholds, task_maximums)
+    ]
+
+
+def to_scaling_suggestions(suggestion_codes, conflict_resolutions):
+    """
+    Convert suggestion codes to ScalingSuggestions, resolving conflicts like the detailed evaluation.
+
+    Args:
+        suggestion_codes (list of int): Codes of get_suggestion_codes.
+        conflict_resolutions (list of ScalingConflictResolution): Conflict resolution per service.
+
+    Returns:
+        list of ScalingSuggestion.
+    """
+    return [
+        ScalingDecisionEngine.resolve_metric_conflict(conflict_resolution) if suggestion_code == CONFLICT else _SUGGESTIONS_OF_CODES[suggestion_code]
+        for suggestion_code, conflict_resolution in zip(suggestion_codes, conflict_resolutions)
+    ]
+
+
+def get_comfortable_flags(upscale_values, upscale_thresholds, downscale_values, downscale_thresholds, margin, use_numpy=False):
+    """
+    Check which values are comfortably between their downscale and upscale threshold.
+
+    A value is comfortable if it keeps the replicas even with both thresholds moved margin (relative to the threshold)
+    towards it, so neither an upscale nor a downscale is suggested.
+
+    Args:
+        upscale_values (list of float): Values compared with the upscale thresholds.
+        upscale_thresholds (list of float): Upscale threshold per value.
+        downscale_values (list of float): Values compared with the downscale thresholds, e.g. over another time duration.
+        downscale_thresholds (list of float): Downscale threshold per value.
+        margin (float): Required distance as fraction of the threshold, e.g. 0.1.
+        use_numpy (bool): Use the numpy kernel instead of the python kernel, requires numpy.
+
+    Returns:
+        list of bool: True for each comfortable value.
+    """
+    suggestion_codes = get_suggestion_codes(
+        upscale_values,
+        [upscale_threshold * (1 - margin) for upscale_threshold in upscale_thresholds],
+        downscale_values,
+        [downscale_threshold * (1 + margin) for downscale_threshold in downscale_thresholds],
+        use_numpy=use_numpy
+    )
+    return [suggestion_code == KEEP_REPLICAS for suggestion_code in suggestion_codes]
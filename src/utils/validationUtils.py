@@ -1,18 +1,96 @@
 # String verification.
 import re
 
+# Definitions.
+from valid_values import ScalingConflictResolution, LogLevel, MemoryThresholdReference, ServicePriority
+
+
+# Compiled once at import instead of on every call.
+_EMAIL_REGEX = re.compile(r'^[\w\.-]+@[a-zA-Z\d\.-]+\.[a-zA-Z]{2,}$')
+_TELEGRAM_CHAT_ID_REGEX = re.compile(r'^-?\d+$')  # An optional negative sign followed by one or more digits
+_TIME_DURATION_REGEX = re.compile(r'^\d+[smhdwy]$')
+# A non-negative decimal number, optionally in exponent notation, followed by an optional percent sign or storage unit.
+_PERCENTAGE_REGEX = re.compile(r'^\s*\+?(\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)\s*%?\s*$', re.IGNORECASE)
+_BYTE_REGEX = re.compile(r'^\s*\+?(\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)\s*(kib|mib|gib|tib|kb|mb|gb|tb|b)?\s*$', re.IGNORECASE)
+
+# Messages of invalid values, shared with the converters.
+INVALID_PERCENTAGE_MESSAGE = "Invalid percentage format. Please use <EMPHASIZE_STRING_START_TAG>%</EMPHASIZE_STRING_END_TAG> or any valid float value between 0 and 100."
+INVALID_SIZE_MESSAGE = "Invalid size format. Please use B, KiB, MiB, GiB, TiB, KB, MB, GB, TB or any valid float value."
+
+
+def _is_percentage_valid(value):
+    match = _PERCENTAGE_REGEX.match(value)
+    return match is not None and float(match.group(1)) <= 100
+
+def _is_byte_valid(value):
+    return _BYTE_REGEX.match(value) is not None
+
+def _is_byte_or_percentage_valid(value):
+    return _is_percentage_valid(value) if value.strip().endswith('%') else _is_byte_valid(value)
+
+def _is_list_valid(entry_regex):
+    """
+    Validator of a comma separated list whose entries all match entry_regex, empty and "none" are valid.
+    """
+    def is_list_valid(value):
+        if not value or value.lower() == "none":
+            return True
+        return all(entry_regex.match(entry.strip()) is not None for entry in value.split(','))
+    return is_list_valid
+
+
+# Validators keyed by the value_type of label_definitions. Each is a compiled regex the value has to match,
+# a lookup table of valid values or a function combining both. Value types without entry are checked by the label handler.
+VALUE_TYPE_VALIDATORS = {
+    "valid time_duration": _TIME_DURATION_REGEX,
+    "percentage": _is_percentage_valid,
+    "byte": _is_byte_valid,
+    "byte_or_percentage": _is_byte_or_percentage_valid,
+    "email_list": _is_list_valid(_EMAIL_REGEX),
+    "telegram_chat_id_list": _is_list_valid(_TELEGRAM_CHAT_ID_REGEX),
+    "memory_threshold_reference": frozenset(item.value for item in MemoryThresholdReference),
+    "service_priority": frozenset(item.value for item in ServicePriority)
+}
+
+# Valid values of the settings verified outside of label_definitions.
+SETTING_VALUES = {
+    "scaling_conflict_resolution": frozenset(item.value for item in ScalingConflictResolution),
+    "log_level": frozenset(item.value for item in LogLevel)
+}
+
+
+def is_value_valid(value_type, value):
+    """
+    Check a value with the validator registered for its value type.
+
+    Args:
+        value_type (str): Key of VALUE_TYPE_VALIDATORS.
+        value (str): The value to check.
+
+    Returns:
+        bool: True if valid.
+    """
+    validator = VALUE_TYPE_VALIDATORS[value_type]
+    if isinstance(validator, frozenset):
+        return value in validator
+    if callable(validator):
+        return validator(str(value))
+    return validator.match(str(value)) is not None
+
+def is_setting_value_valid(setting, value):
+    """
+    Check if a value is one of the valid values of a setting, e.g. "scaling_conflict_resolution".
+    """
+    return value in SETTING_VALUES[setting]
+
 def is_email_valid(email):
     """
     Check if the given email address is valid.
     """
-    email_regex = r'^[\w\.-]+@[a-zA-Z\d\.-]+\.[a-zA-Z]{2,}$'
-    return re.match(email_regex, email) is not None
+    return _EMAIL_REGEX.match(email) is not None
 
 def is_telegram_chat_id_valid(chat_id):
     """
     Check if the given telegram chat id is valid.
     """
-    chat_id_regex = r'^-?\d+$'  # An optional negative sign followed by one or more digits
-    return re.match(chat_id_regex, str(chat_id)) is not None
-
-
+    return _TELEGRAM_CHAT_ID_REGEX.match(str(chat_id)) is not None
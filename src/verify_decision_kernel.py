@@ -0,0 +1,40 @@
+# Checks that the vectorized decision kernel suggests the same as the detailed evaluation of the scaler, and times both.
+#
+# Usage: python verify_decision_kernel.py [--service-counts 100,3000] [--seed 0] [--output <result.json>]
+# Exits with 1 if any kernel suggests differently than the detailed evaluation.
+
+# Import own classes.
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "utils", "messaging"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "models"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "definitions"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "simulation"))
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+# Arguments and result output.
+import argparse
+import json
+
+# Parity check.
+import decisionKernelParity as DecisionKernelParity
+
+parser = argparse.ArgumentParser(description="Compare the vectorized decision kernel with the detailed evaluation of the scaler.")
+parser.add_argument("--service-counts", default="100,3000", help="Comma separated amounts of synthetic services.")
+parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic services.")
+parser.add_argument("--output", help="Write the result json to this file instead of stdout.")
+args = parser.parse_args()
+
+# Compare.
+parity = DecisionKernelParity.DecisionKernelParity(args.seed)
+results = [parity.run(int(service_count)) for service_count in args.service_counts.split(",") if service_count.strip()]
+
+# Output.
+if args.output:
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+else:
+    print(json.dumps(results, indent=2))
+sys.exit(1 if any(kernel["mismatch_count"] for result in results for kernel in result["kernels"].values()) else 0)
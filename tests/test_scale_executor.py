@@ -0,0 +1,131 @@
+# Budget of new tasks, cluster capacity and preemption of the scale executor.
+#
+# Usage: python -m unittest discover tests
+
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+source_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(1, os.path.join(source_directory, "utils"))
+sys.path.insert(1, os.path.join(source_directory, "utils", "messaging"))
+sys.path.insert(1, os.path.join(source_directory, "models"))
+sys.path.insert(1, os.path.join(source_directory, "definitions"))
+sys.path.insert(1, os.path.join(source_directory, "simulation"))
+
+import unittest
+
+# Own classes.
+import scaleExecutor as ScaleExecutor
+import clusterCapacity as ClusterCapacity
+import scaleOperation as ScaleOperation
+import autoScaleService as AutoScaleService
+import fakeDockerClient as FakeDockerClient
+
+# Definitions.
+from valid_values import ScalingSuggestion, ScaleLimitReason
+
+
+GIB = 1024 ** 3
+
+
+class TestScaleExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self._client = FakeDockerClient.FakeDockerClient()
+        self._applied = []
+
+
+    def _add_service(self, name, replicas, priority="normal", reserved_memory_bytes=0):
+        """
+        Add a fake service and its AutoScaleService.
+        """
+        resources = {"Reservations": {"MemoryBytes": reserved_memory_bytes}} if reserved_memory_bytes else {}
+        service = self._client.services.add(name, {}, replicas, resources)
+        return AutoScaleService.AutoScaleService(name, {"autoscale": "true", "autoscale.priority": priority}, resources), service
+
+
+    def _get_scale_operation(self, autoscale_service, service, new_replicas):
+        suggestion = ScalingSuggestion.SCALE_UP if new_replicas > service.get_replicas() else ScalingSuggestion.KEEP_REPLICAS
+        return ScaleOperation.ScaleOperation(autoscale_service, service, service.get_replicas(), new_replicas, suggestion)
+
+
+    def _get_cluster_capacity(self):
+        cluster_capacity = ClusterCapacity.ClusterCapacity(self._client)
+        self.assertIsNone(cluster_capacity.refresh())
+        return cluster_capacity
+
+
+    def test_budget_prefers_higher_priority(self):
+        scale_executor = ScaleExecutor.ScaleExecutor(max_new_tasks_per_cycle=1)
+        low_operation = self._get_scale_operation(*self._add_service("low", 1, "low"), 2)
+        high_operation = self._get_scale_operation(*self._add_service("high", 1, "high"), 2)
+        scale_executor.add(low_operation)
+        scale_executor.add(high_operation)
+
+        deferred = scale_executor.execute(self._applied.append)
+
+        self.assertEqual(self._applied, [high_operation])
+        self.assertEqual(deferred, [low_operation])
+        self.assertEqual(low_operation.get_limit_reason(), ScaleLimitReason.TASK_BUDGET)
+
+
+    def test_discard_pending(self):
+        scale_executor = ScaleExecutor.ScaleExecutor()
+        scale_executor.add(self._get_scale_operation(*self._add_service("web", 1), 2))
+
+        self.assertEqual(scale_executor.discard_pending(), 1)
+        self.assertEqual(scale_executor.execute(self._applied.append), [])
+        self.assertEqual(self._applied, [])
+
+
+    def test_scale_up_limited_to_cluster_capacity(self):
+        self._client.nodes.add("node1", 4e9, 3 * GIB)
+        autoscale_service, service = self._add_service("web", 1, reserved_memory_bytes=GIB)
+        scale_executor = ScaleExecutor.ScaleExecutor(cluster_capacity=self._get_cluster_capacity())
+        scale_operation = self._get_scale_operation(autoscale_service, service, 5)
+        scale_executor.add(scale_operation)
+
+        self.assertEqual(scale_executor.execute(self._applied.append), [])
+        self.assertEqual(scale_operation.get_new_replicas(), 3)
+        self.assertEqual(scale_operation.get_limit_reason(), ScaleLimitReason.CLUSTER_CAPACITY)
+
+
+    def test_preemption_frees_capacity(self):
+        self._client.nodes.add("node1", 4e9, 4 * GIB)
+        victim_service, victim = self._add_service("batch", 3, "low", GIB)
+        critical_service, critical = self._add_service("api", 1, "critical", GIB)
+        scale_executor = ScaleExecutor.ScaleExecutor(cluster_capacity=self._get_cluster_capacity(), preemption=True)
+        victim_operation = self._get_scale_operation(victim_service, victim, 3)
+        critical_operation = self._get_scale_operation(critical_service, critical, 2)
+        scale_executor.add_preemption_candidate(victim_operation, 1)
+        scale_executor.add(critical_operation)
+
+        self.assertEqual(scale_executor.execute(self._applied.append), [])
+        self.assertEqual(victim_operation.get_new_replicas(), 2)
+        self.assertIs(victim_operation.get_preempted_for(), critical_service)
+        self.assertEqual(critical_operation.get_new_replicas(), 2)
+        self.assertEqual(self._applied, [victim_operation, critical_operation])
+
+
+    def test_preemption_not_freeing_room_keeps_victim(self):
+        # Overcommitted node, free memory -2 GiB, removing one task of the victim does not make room.
+        self._client.nodes.add("node1", 4e9, 2 * GIB)
+        victim_service, victim = self._add_service("batch", 3, "low", GIB)
+        critical_service, critical = self._add_service("api", 1, "critical", GIB)
+        cluster_capacity = self._get_cluster_capacity()
+        free_capacity = cluster_capacity.get_free_capacity()
+        scale_executor = ScaleExecutor.ScaleExecutor(cluster_capacity=cluster_capacity, preemption=True)
+        victim_operation = self._get_scale_operation(victim_service, victim, 3)
+        critical_operation = self._get_scale_operation(critical_service, critical, 2)
+        scale_executor.add_preemption_candidate(victim_operation, 1)
+        scale_executor.add(critical_operation)
+
+        self.assertEqual(scale_executor.execute(self._applied.append), [critical_operation])
+        self.assertEqual(victim_operation.get_new_replicas(), 3)
+        self.assertIsNone(victim_operation.get_preempted_for())
+        self.assertEqual(self._applied, [])
+        self.assertEqual(cluster_capacity.get_free_capacity(), free_capacity)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Parity of the decision kernels with the detailed evaluation of the scaler.
+#
+# Usage: python -m unittest discover tests
+
+# Insert path to own stuff to allow importing them.
+import os
+import sys
+source_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(1, os.path.join(source_directory, "utils"))
+sys.path.insert(1, os.path.join(source_directory, "utils", "messaging"))
+sys.path.insert(1, os.path.join(source_directory, "models"))
+sys.path.insert(1, os.path.join(source_directory, "definitions"))
+sys.path.insert(1, os.path.join(source_directory, "simulation"))
+sys.path.insert(1, os.path.join(source_directory, "benchmarks"))
+
+import unittest
+
+# Own classes.
+import thresholdClassifier as ThresholdClassifier
+import decisionKernelParity as DecisionKernelParity
+
+# Definitions.
+from valid_values import ScalingConflictResolution, ScalingSuggestion
+
+
+# Values exactly on, just above and just below the thresholds, the last one with a task above the upscale threshold preventing the downscale.
+_EDGE_COLUMNS = (
+    [80.0, 80.1, 79.9, 10.0, 9.9, 10.1, 90.0, 20.0],
+    [80.0, 80.0, 80.0, 80.0, 80.0, 80.0, 80.0, 15.0],
+    [10.0, 10.0, 10.0, 10.0, 9.9, 10.1, 5.0, 10.0],
+    [10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 15.0],
+    [80.0, 80.1, 79.9, 10.0, 9.9, 80.1, 90.0, 20.0]
+)
+_EDGE_CODES = [
+    ThresholdClassifier.KEEP_REPLICAS,
+    ThresholdClassifier.SCALE_UP,
+    ThresholdClassifier.KEEP_REPLICAS,
+    ThresholdClassifier.KEEP_REPLICAS,
+    ThresholdClassifier.SCALE_DOWN,
+    ThresholdClassifier.KEEP_REPLICAS,
+    ThresholdClassifier.SCALE_UP,
+    ThresholdClassifier.SCALE_UP
+]
+
+
+class TestSuggestionCodes(unittest.TestCase):
+
+    def test_python_kernel_is_default(self):
+        self.assertEqual(ThresholdClassifier.get_suggestion_codes(*_EDGE_COLUMNS), _EDGE_CODES)
+
+    def test_without_task_maximums(self):
+        codes = ThresholdClassifier.get_suggestion_codes(*_EDGE_COLUMNS[:4])
+        self.assertEqual(codes[:6], _EDGE_CODES[:6])
+        self.assertEqual(codes[6:], [ThresholdClassifier.CONFLICT, ThresholdClassifier.CONFLICT])
+
+    def test_empty_columns(self):
+        self.assertEqual(ThresholdClassifier.get_suggestion_codes([], [], [], [], []), [])
+
+    @unittest.skipUnless(ThresholdClassifier.is_numpy_available(), "numpy is not installed")
+    def test_numpy_kernel_matches_python_kernel(self):
+        self.assertEqual(ThresholdClassifier.get_suggestion_codes(*_EDGE_COLUMNS, use_numpy=True), _EDGE_CODES)
+        self.assertEqual(ThresholdClassifier.get_suggestion_codes(*_EDGE_COLUMNS[:4], use_numpy=True), ThresholdClassifier.get_suggestion_codes(*_EDGE_COLUMNS[:4]))
+
+    def test_conflicts_are_resolved_per_service(self):
+        suggestions = ThresholdClassifier.to_scaling_suggestions(
+            [ThresholdClassifier.CONFLICT, ThresholdClassifier.CONFLICT, ThresholdClassifier.SCALE_UP],
+            [ScalingConflictResolution.SCALE_UP, ScalingConflictResolution.SCALE_DOWN, ScalingConflictResolution.SCALE_DOWN]
+        )
+        self.assertEqual(suggestions, [ScalingSuggestion.SCALE_UP, ScalingSuggestion.SCALE_DOWN, ScalingSuggestion.SCALE_UP])
+
+    def test_comfortable_flags_respect_margin(self):
+        flags = ThresholdClassifier.get_comfortable_flags([50.0, 75.0, 10.5], [80.0, 80.0, 80.0], [50.0, 75.0, 10.5], [10.0, 10.0, 10.0], 0.1)
+        self.assertEqual(flags, [True, False, False])
+
+
+class TestDecisionKernelParity(unittest.TestCase):
+
+    def test_kernels_match_detailed_evaluation(self):
+        for seed in range(3):
+            result = DecisionKernelParity.DecisionKernelParity(seed).run(500, repetitions=1)
+            for kernel_name, kernel in result["kernels"].items():
+                with self.subTest(seed=seed, kernel=kernel_name):
+                    self.assertEqual(kernel["mismatch_count"], 0, kernel["mismatches"])
+
+
+if __name__ == "__main__":
+    unittest.main()